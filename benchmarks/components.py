@@ -0,0 +1,326 @@
+import asyncio
+import json
+import logging
+import platform
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, cast
+
+import click
+import httpx
+import structlog
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fakes import (
+    FakeEmbedder,
+    FakeLLM,
+    FakeQdrantClient,
+    FakeVectorStorage,
+    make_scored_points,
+    make_search_results,
+)
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from prompt_builder import SIZES, make_prompt_data
+from pydantic import BaseModel
+from qdrant_client import AsyncQdrantClient
+
+from backend.application.services.retrieval import RetrievalService
+from backend.application.services.vector_storage import VectorStorageP
+from backend.application.use_cases.chat import ChatUseCase
+from backend.integrations.services.prompts.rag import MakoRAGPromptBuilder
+from backend.integrations.services.vector_storage.qdrant import QdrantVectorStorage
+from backend.presentation.api.models.chat import ChatRequest, ChatResponse
+from backend.presentation.api.responses import ModelJSONResponse
+from backend.presentation.api.routes.v1.chat import router as chat_router
+
+NUM_POINTS = (3, 12, 48)
+CHAT_MESSAGES = 15
+CHAT_FACTS = 3
+LARGE_CHAT_MESSAGES = 50
+LARGE_CHAT_FACTS = 48
+
+BenchmarkCase = Callable[[], Awaitable[object]]
+
+
+class BenchmarkResult(BaseModel):
+    iterations: int
+    seconds_per_op: float
+    ops_per_second: float
+
+
+class BenchmarkReport(BaseModel):
+    python_version: str
+    results: dict[str, BenchmarkResult]
+
+
+async def call_sync(function: Callable[..., object], *args: Any) -> object:
+    # Keeps sync and async cases on the same loop, the wrapper cost is in the baseline too
+    return function(*args)
+
+
+async def consume_stream(chat_use_case: ChatUseCase, dto: ChatRequest) -> list[object]:
+    return [event async for event in chat_use_case.stream(dto=dto)]
+
+
+async def render_response(content: BaseModel) -> bytes | memoryview:
+    return ModelJSONResponse(content).body
+
+
+async def render_validated_response(route: APIRoute, content: BaseModel) -> bytes | memoryview:
+    # What FastAPI does with a returned model: dump, validate against response_model, encode
+    encoded_content = await serialize_response(field=route.response_field, response_content=content)
+    return JSONResponse(encoded_content).body
+
+
+async def post_json(client: httpx.AsyncClient, url: str, content: bytes) -> int:
+    response = await client.post(url, content=content, headers={"content-type": "application/json"})
+    response.raise_for_status()
+    return response.status_code
+
+
+def make_chat_use_case(
+    templates_dir: str,
+    template_name: str,
+    vector_storage: VectorStorageP,
+    num_facts: int,
+) -> ChatUseCase:
+    return ChatUseCase(
+        retrieval_service=RetrievalService(
+            embedder=FakeEmbedder(),
+            vector_storage=vector_storage,
+            num_search_results=num_facts,
+        ),
+        llm_prompt_builder_service=MakoRAGPromptBuilder(
+            templates_dir=templates_dir,
+            template_name=template_name,
+        ),
+        llm_service=FakeLLM(),
+    )
+
+
+def make_qdrant_storage(num_points: int) -> QdrantVectorStorage:
+    return QdrantVectorStorage(
+        client=cast(AsyncQdrantClient, FakeQdrantClient(make_scored_points(num_points))),
+        collection_name="benchmark",
+    )
+
+
+def make_chat_client(chat_use_case: ChatUseCase) -> httpx.AsyncClient:
+    # The real chat routes in an app of their own, requests never leave the process
+    provider = Provider()
+    provider.from_context(provides=ChatUseCase, scope=Scope.APP)
+
+    app = FastAPI()
+    setup_dishka(make_async_container(provider, context={ChatUseCase: chat_use_case}), app)
+    app.include_router(chat_router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+def make_request_payload(num_messages: int, num_facts: int) -> dict[str, Any]:
+    prompt_data = make_prompt_data(num_messages=num_messages, num_facts=num_facts)
+    return ChatRequest(
+        messages=prompt_data.messages,
+        user=prompt_data.user,
+        character=prompt_data.character,
+    ).model_dump(mode="json")
+
+
+def make_chat_cases(templates_dir: str, template_name: str) -> dict[str, BenchmarkCase]:
+    cases: dict[str, BenchmarkCase] = {}
+
+    request_payload = make_request_payload(num_messages=CHAT_MESSAGES, num_facts=CHAT_FACTS)
+    chat_use_case = make_chat_use_case(
+        templates_dir=templates_dir,
+        template_name=template_name,
+        vector_storage=FakeVectorStorage(search_results=make_search_results(CHAT_FACTS)),
+        num_facts=CHAT_FACTS,
+    )
+    chat_request = ChatRequest.model_validate(request_payload)
+    cases[f"chat_use_case[messages={CHAT_MESSAGES},facts={CHAT_FACTS}]"] = partial(
+        chat_use_case,
+        dto=chat_request,
+    )
+    cases[f"chat_use_case.stream[messages={CHAT_MESSAGES},facts={CHAT_FACTS}]"] = partial(
+        consume_stream,
+        chat_use_case=chat_use_case,
+        dto=chat_request,
+    )
+
+    # Large history and fact counts, facts come through the Qdrant payload conversion
+    large_payload = make_request_payload(num_messages=LARGE_CHAT_MESSAGES, num_facts=0)
+    large_use_case = make_chat_use_case(
+        templates_dir=templates_dir,
+        template_name=template_name,
+        vector_storage=make_qdrant_storage(num_points=LARGE_CHAT_FACTS),
+        num_facts=LARGE_CHAT_FACTS,
+    )
+    large_name = f"messages={LARGE_CHAT_MESSAGES},facts={LARGE_CHAT_FACTS}"
+    cases[f"chat_use_case[{large_name}]"] = partial(
+        large_use_case,
+        dto=ChatRequest.model_validate(large_payload),
+    )
+    cases[f"chat_endpoint[{large_name}]"] = partial(
+        post_json,
+        client=make_chat_client(chat_use_case=large_use_case),
+        url="/chat",
+        content=json.dumps(large_payload).encode(),
+    )
+    return cases
+
+
+def make_cases(templates_dir: str, template_name: str) -> dict[str, BenchmarkCase]:
+    prompt_builder = MakoRAGPromptBuilder(templates_dir=templates_dir, template_name=template_name)
+    cases: dict[str, BenchmarkCase] = {}
+
+    for num_messages, num_facts in SIZES:
+        prompt_data = make_prompt_data(num_messages=num_messages, num_facts=num_facts)
+        cases[f"prompt_builder.make[messages={num_messages},facts={num_facts}]"] = partial(
+            prompt_builder.make,
+            prompt_data=prompt_data,
+        )
+
+    for num_points in NUM_POINTS:
+        cases[f"qdrant.find_nearest[points={num_points}]"] = partial(
+            make_qdrant_storage(num_points=num_points).find_nearest,
+            query_embedding=[1.0],
+            num_search_results=num_points,
+        )
+
+    cases[f"chat_request.validate[messages={CHAT_MESSAGES}]"] = partial(
+        call_sync,
+        ChatRequest.model_validate,
+        make_request_payload(num_messages=CHAT_MESSAGES, num_facts=CHAT_FACTS),
+    )
+    chat_route = next(
+        route
+        for route in chat_router.routes
+        if isinstance(route, APIRoute) and route.path == "/chat"
+    )
+    for num_facts in (CHAT_FACTS, LARGE_CHAT_FACTS):
+        chat_response = ChatResponse(
+            generated_text="*sips drink* Not bad, how about you?",
+            search_results=make_search_results(num_facts),
+        )
+        cases[f"chat_response.serialize[facts={num_facts}]"] = partial(
+            call_sync,
+            chat_response.model_dump_json,
+        )
+        cases[f"chat_response.render[facts={num_facts}]"] = partial(
+            render_response,
+            content=chat_response,
+        )
+        cases[f"chat_response.render_validated[facts={num_facts}]"] = partial(
+            render_validated_response,
+            route=chat_route,
+            content=chat_response,
+        )
+
+    cases.update(make_chat_cases(templates_dir=templates_dir, template_name=template_name))
+    return cases
+
+
+async def time_iterations(case: BenchmarkCase, iterations: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        await case()
+    return time.perf_counter() - start_time
+
+
+async def measure(case: BenchmarkCase, min_time: float, repeats: int) -> BenchmarkResult:
+    # Doubles the iterations until one measurement is long enough to trust the clock
+    iterations = 1
+    while await time_iterations(case=case, iterations=iterations) < min_time:
+        iterations *= 2
+
+    best_duration = min(
+        [await time_iterations(case=case, iterations=iterations) for _ in range(repeats)],
+    )
+    return BenchmarkResult(
+        iterations=iterations,
+        seconds_per_op=best_duration / iterations,
+        ops_per_second=iterations / best_duration,
+    )
+
+
+async def run_cases(
+    cases: dict[str, BenchmarkCase], min_time: float, repeats: int
+) -> BenchmarkReport:
+    results = {}
+    for name, case in cases.items():
+        results[name] = await measure(case=case, min_time=min_time, repeats=repeats)
+    return BenchmarkReport(python_version=platform.python_version(), results=results)
+
+
+def compare(report: BenchmarkReport, baseline: BenchmarkReport, threshold: float) -> list[str]:
+    click.echo(f"\n{'case':<48} {'baseline (op/s)':>16} {'current (op/s)':>16} {'change':>8}")
+    regressions = []
+    for name, result in report.results.items():
+        baseline_result = baseline.results.get(name)
+        if baseline_result is None:
+            click.echo(f"{name:<48} {'-':>16} {result.ops_per_second:>16.0f} {'new':>8}")
+            continue
+
+        change = result.ops_per_second / baseline_result.ops_per_second - 1
+        click.echo(
+            f"{name:<48} {baseline_result.ops_per_second:>16.0f} "
+            f"{result.ops_per_second:>16.0f} {change:>+8.1%}",
+        )
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+@click.command()
+@click.option("--templates-dir", default="./static/templates/", type=str, help="Templates dir")
+@click.option("--template-name", default="chat_rag.mako", type=str, help="Template name")
+@click.option("--select", default=None, type=str, help="Run only cases containing this text")
+@click.option("--min-time", default=0.1, type=float, help="Minimal duration of one measurement")
+@click.option("--repeats", default=5, type=int, help="Measurements per case, the best is kept")
+@click.option("--output", default="benchmarks/results/latest.json", type=str, help="Results JSON")
+@click.option("--baseline", default=None, type=str, help="Baseline results JSON to compare with")
+@click.option("--threshold", default=0.1, type=float, help="Allowed throughput drop, 0.1 is 10%")
+def components_benchmark(  # noqa: WPS211
+    templates_dir: str,
+    template_name: str,
+    select: str | None,
+    min_time: float,
+    repeats: int,
+    output: str,
+    baseline: str | None,
+    threshold: float,
+) -> None:
+    # Log rendering is not what is measured here
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    cases = make_cases(templates_dir=templates_dir, template_name=template_name)
+    if select is not None:
+        cases = {name: case for name, case in cases.items() if select in name}
+
+    report = asyncio.run(run_cases(cases=cases, min_time=min_time, repeats=repeats))
+    for name, result in report.results.items():
+        click.echo(f"{name:<48} {result.seconds_per_op * 1e6:>10.2f} us/op")
+
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(report.model_dump_json(indent=2))
+    click.echo(f"\nResults saved to {output_path}")
+
+    if baseline is None:
+        return
+
+    regressions = compare(
+        report=report,
+        baseline=BenchmarkReport.model_validate_json(Path(baseline).read_text()),
+        threshold=threshold,
+    )
+    if regressions:
+        raise click.ClickException(
+            f"Throughput dropped by more than {threshold:.0%}: {', '.join(regressions)}",
+        )
+
+
+if __name__ == "__main__":
+    components_benchmark()
@@ -0,0 +1,136 @@
+from typing import AsyncIterator
+
+from qdrant_client.http import models
+
+from backend.application.services.embedder import EmbedderP
+from backend.application.services.llm import LLMServiceP
+from backend.application.services.vector_storage import VectorStorageP
+from backend.application.value_objects.generation_parameters import GenerationParameters
+from backend.application.value_objects.hybrid_search_results import HybridSearchResults
+from backend.application.value_objects.prompt import Prompt
+from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.sparse_vector import SparseVector
+from backend.application.value_objects.tenant_scope import TenantScope
+from backend.domain.entities.fact import Fact
+from backend.domain.value_objects.chat_actor import ChatActor
+
+EMBEDDING_DIMENSION = 1024
+
+
+def make_search_results(num_facts: int) -> list[SearchResult]:
+    return [
+        SearchResult(
+            content=Fact(owner=ChatActor.USER, text=f"Fact number {index} about John"),
+            relevance_score=0.9,
+        )
+        for index in range(num_facts)
+    ]
+
+
+def make_scored_points(num_points: int) -> list[models.ScoredPoint]:
+    return [
+        models.ScoredPoint(
+            id=index,
+            version=0,
+            score=0.9,
+            payload={
+                "owner": ChatActor.USER.value,
+                "text": f"Fact number {index} about John",
+                "user_id": "user",
+                "character_id": "character",
+            },
+        )
+        for index in range(num_points)
+    ]
+
+
+class FakeEmbedder(EmbedderP):
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION):
+        self._embedding = [1 / dimension for _ in range(dimension)]
+
+    async def embed(self, query: str) -> list[float]:
+        return self._embedding
+
+    async def embed_batch(self, queries: list[str]) -> list[list[float]]:
+        return [self._embedding for _ in queries]
+
+
+class FakeVectorStorage(VectorStorageP):
+    def __init__(self, search_results: list[SearchResult]):
+        self._search_results = search_results
+
+    async def find_nearest(
+        self,
+        query_embedding: list[float],
+        num_search_results: int,
+        tenant_scope: TenantScope | None = None,
+    ) -> list[SearchResult]:
+        return self._search_results[:num_search_results]
+
+    async def find_nearest_batch(
+        self,
+        query_embeddings: list[list[float]],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[list[SearchResult]]:
+        return [self._search_results[:num_search_results] for _ in query_embeddings]
+
+    async def find_nearest_hybrid(
+        self,
+        query_embedding: list[float],
+        query_sparse_vector: SparseVector,
+        num_search_results: int,
+        tenant_scope: TenantScope | None = None,
+    ) -> HybridSearchResults:
+        return HybridSearchResults(
+            dense_results=self._search_results[:num_search_results],
+            sparse_results=self._search_results[:num_search_results],
+        )
+
+    async def find_nearest_hybrid_batch(
+        self,
+        query_embeddings: list[list[float]],
+        query_sparse_vectors: list[SparseVector],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[HybridSearchResults]:
+        return [
+            await self.find_nearest_hybrid(
+                query_embedding=query_embedding,
+                query_sparse_vector=query_sparse_vector,
+                num_search_results=num_search_results,
+            )
+            for query_embedding, query_sparse_vector in zip(
+                query_embeddings, query_sparse_vectors, strict=True
+            )
+        ]
+
+
+class FakeLLM(LLMServiceP):
+    def __init__(self, reply: str = "*sips drink* Not bad, how about you?"):
+        self._generation_parameters = GenerationParameters(model_name="fake")
+        self._reply = reply
+
+    async def generate(self, prompt: Prompt) -> str:
+        return self._reply
+
+    async def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]:
+        for word in self._reply.split(" "):
+            yield f"{word} "
+
+
+class FakeQdrantClient:
+    """Answers point queries with prepared points, leaving only the payload conversion to time."""
+
+    def __init__(self, points: list[models.ScoredPoint]):
+        self._points = points
+
+    async def query_points(self, **kwargs: object) -> models.QueryResponse:
+        return models.QueryResponse(points=self._points)
+
+    async def query_batch_points(
+        self,
+        requests: list[models.QueryRequest],
+        **kwargs: object,
+    ) -> list[models.QueryResponse]:
+        return [models.QueryResponse(points=self._points) for _ in requests]
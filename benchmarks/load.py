@@ -0,0 +1,451 @@
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any
+
+import click
+import httpx
+import numpy as np
+from pydantic import BaseModel
+from qdrant_client import AsyncQdrantClient
+
+from backend.domain.entities.character import Character
+from backend.domain.entities.message import Message
+from backend.domain.entities.user import User
+from backend.domain.value_objects.chat_actor import ChatActor
+from backend.infrastructure.configuration.config import get_config
+from backend.infrastructure.configuration.enums import VectorStorageBackend
+from backend.integrations.services.vector_storage.snapshot import export_qdrant_snapshot
+from backend.presentation.api.models.chat import ChatRequest
+
+READY_TIMEOUT_SECONDS = 60.0
+READY_POLL_SECONDS = 0.25
+HISTORY_TURNS = 3
+SMALL_TALK = ("yo, what's up?", "not much, just chilling", "same here, long week")
+
+
+class RequestOutcome(BaseModel):
+    is_ok: bool
+    latency_seconds: float
+    first_byte_seconds: float
+
+
+class LevelReport(BaseModel):
+    rate: float
+    requests: int
+    errors: int
+    throughput: float
+    max_in_flight: int
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    first_byte_p50_ms: float
+    first_byte_p99_ms: float
+
+
+class LocalStack(BaseModel):
+    mock_args: list[str]
+    mock_port: int
+    service_port: int
+    facts_path: str
+    workers: int
+    vector_storage: str
+    show_logs: bool
+
+
+class InFlight:
+    def __init__(self) -> None:
+        self.current = 0
+        self.peak = 0
+
+    def enter(self) -> None:
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+
+    def exit(self) -> None:
+        self.current -= 1
+
+
+def build_conversations(
+    user_path: str,
+    character_path: str,
+    facts_path: str,
+    num_conversations: int,
+) -> list[dict[str, Any]]:
+    user = User.model_validate_json(Path(user_path).read_text())
+    character = Character.model_validate_json(Path(character_path).read_text())
+    facts = [line.strip() for line in Path(facts_path).read_text().splitlines() if line.strip()]
+    generator = random.Random(0)
+
+    conversations = []
+    for _ in range(num_conversations):
+        messages = [
+            Message(actor=(ChatActor.USER, ChatActor.CHARACTER)[index % 2], text=text)
+            for index, text in enumerate(generator.sample(SMALL_TALK, k=HISTORY_TURNS))
+        ]
+        # The last turn mentions a fact, so retrieval has something to find
+        messages.append(
+            Message(actor=ChatActor.USER, text=f"Guess what, I {generator.choice(facts).lower()}"),
+        )
+        chat_request = ChatRequest(messages=messages, user=user, character=character)
+        conversations.append(chat_request.model_dump(mode="json"))
+    return conversations
+
+
+def load_conversations(path: str) -> list[dict[str, Any]]:
+    # One ChatRequest per line, validated up front so the load run only measures the service
+    return [
+        ChatRequest.model_validate_json(line).model_dump(mode="json")
+        for line in Path(path).read_text().splitlines()
+        if line.strip()
+    ]
+
+
+async def send_request(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict[str, Any],
+    in_flight: InFlight,
+) -> RequestOutcome:
+    in_flight.enter()
+    start_time = time.perf_counter()
+    first_byte_seconds = None
+    is_ok = False
+    try:
+        async with client.stream("POST", url, json=payload) as response:
+            async for _ in response.aiter_bytes():
+                if first_byte_seconds is None:
+                    first_byte_seconds = time.perf_counter() - start_time
+            is_ok = response.status_code == httpx.codes.OK
+    except httpx.HTTPError:
+        is_ok = False
+    in_flight.exit()
+
+    latency_seconds = time.perf_counter() - start_time
+    return RequestOutcome(
+        is_ok=is_ok,
+        latency_seconds=latency_seconds,
+        first_byte_seconds=latency_seconds if first_byte_seconds is None else first_byte_seconds,
+    )
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    url: str,
+    conversations: list[dict[str, Any]],
+    rate: float,
+    duration: float,
+) -> LevelReport:
+    # Open loop: arrivals follow a Poisson process and never wait for earlier responses
+    generator = random.Random(int(rate))
+    in_flight = InFlight()
+    tasks: list[asyncio.Task[RequestOutcome]] = []
+    start_time = time.perf_counter()
+    next_arrival = start_time
+    while next_arrival - start_time < duration:
+        await asyncio.sleep(max(0, next_arrival - time.perf_counter()))
+        payload = conversations[len(tasks) % len(conversations)]
+        tasks.append(asyncio.create_task(send_request(client, url, payload, in_flight)))
+        next_arrival += generator.expovariate(rate)
+
+    outcomes = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start_time
+
+    successful = [outcome for outcome in outcomes if outcome.is_ok]
+    latencies = np.array([outcome.latency_seconds for outcome in successful] or [0]) * 1000
+    first_bytes = np.array([outcome.first_byte_seconds for outcome in successful] or [0]) * 1000
+    return LevelReport(
+        rate=rate,
+        requests=len(outcomes),
+        errors=len(outcomes) - len(successful),
+        throughput=len(successful) / elapsed,
+        max_in_flight=in_flight.peak,
+        latency_p50_ms=float(np.percentile(latencies, 50)),
+        latency_p95_ms=float(np.percentile(latencies, 95)),
+        latency_p99_ms=float(np.percentile(latencies, 99)),
+        first_byte_p50_ms=float(np.percentile(first_bytes, 50)),
+        first_byte_p99_ms=float(np.percentile(first_bytes, 99)),
+    )
+
+
+def make_upstream_env(mock_url: str) -> dict[str, str]:
+    return {
+        **os.environ,
+        "APP__ENVIRONMENT": "production",
+        "APP__EMBEDDER__PROVIDER": "cohere",
+        "APP__EMBEDDER__API_KEY": "load-test",
+        "APP__EMBEDDER__BASE_URL": mock_url,
+        "APP__CHAT_LLM__API_KEY": "load-test",
+        "APP__CHAT_LLM__BASE_URL": f"{mock_url}/v1",
+        # Mock embeddings are hashed words, their similarities are lower than real ones
+        "APP__RAG__RELEVANCE_THRESHOLD": "0",
+    }
+
+
+def make_storage_env(vector_storage: str, qdrant_path: str, snapshot_dir: str) -> dict[str, str]:
+    if vector_storage == VectorStorageBackend.IN_MEMORY:
+        return {
+            "APP__VECTOR_STORAGE__BACKEND": VectorStorageBackend.IN_MEMORY,
+            "APP__VECTOR_STORAGE__IN_MEMORY__SNAPSHOT_DIR": snapshot_dir,
+        }
+    return {
+        "APP__VECTOR_STORAGE__BACKEND": VectorStorageBackend.QDRANT,
+        "APP__VECTOR_STORAGE__PATH": qdrant_path,
+    }
+
+
+async def start_process(
+    stack: AsyncExitStack,
+    args: list[str],
+    env: dict[str, str] | None = None,
+    show_logs: bool = False,
+) -> asyncio.subprocess.Process:
+    log_stream = None if show_logs else asyncio.subprocess.DEVNULL
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        *args,
+        env=env,
+        stdout=log_stream,
+        stderr=log_stream,
+    )
+    stack.push_async_callback(stop_process, process)
+    return process
+
+
+async def stop_process(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        process.terminate()
+    await process.wait()
+
+
+async def wait_until_ready(
+    client: httpx.AsyncClient,
+    url: str,
+    process: asyncio.subprocess.Process,
+) -> None:
+    deadline = time.perf_counter() + READY_TIMEOUT_SECONDS
+    while time.perf_counter() < deadline:
+        if process.returncode is not None:
+            raise click.ClickException(f"{url} process exited with code {process.returncode}")
+        try:
+            response = await client.get(url)
+        except httpx.TransportError:
+            response = None
+        if response is not None and response.status_code < httpx.codes.INTERNAL_SERVER_ERROR:
+            return
+        await asyncio.sleep(READY_POLL_SECONDS)
+    raise click.ClickException(f"{url} is not ready after {READY_TIMEOUT_SECONDS} seconds")
+
+
+async def store_facts(env: dict[str, str], facts_path: str, qdrant_path: str) -> None:
+    # Ingestion keeps a checkpoint next to the facts, so it reads a copy in the temporary dir
+    facts_copy = Path(qdrant_path).with_name(Path(facts_path).name)
+    shutil.copyfile(facts_path, facts_copy)
+    seed_process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "cli/add_facts.py",
+        "--recreate",
+        "--path-to-user-facts",
+        str(facts_copy),
+        env={**env, "APP__VECTOR_STORAGE__PATH": qdrant_path},
+        stdout=asyncio.subprocess.DEVNULL,
+    )
+    if await seed_process.wait():
+        raise click.ClickException("Storing facts in the embedded Qdrant failed")
+
+
+async def export_snapshot(qdrant_path: str, snapshot_dir: str) -> None:
+    # Workers only read the exported snapshot, so none of them needs the single-process Qdrant
+    client = AsyncQdrantClient(path=qdrant_path)
+    collection_name = get_config().vector_storage.collection_name
+    await export_qdrant_snapshot(
+        client=client,
+        collection_name=collection_name,
+        snapshot_root=Path(snapshot_dir) / collection_name,
+    )
+    await client.close()
+
+
+async def prepare_facts(
+    env: dict[str, str],
+    local_stack: LocalStack,
+    qdrant_path: str,
+    snapshot_dir: str,
+) -> None:
+    # Embedded Qdrant allows one process at a time, so facts are stored before the service starts
+    await store_facts(env=env, facts_path=local_stack.facts_path, qdrant_path=qdrant_path)
+    if local_stack.vector_storage == VectorStorageBackend.IN_MEMORY:
+        await export_snapshot(qdrant_path=qdrant_path, snapshot_dir=snapshot_dir)
+
+
+async def start_local_stack(
+    stack: AsyncExitStack,
+    client: httpx.AsyncClient,
+    local_stack: LocalStack,
+) -> str:
+    mock_url = f"http://127.0.0.1:{local_stack.mock_port}"
+    mock_process = await start_process(
+        stack,
+        ["benchmarks/mock_upstreams.py", "--port", str(local_stack.mock_port)]
+        + local_stack.mock_args,
+        show_logs=local_stack.show_logs,
+    )
+    await wait_until_ready(client=client, url=f"{mock_url}/docs", process=mock_process)
+
+    data_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="load_")))
+    qdrant_path = str(data_dir / "qdrant")
+    snapshot_dir = str(data_dir / "snapshots")
+    env = make_upstream_env(mock_url=mock_url)
+
+    await prepare_facts(
+        env=env,
+        local_stack=local_stack,
+        qdrant_path=qdrant_path,
+        snapshot_dir=snapshot_dir,
+    )
+
+    service_process = await start_process(
+        stack,
+        ["src/backend/run.py"],
+        env={
+            **env,
+            **make_storage_env(local_stack.vector_storage, qdrant_path, snapshot_dir),
+            "APP__API__HOST": "127.0.0.1",
+            "APP__API__PORT": str(local_stack.service_port),
+            "APP__API__WORKERS": str(local_stack.workers),
+        },
+        show_logs=local_stack.show_logs,
+    )
+    service_url = f"http://127.0.0.1:{local_stack.service_port}"
+    await wait_until_ready(client=client, url=f"{service_url}/health", process=service_process)
+    return service_url
+
+
+async def run_load(  # noqa: WPS211
+    target: str | None,
+    endpoint: str,
+    rates: list[float],
+    duration: float,
+    timeout: float,
+    conversations: list[dict[str, Any]],
+    local_stack: LocalStack,
+) -> list[LevelReport]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with AsyncExitStack() as stack:
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(timeout=timeout, limits=limits),
+        )
+        if target is None:
+            target = await start_local_stack(stack=stack, client=client, local_stack=local_stack)
+
+        url = f"{target}/api/v1/{endpoint}"
+        click.echo(f"Load against {url}\n")
+        click.echo(
+            f"{'rate':>6} {'requests':>9} {'errors':>7} {'rps':>8} {'in-flight':>10} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ttfb p50':>9} {'ttfb p99':>9}",
+        )
+        reports = []
+        for rate in rates:
+            report = await run_level(client, url, conversations, rate, duration)
+            reports.append(report)
+            click.echo(
+                f"{report.rate:>6.1f} {report.requests:>9} {report.errors:>7} "
+                f"{report.throughput:>8.1f} {report.max_in_flight:>10} "
+                f"{report.latency_p50_ms:>8.0f} {report.latency_p95_ms:>8.0f} "
+                f"{report.latency_p99_ms:>8.0f} {report.first_byte_p50_ms:>9.0f} "
+                f"{report.first_byte_p99_ms:>9.0f}",
+            )
+    return reports
+
+
+@click.command()
+@click.option("--target", default=None, type=str, help="Running service URL, skips local stack")
+@click.option("--endpoint", default="chat", type=click.Choice(["chat", "chat/stream"]))
+@click.option("--rates", default="5,10,20,40", type=str, help="Arrival rates (requests/s)")
+@click.option("--duration", default=20.0, type=float, help="Seconds of arrivals per rate")
+@click.option("--timeout", default=30.0, type=float, help="Request timeout in seconds")
+@click.option("--conversations", default=None, type=str, help="JSONL file of ChatRequest")
+@click.option("--num-conversations", default=200, type=int, help="Conversations to build")
+@click.option("--user-path", default="./static/user.json", type=str, help="User JSON")
+@click.option("--character-path", default="./static/character.json", type=str)
+@click.option("--facts-path", default="./static/user_facts.txt", type=str, help="User facts")
+@click.option("--mock-port", default=8900, type=int, help="Port of the mock upstreams")
+@click.option("--service-port", default=8100, type=int, help="Port of the started service")
+@click.option("--mock-arg", "mock_args", multiple=True, help="Extra mock_upstreams.py option")
+@click.option("--workers", default=1, type=int, help="Worker processes of the started service")
+@click.option(
+    "--vector-storage",
+    default=VectorStorageBackend.QDRANT.value,
+    type=click.Choice([backend.value for backend in VectorStorageBackend]),
+    help="Embedded Qdrant or a snapshot searched in process (needed for several workers)",
+)
+@click.option("--output", default=None, type=str, help="Save the per-rate reports as JSON")
+@click.option("--show-logs", is_flag=True, help="Show the output of the started processes")
+def load(  # noqa: WPS211
+    target: str | None,
+    endpoint: str,
+    rates: str,
+    duration: float,
+    timeout: float,
+    conversations: str | None,
+    num_conversations: int,
+    user_path: str,
+    character_path: str,
+    facts_path: str,
+    mock_port: int,
+    service_port: int,
+    mock_args: tuple[str, ...],
+    workers: int,
+    vector_storage: str,
+    output: str | None,
+    show_logs: bool,
+) -> None:
+    """Drive the chat API with open-loop traffic at increasing rates to find its saturation point.
+
+    Without --target it starts mock Cohere/OpenAI upstreams, an embedded Qdrant with the user
+    facts and the service itself, so no API credits are spent.
+    """
+    if workers > 1 and vector_storage == VectorStorageBackend.QDRANT:
+        raise click.BadParameter(
+            "Embedded Qdrant serves one process, use --vector-storage in_memory",
+            param_hint="--workers",
+        )
+
+    if conversations is None:
+        payloads = build_conversations(user_path, character_path, facts_path, num_conversations)
+    else:
+        payloads = load_conversations(path=conversations)
+
+    reports = asyncio.run(
+        run_load(
+            target=target,
+            endpoint=endpoint,
+            rates=[float(rate) for rate in rates.split(",")],
+            duration=duration,
+            timeout=timeout,
+            conversations=payloads,
+            local_stack=LocalStack(
+                mock_args=list(mock_args),
+                mock_port=mock_port,
+                service_port=service_port,
+                facts_path=facts_path,
+                workers=workers,
+                vector_storage=vector_storage,
+                show_logs=show_logs,
+            ),
+        ),
+    )
+
+    if output is not None:
+        Path(output).write_text(json.dumps([report.model_dump() for report in reports], indent=2))
+
+
+if __name__ == "__main__":
+    load()
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+import zlib
+from typing import Any, AsyncIterator
+
+import click
+import numpy as np
+import uvicorn
+from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+TOKEN_PATTERN = re.compile(r"\w+")
+REPLY_WORDS = ("*sips drink*", "honestly", "that", "sounds", "like", "a", "plan", "for", "us")
+
+
+class LatencyProfile(BaseModel):
+    """Log-normal latency around a median; a zero sigma gives a fixed delay."""
+
+    median_ms: float = 0
+    sigma: float = 0
+    error_rate: float = 0
+
+    def sample_seconds(self) -> float:
+        return self.median_ms * math.exp(self.sigma * random.gauss()) / 1000
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+
+class MockSettings(BaseModel):
+    dimension: int = 1024
+    embed: LatencyProfile = LatencyProfile()
+    rerank: LatencyProfile = LatencyProfile()
+    llm: LatencyProfile = LatencyProfile()
+    token_ms: float = 0
+    reply_words: int = 30
+
+
+class EmbedRequest(BaseModel):
+    texts: list[str]
+    model: str
+
+
+class RerankRequest(BaseModel):
+    query: str
+    documents: list[str]
+    model: str
+    top_n: int | None = None
+
+
+class ChatCompletionRequest(BaseModel):
+    messages: list[dict[str, Any]]
+    model: str
+    stream: bool = False
+
+
+router = APIRouter()
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def embed_text(text: str, dimension: int) -> list[float]:
+    # Hashed bag of words, so texts sharing words end up close like with a real model
+    embedding = np.zeros(dimension, dtype=np.float32)
+    for token in tokenize(text):
+        token_hash = zlib.crc32(token.encode())
+        embedding[token_hash % dimension] += 1 if token_hash & 1 else -1
+
+    norm = float(np.linalg.norm(embedding))
+    if norm == 0:
+        embedding[0] = 1
+        norm = 1
+    return (embedding / norm).tolist()
+
+
+def make_reply(num_words: int) -> list[str]:
+    return [REPLY_WORDS[index % len(REPLY_WORDS)] for index in range(num_words)]
+
+
+def error_response() -> JSONResponse:
+    return JSONResponse(status_code=503, content={"message": "Mock upstream is unavailable"})
+
+
+def get_settings(request: Request) -> MockSettings:
+    settings: MockSettings = request.app.state.settings
+    return settings
+
+
+@router.post("/v2/embed")
+async def embed_endpoint(body: EmbedRequest, request: Request) -> Response:
+    settings = get_settings(request)
+    await asyncio.sleep(settings.embed.sample_seconds())
+    if settings.embed.should_fail():
+        return error_response()
+
+    return JSONResponse(
+        content={
+            "id": str(uuid.uuid4()),
+            "response_type": "embeddings_by_type",
+            "embeddings": {"float": [embed_text(text, settings.dimension) for text in body.texts]},
+            "texts": body.texts,
+            "meta": {"billed_units": {"input_tokens": sum(len(text) for text in body.texts)}},
+        },
+    )
+
+
+@router.post("/v2/rerank")
+async def rerank_endpoint(body: RerankRequest, request: Request) -> Response:
+    settings = get_settings(request)
+    await asyncio.sleep(settings.rerank.sample_seconds())
+    if settings.rerank.should_fail():
+        return error_response()
+
+    query_tokens = set(tokenize(body.query))
+    scores = [
+        len(query_tokens.intersection(tokenize(document))) / (len(query_tokens) or 1)
+        for document in body.documents
+    ]
+    ranking = sorted(range(len(scores)), key=lambda index: scores[index], reverse=True)
+    return JSONResponse(
+        content={
+            "id": str(uuid.uuid4()),
+            "results": [
+                {"index": index, "relevance_score": scores[index]}
+                for index in ranking[: body.top_n or len(ranking)]
+            ],
+        },
+    )
+
+
+@router.post("/v1/chat/completions")
+async def chat_completions_endpoint(body: ChatCompletionRequest, request: Request) -> Response:
+    settings = get_settings(request)
+    await asyncio.sleep(settings.llm.sample_seconds())
+    if settings.llm.should_fail():
+        return error_response()
+
+    words = make_reply(num_words=settings.reply_words)
+    if body.stream:
+        return StreamingResponse(
+            stream_chunks(words=words, model=body.model, token_ms=settings.token_ms),
+            media_type="text/event-stream",
+        )
+
+    await asyncio.sleep(len(words) * settings.token_ms / 1000)
+    return JSONResponse(
+        content={
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(words)},
+                    "finish_reason": "stop",
+                },
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(words), "total_tokens": 0},
+        },
+    )
+
+
+async def stream_chunks(words: list[str], model: str, token_ms: float) -> AsyncIterator[str]:
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    for index, word in enumerate(words):
+        if index:
+            await asyncio.sleep(token_ms / 1000)
+        yield make_chunk(completion_id, created, model, {"content": f" {word}" if index else word})
+    final_chunk = make_chunk(completion_id, created, model, {}, finish_reason="stop")
+    yield f"{final_chunk}data: [DONE]\n\n"
+
+
+def make_chunk(
+    completion_id: str,
+    created: int,
+    model: str,
+    delta: dict[str, str],
+    finish_reason: str | None = None,
+) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def make_app(settings: MockSettings) -> FastAPI:
+    app = FastAPI(title="Mock upstreams")
+    app.state.settings = settings
+    app.include_router(router)
+    return app
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", type=str, help="Host to bind")
+@click.option("--port", default=8900, type=int, help="Port to bind")
+@click.option("--dimension", default=1024, type=int, help="Embedding dimension")
+@click.option("--embed-median-ms", default=40.0, type=float, help="Median embed latency")
+@click.option("--rerank-median-ms", default=60.0, type=float, help="Median rerank latency")
+@click.option("--llm-median-ms", default=400.0, type=float, help="Median time to first token")
+@click.option("--sigma", default=0.3, type=float, help="Log-normal latency spread, 0 is fixed")
+@click.option("--error-rate", default=0, type=float, help="Share of requests answered with 503")
+@click.option("--token-ms", default=15.0, type=float, help="Delay between streamed tokens")
+@click.option("--reply-words", default=30, type=int, help="Words in every generated reply")
+def mock_upstreams(  # noqa: WPS211
+    host: str,
+    port: int,
+    dimension: int,
+    embed_median_ms: float,
+    rerank_median_ms: float,
+    llm_median_ms: float,
+    sigma: float,
+    error_rate: float,
+    token_ms: float,
+    reply_words: int,
+) -> None:
+    """Serve the Cohere embed/rerank and OpenAI chat completions APIs with simulated latency."""
+    settings = MockSettings(
+        dimension=dimension,
+        embed=LatencyProfile(median_ms=embed_median_ms, sigma=sigma, error_rate=error_rate),
+        rerank=LatencyProfile(median_ms=rerank_median_ms, sigma=sigma, error_rate=error_rate),
+        llm=LatencyProfile(median_ms=llm_median_ms, sigma=sigma, error_rate=error_rate),
+        token_ms=token_ms,
+        reply_words=reply_words,
+    )
+    uvicorn.run(make_app(settings=settings), host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    mock_upstreams()
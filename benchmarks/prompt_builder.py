@@ -0,0 +1,125 @@
+import asyncio
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+import click
+from mako.lookup import TemplateLookup  # type: ignore
+
+from backend.application.value_objects.prompts_data.rag import RAGPromptData
+from backend.application.value_objects.search_result import SearchResult
+from backend.domain.entities.character import Character
+from backend.domain.entities.fact import Fact
+from backend.domain.entities.message import Message
+from backend.domain.entities.user import User
+from backend.domain.value_objects.chat_actor import ChatActor
+from backend.integrations.services.prompts.rag import MakoRAGPromptBuilder
+
+SIZES = ((0, 0), (15, 3), (50, 10))
+
+
+def make_prompt_data(num_messages: int, num_facts: int) -> RAGPromptData:
+    actors = (ChatActor.USER, ChatActor.CHARACTER)
+    return RAGPromptData(
+        user=User(name="John", age=23),
+        character=Character(name="Blaze", age=19, description="Street persona. " * 40),
+        messages=[
+            Message(actor=actors[index % 2], text=f"Message number {index}, how was your week?")
+            for index in range(num_messages)
+        ],
+        search_results=[
+            SearchResult(
+                content=Fact(owner=ChatActor.USER, text=f"Fact number {index} about John"),
+                relevance_score=0.5,
+            )
+            for index in range(num_facts)
+        ],
+    )
+
+
+def per_request_lookup_render(
+    templates_dir: str,
+    template_name: str,
+) -> Callable[[RAGPromptData], Awaitable[object]]:
+    # Mirrors the previous builder: default lookup with filesystem checks, resolved per request
+    lookup = TemplateLookup(directories=[templates_dir], input_encoding="utf-8")
+
+    async def render(prompt_data: RAGPromptData) -> str:  # noqa: WPS430
+        template = lookup.get_template(template_name)
+        return template.render(
+            user=prompt_data.user,
+            character=prompt_data.character,
+            messages=prompt_data.messages,
+            search_results=prompt_data.search_results,
+            ChatActor=ChatActor,
+        )
+
+    return render
+
+
+async def measure_throughput(
+    render: Callable[[RAGPromptData], Awaitable[object]],
+    prompt_data: RAGPromptData,
+    iterations: int,
+    repeats: int,
+) -> float:
+    best_duration = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        for _ in range(iterations):  # noqa: WPS440
+            await render(prompt_data)
+        best_duration = min(best_duration, time.perf_counter() - start_time)
+    return iterations / best_duration
+
+
+def measure_startup(templates_dir: str, template_name: str, module_directory: str | None) -> float:
+    start_time = time.perf_counter()
+    MakoRAGPromptBuilder(
+        templates_dir=templates_dir,
+        template_name=template_name,
+        module_directory=module_directory,
+    )
+    return (time.perf_counter() - start_time) * 1000
+
+
+async def run_benchmark(
+    templates_dir: str,
+    template_name: str,
+    iterations: int,
+    repeats: int,
+) -> None:
+    before = per_request_lookup_render(templates_dir=templates_dir, template_name=template_name)
+    after = MakoRAGPromptBuilder(templates_dir=templates_dir, template_name=template_name)
+
+    click.echo("messages facts   before (renders/s)   after (renders/s)   speedup")
+    for num_messages, num_facts in SIZES:
+        prompt_data = make_prompt_data(num_messages=num_messages, num_facts=num_facts)
+        before_throughput = await measure_throughput(before, prompt_data, iterations, repeats)
+        after_throughput = await measure_throughput(after.make, prompt_data, iterations, repeats)
+        click.echo(
+            f"{num_messages:>8} {num_facts:>5} {before_throughput:>20.0f} "
+            f"{after_throughput:>19.0f} {after_throughput / before_throughput:>9.2f}x",
+        )
+
+    with tempfile.TemporaryDirectory() as module_directory:
+        cold_start = measure_startup(templates_dir, template_name, module_directory)
+        warm_start = measure_startup(templates_dir, template_name, module_directory)
+    click.echo(f"\nBuilder startup: compile {cold_start:.2f} ms, module cache {warm_start:.2f} ms")
+
+
+@click.command()
+@click.option("--templates-dir", default="./static/templates/", type=str, help="Templates dir")
+@click.option("--template-name", default="chat_rag.mako", type=str, help="Template name")
+@click.option("--iterations", default=2000, type=int, help="Renders per measurement")
+@click.option("--repeats", default=5, type=int, help="Measurements per case, the best is kept")
+def prompt_builder_benchmark(
+    templates_dir: str,
+    template_name: str,
+    iterations: int,
+    repeats: int,
+) -> None:
+    asyncio.run(run_benchmark(templates_dir, template_name, iterations, repeats))
+
+
+if __name__ == "__main__":
+    prompt_builder_benchmark()
@@ -1,125 +1,515 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
 import click
-from cohere import ClientV2 as CohereClient
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 
+from backend.application.services.embedder import EmbedderP
+from backend.application.services.sparse_encoder import SparseEncoderP
+from backend.application.value_objects.tenant_scope import TenantScope
 from backend.domain.entities.fact import Fact
 from backend.domain.value_objects.chat_actor import ChatActor
 from backend.infrastructure.configuration.config import get_config
+from backend.infrastructure.configuration.enums import VectorQuantization
+from backend.infrastructure.configuration.inner.vector_storage import QdrantCollectionConfig
+from backend.infrastructure.di import make_container
+from backend.integrations.services.vector_storage.qdrant import (
+    CHARACTER_ID_FIELD,
+    SPARSE_VECTOR_NAME,
+    USER_ID_FIELD,
+)
 
+FACT_ID_NAMESPACE = uuid.UUID("5b0f4bd5-5c4f-4cf4-9b4e-2b8f6a0f6f1e")
+DEFAULT_HNSW_M = 16
 
-@click.command()
-@click.option(
-    "--path-to-user-facts",
-    default="./static/user_facts.txt",
-    type=str,
-    help="Path to user facts",
-)
-@click.option(
-    "--batch-size",
-    default=32,
-    type=int,
-    help="Batch size for processing facts",
-)
-@click.option(
-    "--embedding-dimension",
-    default=1024,
-    type=int,
-    help="Dimension of embeddings from Cohere model",
-)
-def add_facts(  # noqa: WPS213
-    path_to_user_facts: str,
+
+@dataclass
+class FactBatch:
+    index: int
+    last_line_number: int
+    facts: list[Fact]
+
+
+def make_fact_id(fact: Fact) -> str:
+    # The same fact always maps to the same point, so re-runs overwrite instead of duplicating
+    key = f"{fact.user_id or ''}:{fact.character_id or ''}:{fact.owner.value}:{fact.text}"
+    return str(uuid.uuid5(FACT_ID_NAMESPACE, key))
+
+
+def make_fact_payload(fact: Fact) -> dict[str, str]:
+    payload = {"text": fact.text, "owner": fact.owner.value}
+    if fact.user_id is not None:
+        payload[USER_ID_FIELD] = fact.user_id
+    if fact.character_id is not None:
+        payload[CHARACTER_ID_FIELD] = fact.character_id
+    return payload
+
+
+def read_fact_batches(
+    path: str,
     batch_size: int,
+    skip_lines: int,
+    tenant_scope: TenantScope | None = None,
+) -> Iterator[FactBatch]:
+    tenant_scope = tenant_scope or TenantScope()
+    facts: list[Fact] = []
+    batch_index = 0
+    line_number = 0
+
+    with open(path) as file_object:
+        for line_number, line in enumerate(file_object, start=1):
+            if line_number <= skip_lines or not line.strip():
+                continue
+
+            facts.append(
+                Fact(
+                    owner=ChatActor.USER,
+                    text=line.strip(),
+                    user_id=tenant_scope.user_id,
+                    character_id=tenant_scope.character_id,
+                ),
+            )
+            if len(facts) == batch_size:
+                yield FactBatch(index=batch_index, last_line_number=line_number, facts=facts)
+                batch_index += 1
+                facts = []
+
+    if facts:
+        yield FactBatch(index=batch_index, last_line_number=line_number, facts=facts)
+
+
+def make_checkpoint_path(path_to_user_facts: str, tenant_scope: TenantScope) -> Path:
+    # Each tenant ingesting the same file progresses independently
+    tenant_suffix = "".join(
+        f".{tenant_id}"
+        for tenant_id in (tenant_scope.user_id, tenant_scope.character_id)
+        if tenant_id is not None
+    )
+    return Path(f"{path_to_user_facts}{tenant_suffix}.checkpoint.json")
+
+
+class IngestionCheckpoint:
+    """Remembers how many lines are fully stored, advancing only over contiguous batches."""
+
+    def __init__(self, path: Path, source_path: str):
+        self._path = path
+        self._source_path = os.path.abspath(source_path)
+        self.lines_done = 0
+        self.facts_done = 0
+        self._pending: dict[int, FactBatch] = {}
+        self._next_batch_index = 0
+
+    def load(self) -> None:
+        if not self._path.exists():
+            return
+
+        state = json.loads(self._path.read_text())
+        if state.get("source_path") != self._source_path:
+            raise click.ClickException(
+                f"Checkpoint {self._path} belongs to {state.get('source_path')}",
+            )
+        self.lines_done = state["lines_done"]
+        self.facts_done = state["facts_done"]
+
+    def complete(self, batch: FactBatch) -> None:
+        self._pending[batch.index] = batch
+        while self._next_batch_index in self._pending:
+            done_batch = self._pending.pop(self._next_batch_index)
+            self.lines_done = done_batch.last_line_number
+            self.facts_done += len(done_batch.facts)
+            self._next_batch_index += 1
+        self._save()
+
+    def _save(self) -> None:
+        state = {
+            "source_path": self._source_path,
+            "lines_done": self.lines_done,
+            "facts_done": self.facts_done,
+        }
+        temporary_path = self._path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps(state))
+        os.replace(temporary_path, self._path)
+
+
+def make_quantization_config(
+    collection_config: QdrantCollectionConfig,
+) -> models.QuantizationConfig | None:
+    if collection_config.quantization == VectorQuantization.SCALAR:
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=collection_config.scalar_quantile,
+                always_ram=collection_config.quantization_always_ram,
+            ),
+        )
+    if collection_config.quantization == VectorQuantization.BINARY:
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(
+                always_ram=collection_config.quantization_always_ram,
+            ),
+        )
+    return None
+
+
+async def ensure_collection(
+    qdrant_client: AsyncQdrantClient,
+    collection_name: str,
+    collection_config: QdrantCollectionConfig,
     embedding_dimension: int,
+    recreate: bool,
+    with_sparse_vectors: bool = False,
 ) -> None:
-    config = get_config()
-    user_facts = []
-    with open(path_to_user_facts) as file_object:
-        for line in file_object:
-            if line:
-                fact = Fact(owner=ChatActor.USER, text=line.strip())
-                user_facts.append(fact)
-    click.echo(f"Num user facts: {len(user_facts)}")
-
-    cohere_client = CohereClient(
-        api_key=config.embedder.api_key.get_secret_value(),
-    )
-    qdrant_client = QdrantClient(
-        host=config.vector_storage.host.get_secret_value(),
-        port=config.vector_storage.port,
+    exists = await qdrant_client.collection_exists(collection_name)
+    if exists and recreate:
+        await qdrant_client.delete_collection(collection_name)
+        exists = False
+
+    if exists:
+        await update_collection(
+            qdrant_client=qdrant_client,
+            collection_name=collection_name,
+            collection_config=collection_config,
+            embedding_dimension=embedding_dimension,
+            with_sparse_vectors=with_sparse_vectors,
+        )
+    else:
+        await qdrant_client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=embedding_dimension,
+                distance=models.Distance.COSINE,
+                on_disk=collection_config.on_disk,
+            ),
+            # Qdrant applies IDF over the whole collection, the encoder only stores term weights
+            sparse_vectors_config=(
+                {SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)}
+                if with_sparse_vectors
+                else None
+            ),
+            hnsw_config=make_hnsw_config(collection_config=collection_config),
+            quantization_config=make_quantization_config(collection_config=collection_config),
+        )
+
+    await create_tenant_indexes(
+        qdrant_client=qdrant_client,
+        collection_name=collection_name,
+        collection_config=collection_config,
     )
 
-    collection_name = config.vector_storage.collection_name
-    if qdrant_client.collection_exists(collection_name):
-        qdrant_client.delete_collection(collection_name)
 
-    qdrant_client.create_collection(
+async def update_collection(
+    qdrant_client: AsyncQdrantClient,
+    collection_name: str,
+    collection_config: QdrantCollectionConfig,
+    embedding_dimension: int,
+    with_sparse_vectors: bool,
+) -> None:
+    collection_info = await qdrant_client.get_collection(collection_name=collection_name)
+    vectors_config = collection_info.config.params.vectors
+    if not isinstance(vectors_config, models.VectorParams):
+        raise click.ClickException(f"Collection {collection_name} uses named vectors")
+    if vectors_config.size != embedding_dimension:
+        raise click.ClickException(
+            f"Collection {collection_name} stores {vectors_config.size}-dimensional vectors, "
+            f"the embedder produces {embedding_dimension}. Re-run with --recreate",
+        )
+    sparse_vectors_config = collection_info.config.params.sparse_vectors or {}
+    if with_sparse_vectors and SPARSE_VECTOR_NAME not in sparse_vectors_config:
+        raise click.ClickException(
+            f"Collection {collection_name} has no sparse vectors. Re-run with --recreate",
+        )
+
+    # Storage and index settings can change in place; Qdrant rebuilds in the background
+    await qdrant_client.update_collection(
         collection_name=collection_name,
-        vectors_config=models.VectorParams(
-            size=embedding_dimension, distance=models.Distance.COSINE
+        vectors_config={
+            "": models.VectorParamsDiff(on_disk=collection_config.on_disk),
+        },
+        hnsw_config=make_hnsw_config(collection_config=collection_config),
+        quantization_config=(
+            make_quantization_config(collection_config=collection_config)
+            or models.Disabled.DISABLED
         ),
     )
 
-    for fact_index in range(0, len(user_facts), batch_size):
-        batch = user_facts[fact_index : fact_index + batch_size]
 
-        texts = [fact.text for fact in batch]
-        embeddings_response = cohere_client.embed(
-            texts=texts,
-            model=config.embedder.model,
-            input_type=config.embedder.input_type,
-            embedding_types=[config.embedder.embedding_type],
+def make_hnsw_config(collection_config: QdrantCollectionConfig) -> models.HnswConfigDiff:
+    if not collection_config.multitenancy:
+        return models.HnswConfigDiff(
+            m=collection_config.hnsw_m,
+            ef_construct=collection_config.hnsw_ef_construct,
         )
 
-        if embeddings_response.embeddings.float_ is None:
-            raise ValueError("Embeddings is None")
-
-        points = [
-            models.PointStruct(
-                id=index + fact_index,
-                vector=embedding,
-                payload={"text": fact.text, "owner": fact.owner.value},
-            )
-            for index, (fact, embedding) in enumerate(
-                zip(batch, embeddings_response.embeddings.float_, strict=False)
-            )
-        ]
+    # Build a graph per user instead of one global graph; searches must then filter by user
+    return models.HnswConfigDiff(
+        m=0,
+        payload_m=collection_config.hnsw_payload_m or collection_config.hnsw_m or DEFAULT_HNSW_M,
+        ef_construct=collection_config.hnsw_ef_construct,
+    )
 
-        qdrant_client.upsert(collection_name=collection_name, points=points)
 
-        click.echo(f"Processed batch {fact_index // batch_size + 1}, added {len(points)} facts")
+async def create_tenant_indexes(
+    qdrant_client: AsyncQdrantClient,
+    collection_name: str,
+    collection_config: QdrantCollectionConfig,
+) -> None:
+    if not collection_config.tenant_indexes:
+        return
 
-    click.echo("Finished adding facts to vector storage")
-    collection_info = qdrant_client.get_collection(collection_name=collection_name)
-    click.echo(collection_info)
-
-    test_text = user_facts[0].text
-    test_qdrant_response = cohere_client.embed(
-        texts=[test_text],
-        model=config.embedder.model,
-        input_type=config.embedder.input_type,
-        embedding_types=[config.embedder.embedding_type],
+    await qdrant_client.create_payload_index(
+        collection_name=collection_name,
+        field_name=USER_ID_FIELD,
+        field_schema=models.KeywordIndexParams(
+            type=models.KeywordIndexType.KEYWORD,
+            is_tenant=collection_config.multitenancy,
+        ),
+    )
+    await qdrant_client.create_payload_index(
+        collection_name=collection_name,
+        field_name=CHARACTER_ID_FIELD,
+        field_schema=models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
     )
 
-    if test_qdrant_response.embeddings.float_ is None:
-        raise ValueError("Test embeddings is None")
 
-    test_embedding = test_qdrant_response.embeddings.float_[0]
+class FactIngestionPipeline:
+    """Embeds and stores batches concurrently while the file is read lazily."""
 
-    search_result = qdrant_client.query_points(
-        collection_name=collection_name, query=test_embedding, limit=1
+    def __init__(
+        self,
+        embedder: EmbedderP,
+        qdrant_client: AsyncQdrantClient,
+        collection_name: str,
+        checkpoint: IngestionCheckpoint,
+        max_in_flight: int = 4,
+        tenant_scope: TenantScope | None = None,
+        sparse_encoder: SparseEncoderP | None = None,
+    ):
+        self._embedder = embedder
+        self._sparse_encoder = sparse_encoder
+        self._qdrant_client = qdrant_client
+        self._collection_name = collection_name
+        self._checkpoint = checkpoint
+        self._tenant_scope = tenant_scope
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._started_at = time.monotonic()
+        self._facts_at_start = checkpoint.facts_done
+
+    async def run(self, path_to_user_facts: str, batch_size: int) -> None:
+        self._started_at = time.monotonic()
+        self._facts_at_start = self._checkpoint.facts_done
+
+        async with asyncio.TaskGroup() as task_group:
+            for batch in read_fact_batches(
+                path=path_to_user_facts,
+                batch_size=batch_size,
+                skip_lines=self._checkpoint.lines_done,
+                tenant_scope=self._tenant_scope,
+            ):
+                # Reading stops while too many batches are in flight, so memory stays bounded
+                await self._in_flight.acquire()
+                task_group.create_task(self._process(batch=batch))
+
+    async def _process(self, batch: FactBatch) -> None:
+        try:
+            await self._ingest(batch=batch)
+        except BaseException:
+            self._in_flight.release()
+            raise
+        self._in_flight.release()
+
+        self._checkpoint.complete(batch=batch)
+        elapsed_seconds = max(time.monotonic() - self._started_at, 1e-9)
+        facts_per_second = (self._checkpoint.facts_done - self._facts_at_start) / elapsed_seconds
+        click.echo(
+            f"Stored {self._checkpoint.facts_done} facts "
+            f"(line {self._checkpoint.lines_done}), {facts_per_second:.1f} facts/s",
+        )
+
+    async def _ingest(self, batch: FactBatch) -> None:
+        embeddings = await self._embedder.embed_batch(queries=[fact.text for fact in batch.facts])
+        await self._qdrant_client.upsert(
+            collection_name=self._collection_name,
+            points=[
+                models.PointStruct(
+                    id=make_fact_id(fact=fact),
+                    vector=self._make_vector(fact=fact, embedding=embedding),
+                    payload=make_fact_payload(fact=fact),
+                )
+                for fact, embedding in zip(batch.facts, embeddings, strict=True)
+            ],
+            # The points are accepted into the write-ahead log; indexing continues in the background
+            wait=False,
+        )
+
+    def _make_vector(self, fact: Fact, embedding: list[float]) -> models.VectorStruct:
+        if self._sparse_encoder is None:
+            return embedding
+
+        sparse_vector = self._sparse_encoder.encode_document(text=fact.text)
+        return {
+            "": embedding,
+            SPARSE_VECTOR_NAME: models.SparseVector(
+                indices=sparse_vector.indices,
+                values=sparse_vector.values,
+            ),
+        }
+
+
+async def verify(
+    embedder: EmbedderP,
+    qdrant_client: AsyncQdrantClient,
+    collection_name: str,
+    path_to_user_facts: str,
+) -> None:
+    first_batch = next(read_fact_batches(path=path_to_user_facts, batch_size=1, skip_lines=0), None)
+    if first_batch is None:
+        return
+
+    test_text = first_batch.facts[0].text
+    search_result = await qdrant_client.query_points(
+        collection_name=collection_name,
+        query=await embedder.embed(query=test_text),
+        limit=1,
     )
     click.echo("\nVerification search results:")
     click.echo(f"Original text: {test_text}")
-    if search_result:
-        payload = search_result.points[0].payload
-        if payload:
-            click.echo(f"Found text: {payload['text']}")
-        else:
-            click.echo("Payload is None")
-        click.echo(f"Score: {search_result.points[0].score}")
-    else:
+    if not search_result.points:
         click.echo("No results found!")
+        return
+
+    payload = search_result.points[0].payload
+    click.echo(f"Found text: {payload['text']}" if payload else "Payload is None")
+    click.echo(f"Score: {search_result.points[0].score}")
+
+
+async def add_facts_async(  # noqa: WPS211, WPS217
+    path_to_user_facts: str,
+    batch_size: int,
+    max_in_flight: int,
+    recreate: bool,
+    restart: bool,
+    tenant_scope: TenantScope,
+) -> None:
+    config = get_config()
+    collection_name = config.vector_storage.collection_name
+    container = make_container()
+    embedder = await container.get(EmbedderP)
+    qdrant_client = await container.get(AsyncQdrantClient)
+    sparse_encoder = None
+    if config.vector_storage.sparse.enabled:
+        sparse_encoder = await container.get(SparseEncoderP)
+
+    checkpoint = IngestionCheckpoint(
+        path=make_checkpoint_path(
+            path_to_user_facts=path_to_user_facts,
+            tenant_scope=tenant_scope,
+        ),
+        source_path=path_to_user_facts,
+    )
+    if not (recreate or restart):
+        checkpoint.load()
+    if checkpoint.lines_done:
+        click.echo(f"Resuming after line {checkpoint.lines_done}")
+
+    await ensure_collection(
+        qdrant_client=qdrant_client,
+        collection_name=collection_name,
+        collection_config=config.vector_storage.collection,
+        # The collection must match whatever model the service is configured with
+        embedding_dimension=len(await embedder.embed(query="dimension probe")),
+        recreate=recreate,
+        with_sparse_vectors=sparse_encoder is not None,
+    )
+    pipeline = FactIngestionPipeline(
+        embedder=embedder,
+        qdrant_client=qdrant_client,
+        collection_name=collection_name,
+        checkpoint=checkpoint,
+        max_in_flight=max_in_flight,
+        tenant_scope=tenant_scope,
+        sparse_encoder=sparse_encoder,
+    )
+    await pipeline.run(path_to_user_facts=path_to_user_facts, batch_size=batch_size)
+
+    click.echo("Finished adding facts to vector storage")
+    click.echo(await qdrant_client.get_collection(collection_name=collection_name))
+    await verify(
+        embedder=embedder,
+        qdrant_client=qdrant_client,
+        collection_name=collection_name,
+        path_to_user_facts=path_to_user_facts,
+    )
+
+    await container.close()
+
+
+@click.command()
+@click.option(
+    "--path-to-user-facts",
+    default="./static/user_facts.txt",
+    type=str,
+    help="Path to user facts",
+)
+@click.option(
+    "--batch-size",
+    default=96,
+    type=int,
+    help="Batch size for processing facts",
+)
+@click.option(
+    "--max-in-flight",
+    default=4,
+    type=int,
+    help="Maximum number of batches being embedded and stored at the same time",
+)
+@click.option(
+    "--user-id",
+    default=None,
+    type=str,
+    help="Store the facts for this user only",
+)
+@click.option(
+    "--character-id",
+    default=None,
+    type=str,
+    help="Store the facts for this character only",
+)
+@click.option(
+    "--recreate",
+    is_flag=True,
+    help="Delete the collection and ingest from scratch",
+)
+@click.option(
+    "--restart",
+    is_flag=True,
+    help="Ignore the checkpoint and re-ingest the whole file into the existing collection",
+)
+def add_facts(  # noqa: WPS211
+    path_to_user_facts: str,
+    batch_size: int,
+    max_in_flight: int,
+    user_id: str | None,
+    character_id: str | None,
+    recreate: bool,
+    restart: bool,
+) -> None:
+    asyncio.run(
+        add_facts_async(
+            path_to_user_facts=path_to_user_facts,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            recreate=recreate,
+            restart=restart,
+            tenant_scope=TenantScope(user_id=user_id, character_id=character_id),
+        ),
+    )
 
 
 if __name__ == "__main__":
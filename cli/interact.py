@@ -10,6 +10,11 @@ from backend.domain.entities.message import Message
 from backend.domain.entities.user import User
 from backend.domain.value_objects.chat_actor import ChatActor
 from backend.presentation.api.models.chat import ChatRequest, ChatResponse
+from backend.presentation.api.models.session import (
+    CreateSessionRequest,
+    SessionMessageRequest,
+    SessionResponse,
+)
 
 
 class ChatClient:
@@ -19,11 +24,31 @@ class ChatClient:
         user: User,
         character: Character,
         history_size: int = 15,
+        sessions_url: str | None = None,
     ):
         self.api_url = api_url
         self.user = user
         self.character = character
         self.history: Deque[Message] = deque(maxlen=history_size)
+        self.sessions_url = sessions_url
+        self.session_id: str | None = None
+
+    def create_session(self) -> bool:
+        create_session_request = CreateSessionRequest(user=self.user, character=self.character)
+
+        try:
+            response_data = requests.post(
+                url=str(self.sessions_url),
+                data=create_session_request.model_dump_json(),
+                headers={"Content-Type": "application/json"},
+            )
+            response_data.raise_for_status()
+        except requests.exceptions.RequestException as exception:
+            click.echo(f"Error communicating with API: {str(exception)}", err=True)
+            return False
+
+        self.session_id = SessionResponse(**response_data.json()).session_id
+        return True
 
     def post_process_response(self, text: str) -> str:
         prefix = f"{self.character.name}:"
@@ -42,17 +67,31 @@ class ChatClient:
 
         return text.strip().split("\n")[0]
 
-    def send_message(self, messages: list[Message]) -> str | None:
-        chat_request = ChatRequest(
-            messages=messages,
-            user=self.user,
-            character=self.character,
+    def make_request(self, messages: list[Message]) -> tuple[str, str]:
+        if self.session_id is None:
+            chat_request = ChatRequest(
+                messages=messages,
+                user=self.user,
+                character=self.character,
+            )
+            return self.api_url, chat_request.model_dump_json()
+
+        # The server keeps the history, so only the new message is sent
+        session_message_request = SessionMessageRequest(
+            text=messages[-1].text if messages else None,
+        )
+        return (
+            f"{self.sessions_url}/{self.session_id}/messages",
+            session_message_request.model_dump_json(),
         )
 
+    def send_message(self, messages: list[Message]) -> str | None:
+        url, request_body = self.make_request(messages=messages)
+
         try:
             response_data = requests.post(
-                url=self.api_url,
-                data=chat_request.model_dump_json(),
+                url=url,
+                data=request_body,
                 headers={"Content-Type": "application/json"},
             )
             response_data.raise_for_status()
@@ -96,6 +135,9 @@ class ChatClient:
         click.echo(f'Starting chat with {self.character.name}. Type "bye" to exit.')
         click.echo("-------------------")
 
+        if self.sessions_url is not None and not self.create_session():
+            return
+
         if not self.get_greeting():
             return
 
@@ -136,6 +178,12 @@ def load_config(file_path: str) -> dict[Any, Any] | None:
     default="/api/v1/chat",
     help="Chat API method",
 )
+@click.option(
+    "--session",
+    is_flag=True,
+    default=False,
+    help="Keep the history in a server-side session and send only new messages",
+)
 @click.option(
     "--history-size",
     "-h",
@@ -160,6 +208,7 @@ def chat(
     api_host: str,
     api_port: int,
     api_method: str,
+    session: bool,
     history_size: int,
     user_config: str,
     character_config: str,
@@ -178,7 +227,8 @@ def chat(
         return
 
     api_url = f"{api_host}:{api_port}{api_method}"
-    client = ChatClient(api_url, user, character, history_size)
+    sessions_url = f"{api_host}:{api_port}/api/v1/sessions" if session else None
+    client = ChatClient(api_url, user, character, history_size, sessions_url)
     client.run()
 
 
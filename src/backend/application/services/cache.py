@@ -0,0 +1,20 @@
+from typing import Callable, Protocol, TypeVar
+
+ValueT = TypeVar("ValueT")
+
+
+class CacheP(Protocol[ValueT]):
+    async def get(self, key: str) -> ValueT | None: ...
+
+    async def set(self, key: str, value: ValueT) -> None: ...
+
+
+class AtomicCacheP(CacheP[ValueT], Protocol[ValueT]):
+    async def update(self, key: str, updater: Callable[[ValueT], ValueT]) -> ValueT | None:
+        """Replace a stored value with `updater(value)` atomically; None when the key is missing."""
+
+
+class SemanticCacheP(Protocol):
+    async def find(self, scope: str, embedding: list[float]) -> str | None: ...
+
+    async def add(self, scope: str, embedding: list[float], value: str) -> None: ...
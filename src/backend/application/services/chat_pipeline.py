@@ -0,0 +1,227 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from structlog import get_logger
+
+from backend.application.services.llm import LLMServiceP
+from backend.application.services.metrics import MetricsP
+from backend.application.services.prompt import PromptBuilderServiceP
+from backend.application.services.prompt_packer import PromptPacker
+from backend.application.services.query_builder import QueryBuilder
+from backend.application.services.resilience import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    deadline_scope,
+)
+from backend.application.services.response_cache import ResponseCacheService
+from backend.application.services.retrieval import RetrievalService
+from backend.application.services.stage_timer import StageTimer
+from backend.application.value_objects.prompt import Prompt
+from backend.application.value_objects.prompts_data.rag import RAGPromptData
+from backend.application.value_objects.retrieval_result import RetrievalResult
+from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.tenant_scope import TenantScope
+from backend.domain.entities.character import Character
+from backend.domain.entities.message import Message
+from backend.domain.entities.user import User
+
+logger = get_logger()
+
+GenerateText = Callable[[Prompt], Awaitable[str]]
+
+
+class ChatPipeline:
+    """Retrieval, prompt, cache and generation stages shared by the chat use cases.
+
+    A failed retrieval degrades to an answer without facts and is counted in
+    `retrieval_failures`, one per conversation.
+    """
+
+    def __init__(
+        self,
+        retrieval_service: RetrievalService,
+        llm_prompt_builder_service: PromptBuilderServiceP[RAGPromptData],
+        llm_service: LLMServiceP,
+        retrieval_timeout_seconds: float | None = None,
+        response_cache: ResponseCacheService | None = None,
+        query_builder: QueryBuilder | None = None,
+        prompt_packer: PromptPacker | None = None,
+        metrics: MetricsP | None = None,
+    ):
+        self._retrieval_service = retrieval_service
+        self._llm_prompt_builder_service = llm_prompt_builder_service
+        self._llm_service = llm_service
+        self._retrieval_timeout_seconds = retrieval_timeout_seconds
+        self._response_cache = response_cache or ResponseCacheService()
+        self._query_builder = query_builder or QueryBuilder()
+        self._prompt_packer = prompt_packer
+        self._metrics = metrics
+        self.retrieval_failures = 0
+
+    async def retrieve(
+        self,
+        conversations: list[list[Message]],
+        tenant_scopes: list[TenantScope | None],
+    ) -> list[RetrievalResult]:
+        retrieval_results = [RetrievalResult() for _ in conversations]
+        query_groups = [self._query_builder.build(messages=messages) for messages in conversations]
+        query_indices = [index for index, queries in enumerate(query_groups) if queries]
+        if not query_indices:
+            return retrieval_results
+
+        try:
+            # Stages inside retrieval, such as reranking, plan against this deadline
+            with deadline_scope(self._retrieval_timeout_seconds):
+                found_results = await asyncio.wait_for(
+                    self._retrieve_groups(
+                        query_groups=[query_groups[index] for index in query_indices],
+                        tenant_scopes=[tenant_scopes[index] for index in query_indices],
+                    ),
+                    timeout=self._retrieval_timeout_seconds,
+                )
+        except (TimeoutError, DeadlineExceededError):
+            logger.warning(
+                "Retrieval deadline exceeded, continuing without facts",
+                timeout_seconds=self._retrieval_timeout_seconds,
+            )
+        except CircuitOpenError as circuit_error:
+            logger.warning("Retrieval skipped, continuing without facts", error=str(circuit_error))
+        except Exception as exception:
+            logger.exception("Retrieval service exception", exception=str(exception))
+        else:
+            for index, retrieval_result in zip(query_indices, found_results, strict=True):
+                retrieval_results[index] = retrieval_result
+            return retrieval_results
+
+        self.retrieval_failures += len(query_indices)
+        return retrieval_results
+
+    def make_prompt_data(
+        self,
+        user: User,
+        character: Character,
+        messages: list[Message],
+        search_results: list[SearchResult],
+    ) -> RAGPromptData:
+        # The request is validated on the way in and the facts by the storage that found them
+        return RAGPromptData.model_construct(
+            user=user,
+            character=character,
+            messages=messages,
+            search_results=search_results,
+        )
+
+    async def make_prefix(self, prompt_data: RAGPromptData) -> str:
+        return await self._llm_prompt_builder_service.make_prefix(prompt_data=prompt_data)
+
+    async def make_prompt(
+        self,
+        prompt_data: RAGPromptData,
+        timer: StageTimer,
+        prefix: str | None = None,
+    ) -> Prompt:
+        if self._prompt_packer is not None:
+            if prefix is None:
+                prefix = await self.make_prefix(prompt_data=prompt_data)
+            with timer.measure("pack"):
+                prompt_data = self._prompt_packer.pack(prompt_data=prompt_data, prefix=prefix)
+
+        with timer.measure("render"):
+            return await self._llm_prompt_builder_service.make(prompt_data=prompt_data)
+
+    async def lookup_response(
+        self,
+        prompt: Prompt,
+        retrieval_result: RetrievalResult,
+        timer: StageTimer,
+    ) -> str | None:
+        with timer.measure("cache_lookup"):
+            return await self._response_cache.get(
+                prompt=prompt,
+                query_embedding=retrieval_result.query_embedding,
+            )
+
+    async def store_response(
+        self,
+        prompt: Prompt,
+        retrieval_result: RetrievalResult,
+        response: str,
+    ) -> None:
+        await self._response_cache.set(
+            prompt=prompt,
+            query_embedding=retrieval_result.query_embedding,
+            response=response,
+        )
+
+    async def generate(
+        self,
+        prompt: Prompt,
+        retrieval_result: RetrievalResult,
+        timer: StageTimer,
+        generate_text: GenerateText | None = None,
+    ) -> str:
+        """Answer from the response cache, or generate and cache the answer.
+
+        `generate_text` replaces the plain LLM call, e.g. to run it under a concurrency limit.
+        """
+        cached_text = await self.lookup_response(
+            prompt=prompt,
+            retrieval_result=retrieval_result,
+            timer=timer,
+        )
+        if cached_text is not None:
+            return cached_text
+
+        with timer.measure("generate"):
+            generated_text = await (generate_text or self._generate_text)(prompt)
+
+        await self.store_response(
+            prompt=prompt,
+            retrieval_result=retrieval_result,
+            response=generated_text,
+        )
+        return generated_text
+
+    def log_timings(self, timer: StageTimer, pipeline: str, **log_fields: Any) -> None:
+        total_ms = timer.total()
+        logger.info(
+            "Chat stage timings",
+            pipeline=pipeline,
+            total_ms=round(total_ms, 2),
+            **log_fields,
+            **{f"{stage}_ms": round(duration, 2) for stage, duration in timer.durations.items()},
+        )
+
+        if self._metrics is None:
+            return
+
+        self._metrics.observe_stage(
+            pipeline=pipeline, stage="total", duration_seconds=total_ms / 1000
+        )
+        for stage, duration in timer.durations.items():
+            self._metrics.observe_stage(
+                pipeline=pipeline,
+                stage=stage,
+                duration_seconds=duration / 1000,
+            )
+
+    async def _retrieve_groups(
+        self,
+        query_groups: list[list[str]],
+        tenant_scopes: list[TenantScope | None],
+    ) -> list[RetrievalResult]:
+        if len(query_groups) == 1:
+            retrieval_result = await self._retrieval_service.retrieve_merged(
+                queries=query_groups[0],
+                tenant_scope=tenant_scopes[0],
+            )
+            return [retrieval_result]
+
+        # Every query of every conversation goes through one embedding call and one search
+        return await self._retrieval_service.retrieve_merged_batch(
+            query_groups=query_groups,
+            tenant_scopes=tenant_scopes,
+        )
+
+    async def _generate_text(self, prompt: Prompt) -> str:
+        return await self._llm_service.generate(prompt=prompt)
@@ -3,3 +3,5 @@ from typing import Protocol
 
 class EmbedderP(Protocol):
     async def embed(self, query: str) -> list[float]: ...
+
+    async def embed_batch(self, queries: list[str]) -> list[list[float]]: ...
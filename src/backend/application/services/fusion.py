@@ -0,0 +1,49 @@
+from backend.application.value_objects.search_result import SearchResult
+
+WeightedRanking = tuple[list[SearchResult], float]
+FactKey = tuple[str, ...]
+
+
+def make_fact_key(search_result: SearchResult) -> FactKey:
+    fact = search_result.content
+    return (fact.owner.value, fact.text, fact.user_id or "", fact.character_id or "")
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: list[WeightedRanking],
+    rrf_k: int = 60,
+) -> list[SearchResult]:
+    """Merge ranked lists by weighted reciprocal rank.
+
+    The fused score is normalized so that a fact ranked first in every list scores 1.
+    """
+    max_score = sum(weight for _, weight in ranked_lists) / (rrf_k + 1)
+    if max_score <= 0:
+        return []
+
+    fused_scores: dict[FactKey, float] = {}
+    fused_results: dict[FactKey, SearchResult] = {}
+    for search_results, weight in ranked_lists:
+        for rank, search_result in enumerate(search_results, start=1):
+            key = make_fact_key(search_result=search_result)
+            fused_scores[key] = fused_scores.get(key, 0) + weight / (rrf_k + rank)
+            fused_results.setdefault(key, search_result)
+
+    ranked_keys = sorted(fused_scores, key=fused_scores.__getitem__, reverse=True)
+    return [
+        fused_results[key].model_copy(update={"relevance_score": fused_scores[key] / max_score})
+        for key in ranked_keys
+    ]
+
+
+def max_score_fusion(search_results_lists: list[list[SearchResult]]) -> list[SearchResult]:
+    """Merge lists scored on the same scale, keeping the best score of every fact."""
+    best_results: dict[FactKey, SearchResult] = {}
+    for search_results in search_results_lists:
+        for search_result in search_results:
+            key = make_fact_key(search_result=search_result)
+            best_result = best_results.get(key)
+            if best_result is None or search_result.relevance_score > best_result.relevance_score:
+                best_results[key] = search_result
+
+    return sorted(best_results.values(), key=lambda result: result.relevance_score, reverse=True)
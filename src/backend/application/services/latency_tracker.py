@@ -0,0 +1,30 @@
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling window of latencies; `delay` is their percentile, e.g. to pick a hedging delay."""
+
+    def __init__(
+        self,
+        percentile: float,
+        initial_delay_seconds: float,
+        min_delay_seconds: float,
+        window_size: int = 200,
+        min_samples: int = 20,
+    ):
+        self._percentile = percentile
+        self._initial_delay_seconds = initial_delay_seconds
+        self._min_delay_seconds = min_delay_seconds
+        self._min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window_size)
+
+    def record(self, latency_seconds: float) -> None:
+        self._latencies.append(latency_seconds)
+
+    def delay(self) -> float:
+        if len(self._latencies) < self._min_samples:
+            return self._initial_delay_seconds
+
+        latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * self._percentile), len(latencies) - 1)
+        return max(latencies[index], self._min_delay_seconds)
@@ -1,9 +1,12 @@
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
 from backend.application.value_objects.generation_parameters import GenerationParameters
+from backend.application.value_objects.prompt import Prompt
 
 
 class LLMServiceP(Protocol):
     _generation_parameters: GenerationParameters
 
-    async def generate(self, prompt: str) -> str: ...
+    async def generate(self, prompt: Prompt) -> str: ...
+
+    def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]: ...
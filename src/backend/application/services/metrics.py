@@ -0,0 +1,24 @@
+from typing import Protocol
+
+
+class MetricsP(Protocol):
+    def observe_stage(self, pipeline: str, stage: str, duration_seconds: float) -> None: ...
+
+    def observe_upstream_call(
+        self,
+        upstream: str,
+        duration_seconds: float,
+        is_error: bool,
+    ) -> None: ...
+
+    def record_retry(self, upstream: str) -> None: ...
+
+    def observe_http_request(
+        self,
+        method: str,
+        path: str,
+        status_code: int,
+        duration_seconds: float,
+    ) -> None: ...
+
+    def add_requests_in_flight(self, amount: int) -> None: ...
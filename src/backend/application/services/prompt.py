@@ -2,8 +2,12 @@ from typing import Protocol, TypeVar
 
 from pydantic import BaseModel
 
+from backend.application.value_objects.prompt import Prompt
+
 PromptDataT = TypeVar("PromptDataT", bound=BaseModel, contravariant=True)
 
 
 class PromptBuilderServiceP(Protocol[PromptDataT]):
-    async def make(self, prompt_data: PromptDataT) -> str: ...
+    async def make(self, prompt_data: PromptDataT) -> Prompt: ...
+
+    async def make_prefix(self, prompt_data: PromptDataT) -> str: ...
@@ -0,0 +1,120 @@
+from structlog import get_logger
+
+from backend.application.services.token_counter import TokenCounterP
+from backend.application.value_objects.prompt_packing_parameters import PromptPackingParameters
+from backend.application.value_objects.prompts_data.rag import RAGPromptData
+from backend.application.value_objects.search_result import SearchResult
+from backend.domain.entities.message import Message
+from backend.domain.value_objects.chat_actor import ChatActor
+
+logger = get_logger()
+
+
+class PromptPacker:
+    """Fits the dialogue history and the facts into the context window.
+
+    The prefix and the reply are paid for first. A share of the rest goes to the
+    highest-scoring facts and the remainder to the most recent turns; the latest message
+    is always kept. Dropped user turns can be condensed into an extractive summary.
+    """
+
+    def __init__(
+        self,
+        token_counter: TokenCounterP,
+        max_context_tokens: int,
+        max_reply_tokens: int,
+        parameters: PromptPackingParameters | None = None,
+    ):
+        self._token_counter = token_counter
+        self._max_context_tokens = max_context_tokens
+        self._max_reply_tokens = max_reply_tokens
+        self._parameters = parameters or PromptPackingParameters()
+
+    def pack(self, prompt_data: RAGPromptData, prefix: str) -> RAGPromptData:
+        budget = (
+            self._max_context_tokens
+            - self._max_reply_tokens
+            - self._token_counter.count(prefix)
+            - self._parameters.template_overhead_tokens
+        )
+        if self._parameters.summarize_dropped_history:
+            budget -= self._parameters.summary_max_tokens
+
+        search_results, facts_tokens = self._pack_facts(
+            search_results=prompt_data.search_results,
+            budget=int(max(budget, 0) * self._parameters.facts_share),
+        )
+        messages = self._pack_messages(
+            messages=prompt_data.messages,
+            budget=budget - facts_tokens,
+        )
+
+        dropped_messages = prompt_data.messages[: len(prompt_data.messages) - len(messages)]
+        num_dropped_facts = len(prompt_data.search_results) - len(search_results)
+        if not dropped_messages and not num_dropped_facts:
+            return prompt_data
+
+        logger.info(
+            "Packed prompt into the context window",
+            budget_tokens=budget,
+            dropped_messages=len(dropped_messages),
+            dropped_facts=num_dropped_facts,
+        )
+        return prompt_data.model_copy(
+            update={
+                "messages": messages,
+                "search_results": search_results,
+                "history_summary": self._summarize(messages=dropped_messages),
+            },
+        )
+
+    def _pack_facts(
+        self,
+        search_results: list[SearchResult],
+        budget: int,
+    ) -> tuple[list[SearchResult], int]:
+        packed_results = []
+        used_tokens = 0
+        for search_result in sorted(
+            search_results, key=lambda result: result.relevance_score, reverse=True
+        ):
+            num_tokens = (
+                self._token_counter.count(search_result.content.text)
+                + self._parameters.fact_overhead_tokens
+            )
+            # A shorter fact further down the ranking may still fit
+            if used_tokens + num_tokens > budget:
+                continue
+            packed_results.append(search_result)
+            used_tokens += num_tokens
+        return packed_results, used_tokens
+
+    def _pack_messages(self, messages: list[Message], budget: int) -> list[Message]:
+        packed_messages: list[Message] = []
+        for message in reversed(messages):
+            budget -= self._token_counter.count(message.text)
+            budget -= self._parameters.message_overhead_tokens
+            if packed_messages and budget < 0:
+                break
+            packed_messages.append(message)
+        packed_messages.reverse()
+        return packed_messages
+
+    def _summarize(self, messages: list[Message]) -> str | None:
+        if not self._parameters.summarize_dropped_history:
+            return None
+
+        # What the user said is what the character has to remember
+        summary_parts: list[str] = []
+        budget = self._parameters.summary_max_tokens
+        for message in reversed(messages):
+            if message.actor != ChatActor.USER:
+                continue
+            budget -= self._token_counter.count(message.text) + 1
+            if budget < 0:
+                break
+            summary_parts.append(message.text)
+
+        if not summary_parts:
+            return None
+        return " / ".join(reversed(summary_parts))
@@ -0,0 +1,34 @@
+from backend.application.value_objects.query_construction_mode import QueryConstructionMode
+from backend.application.value_objects.query_construction_parameters import (
+    QueryConstructionParameters,
+)
+from backend.domain.entities.message import Message
+
+
+class QueryBuilder:
+    """Turns the recent turns of a conversation into retrieval queries.
+
+    The concatenated mode embeds the window as one text, the multi-query mode embeds every
+    turn separately, most recent first, so the results can be merged after one batched search.
+    """
+
+    def __init__(self, parameters: QueryConstructionParameters | None = None):
+        self._parameters = parameters or QueryConstructionParameters()
+
+    def build(self, messages: list[Message]) -> list[str]:
+        window = [
+            message.text.strip()
+            for message in messages[-self._parameters.window_size :]
+            if message.text.strip()
+        ]
+        if not window:
+            empty_history_query = self._parameters.empty_history_query
+            return [empty_history_query] if empty_history_query else []
+
+        if self._parameters.mode == QueryConstructionMode.CONCATENATED:
+            # The most recent turns are kept when the window is too long
+            return ["\n".join(window)[-self._parameters.max_query_chars :]]
+
+        return list(
+            dict.fromkeys(text[: self._parameters.max_query_chars] for text in reversed(window))
+        )
@@ -0,0 +1,11 @@
+from typing import Protocol
+
+from backend.application.value_objects.search_result import SearchResult
+
+
+class RerankerP(Protocol):
+    async def rerank(
+        self,
+        query: str,
+        search_results: list[SearchResult],
+    ) -> list[SearchResult]: ...
@@ -0,0 +1,238 @@
+import asyncio
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, ParamSpec, TypeVar
+
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from backend.application.services.metrics import MetricsP
+from backend.application.services.tracing import TracerP
+
+ParamsT = ParamSpec("ParamsT")
+ResultT = TypeVar("ResultT")
+
+RETRYABLE_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+
+_request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """The overall request deadline passed before an upstream call could finish."""
+
+
+class CircuitOpenError(Exception):
+    """The upstream is considered down and calls to it fail fast."""
+
+
+@contextmanager
+def deadline_scope(timeout_seconds: float | None) -> Iterator[None]:
+    if timeout_seconds is None:
+        yield
+        return
+
+    deadline = time.monotonic() + timeout_seconds
+    outer_deadline = _request_deadline.get()
+    if outer_deadline is not None:
+        deadline = min(deadline, outer_deadline)
+
+    token = _request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def remaining_seconds() -> float | None:
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class CircuitBreaker:
+    """Opens after consecutive upstream failures and lets a single probe through after a pause."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 10.0):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._is_probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        if self._opened_at is None:
+            return True
+
+        if self._is_probing:
+            return False
+
+        if time.monotonic() - self._opened_at < self._reset_timeout_seconds:
+            return False
+
+        self._is_probing = True
+        return True
+
+    def record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._is_probing = False
+
+    def release_probe(self) -> None:
+        """Frees the probe slot after a probe that told nothing about the upstream."""
+        self._is_probing = False
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._is_probing or self._consecutive_failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._is_probing = False
+
+
+class ResiliencePolicy:
+    """Per-upstream call policy: attempt timeouts bounded by the request deadline,
+    jittered retries of retryable errors only, and an optional circuit breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        is_retryable: Callable[[BaseException], bool],
+        timeout_seconds: float | None = 10.0,
+        max_attempts: int = 3,
+        backoff_initial_seconds: float = 0.05,
+        backoff_max_seconds: float = 0.5,
+        circuit_breaker: CircuitBreaker | None = None,
+        metrics: MetricsP | None = None,
+        tracer: TracerP | None = None,
+    ):
+        self.name = name
+        self._is_retryable = is_retryable
+        self._timeout_seconds = timeout_seconds
+        self._max_attempts = max_attempts
+        self._backoff_initial_seconds = backoff_initial_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._circuit_breaker = circuit_breaker
+        self._metrics = metrics
+        self._tracer = tracer
+        self.retries = 0
+
+    async def call(
+        self,
+        func: Callable[ParamsT, Awaitable[ResultT]],
+        *args: ParamsT.args,
+        **kwargs: ParamsT.kwargs,
+    ) -> ResultT:
+        remaining = remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"No time left to call {self.name}")
+
+        if self._circuit_breaker is not None and not self._circuit_breaker.allow_request():
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+        return await self._call_and_record(func, *args, **kwargs)
+
+    async def _call_and_record(
+        self,
+        func: Callable[ParamsT, Awaitable[ResultT]],
+        *args: ParamsT.args,
+        **kwargs: ParamsT.kwargs,
+    ) -> ResultT:
+        started_at = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                if self._tracer is not None:
+                    stack.enter_context(self._tracer.span(self.name))
+                result = await self._call_with_retries(func, *args, **kwargs)
+        except Exception as exception:
+            self._record_outcome(exception=exception, started_at=started_at)
+            raise
+        except BaseException:
+            # A cancelled call says nothing about the upstream, but must not hold the probe
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.release_probe()
+            raise
+
+        self._record_outcome(exception=None, started_at=started_at)
+        return result
+
+    async def _call_with_retries(
+        self,
+        func: Callable[ParamsT, Awaitable[ResultT]],
+        *args: ParamsT.args,
+        **kwargs: ParamsT.kwargs,
+    ) -> ResultT:
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self._max_attempts),
+            wait=wait_random_exponential(
+                multiplier=self._backoff_initial_seconds,
+                max=self._backoff_max_seconds,
+            ),
+            retry=retry_if_exception(self._should_retry),
+            before_sleep=self._before_sleep,
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                return await self._call_with_timeout(func, *args, **kwargs)
+        raise AssertionError("Retrying finished without a result")
+
+    async def _call_with_timeout(
+        self,
+        func: Callable[ParamsT, Awaitable[ResultT]],
+        *args: ParamsT.args,
+        **kwargs: ParamsT.kwargs,
+    ) -> ResultT:
+        timeout = self._timeout_seconds
+        remaining = remaining_seconds()
+        is_deadline_bound = remaining is not None and (timeout is None or remaining < timeout)
+        if remaining is not None and is_deadline_bound:
+            if remaining <= 0:
+                raise DeadlineExceededError(f"No time left to call {self.name}")
+            timeout = remaining
+
+        try:
+            return await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
+        except TimeoutError as exception:
+            if is_deadline_bound:
+                raise DeadlineExceededError(f"Deadline exceeded calling {self.name}") from exception
+            raise
+
+    def _should_retry(self, exception: BaseException) -> bool:
+        if isinstance(exception, DeadlineExceededError):
+            return False
+        return isinstance(exception, TimeoutError) or self._is_retryable(exception)
+
+    def _before_sleep(self, retry_state: RetryCallState) -> None:
+        self.retries += 1
+        if self._metrics is not None:
+            self._metrics.record_retry(upstream=self.name)
+
+    def _record_outcome(self, exception: Exception | None, started_at: float) -> None:
+        if self._metrics is not None:
+            self._metrics.observe_upstream_call(
+                upstream=self.name,
+                duration_seconds=time.perf_counter() - started_at,
+                is_error=exception is not None,
+            )
+
+        if self._circuit_breaker is None:
+            return
+
+        # The deadline is the caller's budget running out, not the upstream failing
+        if isinstance(exception, DeadlineExceededError):
+            self._circuit_breaker.release_probe()
+        elif exception is not None and self._should_retry(exception):
+            self._circuit_breaker.record_failure()
+        else:
+            self._circuit_breaker.record_success()
@@ -0,0 +1,103 @@
+import hashlib
+
+from structlog import get_logger
+
+from backend.application.services.cache import CacheP, SemanticCacheP
+from backend.application.value_objects.prompt import Prompt
+
+logger = get_logger()
+
+
+class ResponseCacheService:
+    """Serves generated responses for repeated prompts without calling the LLM.
+
+    The exact cache is keyed by the hash of the rendered prompt. The optional semantic cache
+    is keyed by the last-message embedding and scoped by the prompt prefix, so a response is
+    only reused for the same character and user.
+    """
+
+    def __init__(
+        self,
+        exact_cache: CacheP[str] | None = None,
+        semantic_cache: SemanticCacheP | None = None,
+        namespace: str = "response",
+    ):
+        self._exact_cache = exact_cache
+        self._semantic_cache = semantic_cache
+        self._namespace = namespace
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._exact_cache is not None or self._semantic_cache is not None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        if not lookups:
+            return 0
+        return (self.exact_hits + self.semantic_hits) / lookups
+
+    async def get(self, prompt: Prompt, query_embedding: list[float] | None) -> str | None:
+        if not self.is_enabled:
+            return None
+
+        try:
+            response = await self._find(prompt=prompt, query_embedding=query_embedding)
+        except Exception as exception:
+            logger.warning("Response cache read failed", exception=str(exception))
+            response = None
+
+        if response is None:
+            self.misses += 1
+        return response
+
+    async def set(
+        self,
+        prompt: Prompt,
+        query_embedding: list[float] | None,
+        response: str,
+    ) -> None:
+        try:
+            if self._exact_cache is not None:
+                await self._exact_cache.set(self._make_exact_key(prompt=prompt), response)
+            if self._semantic_cache is not None and query_embedding is not None:
+                await self._semantic_cache.add(
+                    scope=self._make_scope(prompt=prompt),
+                    embedding=query_embedding,
+                    value=response,
+                )
+        except Exception as exception:
+            logger.warning("Response cache write failed", exception=str(exception))
+
+    async def _find(self, prompt: Prompt, query_embedding: list[float] | None) -> str | None:
+        if self._exact_cache is not None:
+            response = await self._exact_cache.get(self._make_exact_key(prompt=prompt))
+            if response is not None:
+                self.exact_hits += 1
+                return response
+
+        if self._semantic_cache is not None and query_embedding is not None:
+            response = await self._semantic_cache.find(
+                scope=self._make_scope(prompt=prompt),
+                embedding=query_embedding,
+            )
+            if response is not None:
+                self.semantic_hits += 1
+                return response
+
+        return None
+
+    def _make_exact_key(self, prompt: Prompt) -> str:
+        digest = hashlib.sha256()
+        digest.update(prompt.prefix.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(prompt.body.encode("utf-8"))
+        return f"{self._namespace}:{digest.hexdigest()}"
+
+    def _make_scope(self, prompt: Prompt) -> str:
+        # The prefix holds the character and user descriptions, so it scopes reuse to them
+        digest = hashlib.sha256(prompt.prefix.encode("utf-8")).hexdigest()
+        return f"{self._namespace}:{digest}"
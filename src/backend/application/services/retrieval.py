@@ -1,8 +1,18 @@
+import asyncio
+
 import structlog
 
 from backend.application.services.embedder import EmbedderP
+from backend.application.services.fusion import max_score_fusion, reciprocal_rank_fusion
+from backend.application.services.reranker import RerankerP
+from backend.application.services.sparse_encoder import SparseEncoderP
 from backend.application.services.vector_storage import VectorStorageP
+from backend.application.value_objects.fusion_parameters import FusionParameters
+from backend.application.value_objects.hybrid_search_results import HybridSearchResults
+from backend.application.value_objects.rerank_parameters import RerankParameters
+from backend.application.value_objects.retrieval_result import RetrievalResult
 from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.tenant_scope import TenantScope
 
 logger = structlog.get_logger()
 
@@ -14,29 +24,242 @@ class RetrievalService:
         vector_storage: VectorStorageP,
         num_search_results: int = 3,
         relevance_threshold: float = 0.85,
+        sparse_encoder: SparseEncoderP | None = None,
+        fusion_parameters: FusionParameters | None = None,
+        reranker: RerankerP | None = None,
+        rerank_parameters: RerankParameters | None = None,
     ):
         self._embedder = embedder
         self._vector_storage = vector_storage
         self._num_search_results = num_search_results
         self._relevance_threshold = relevance_threshold
+        self._sparse_encoder = sparse_encoder
+        self._fusion_parameters = fusion_parameters or FusionParameters()
+        self._reranker = reranker
+        self._rerank_parameters = rerank_parameters or RerankParameters()
+        self.retrievals = 0
+        self.empty_retrievals = 0
+        self.filtered_results = 0
 
-    async def retrieve(self, query: str) -> list[SearchResult]:
+    async def retrieve(
+        self,
+        query: str,
+        tenant_scope: TenantScope | None = None,
+    ) -> RetrievalResult:
         query_embedding = await self._embedder.embed(query=query)
-        search_results = await self._vector_storage.find_nearest(
-            query_embedding=query_embedding,
-            num_search_results=self._num_search_results,
-        )
+
+        if self._sparse_encoder is None:
+            search_results = await self._vector_storage.find_nearest(
+                query_embedding=query_embedding,
+                num_search_results=self._num_rerank_candidates,
+                tenant_scope=tenant_scope,
+            )
+            search_results = await self._filter_results(search_results=search_results)
+        else:
+            hybrid_results = await self._vector_storage.find_nearest_hybrid(
+                query_embedding=query_embedding,
+                query_sparse_vector=self._sparse_encoder.encode_query(text=query),
+                num_search_results=self._num_fusion_candidates,
+                tenant_scope=tenant_scope,
+            )
+            search_results = self._fuse(hybrid_results=hybrid_results)
+
+        search_results = await self._rerank(query=query, search_results=search_results)
+        self._count_retrievals(search_results_batch=[search_results])
+
         logger.info(
             "Retrieve results",
             query=query,
             search_results=search_results,
             relevance_threshold=self._relevance_threshold,
+            is_hybrid=self._sparse_encoder is not None,
+            is_reranked=self._reranker is not None,
+        )
+        # Both parts come from typed services, validating would copy every embedding float
+        return RetrievalResult.model_construct(
+            query_embedding=query_embedding,
+            search_results=search_results,
         )
-        return await self._filter_results(search_results=search_results)
+
+    async def retrieve_batch(
+        self,
+        queries: list[str],
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[RetrievalResult]:
+        if not queries:
+            return []
+
+        query_embeddings = await self._embedder.embed_batch(queries=queries)
+
+        if self._sparse_encoder is None:
+            search_results_batch = [
+                await self._filter_results(search_results=search_results)
+                for search_results in await self._vector_storage.find_nearest_batch(
+                    query_embeddings=query_embeddings,
+                    num_search_results=self._num_rerank_candidates,
+                    tenant_scopes=tenant_scopes,
+                )
+            ]
+        else:
+            hybrid_results_batch = await self._vector_storage.find_nearest_hybrid_batch(
+                query_embeddings=query_embeddings,
+                query_sparse_vectors=[
+                    self._sparse_encoder.encode_query(text=query) for query in queries
+                ],
+                num_search_results=self._num_fusion_candidates,
+                tenant_scopes=tenant_scopes,
+            )
+            search_results_batch = [
+                self._fuse(hybrid_results=hybrid_results) for hybrid_results in hybrid_results_batch
+            ]
+
+        search_results_batch = await asyncio.gather(
+            *[
+                self._rerank(query=query, search_results=search_results)
+                for query, search_results in zip(queries, search_results_batch, strict=True)
+            ],
+        )
+        self._count_retrievals(search_results_batch=search_results_batch)
+
+        logger.info(
+            "Retrieve batch results",
+            num_queries=len(queries),
+            relevance_threshold=self._relevance_threshold,
+            is_hybrid=self._sparse_encoder is not None,
+            is_reranked=self._reranker is not None,
+        )
+        return [
+            RetrievalResult.model_construct(
+                query_embedding=query_embedding,
+                search_results=search_results,
+            )
+            for query_embedding, search_results in zip(
+                query_embeddings, search_results_batch, strict=True
+            )
+        ]
+
+    async def retrieve_merged(
+        self,
+        queries: list[str],
+        tenant_scope: TenantScope | None = None,
+    ) -> RetrievalResult:
+        """Search several queries of one conversation and merge their results.
+
+        The query embedding of the result is the one of the first query.
+        """
+        if len(queries) == 1:
+            return await self.retrieve(query=queries[0], tenant_scope=tenant_scope)
+
+        merged_results = await self.retrieve_merged_batch(
+            query_groups=[queries],
+            tenant_scopes=[tenant_scope],
+        )
+        return merged_results[0]
+
+    async def retrieve_merged_batch(
+        self,
+        query_groups: list[list[str]],
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[RetrievalResult]:
+        if tenant_scopes is None:
+            tenant_scopes = [None for _ in query_groups]
+
+        # Every query of every group goes through one embedding call and one search
+        retrieval_results = await self.retrieve_batch(
+            queries=[query for query_group in query_groups for query in query_group],
+            tenant_scopes=[
+                tenant_scope
+                for query_group, tenant_scope in zip(query_groups, tenant_scopes, strict=True)
+                for _ in query_group
+            ],
+        )
+
+        merged_results = []
+        offset = 0
+        for query_group in query_groups:
+            group_results = retrieval_results[offset : offset + len(query_group)]
+            offset += len(query_group)
+            merged_results.append(
+                RetrievalResult.model_construct(
+                    query_embedding=group_results[0].query_embedding if group_results else None,
+                    search_results=max_score_fusion(
+                        search_results_lists=[
+                            retrieval_result.search_results for retrieval_result in group_results
+                        ],
+                    )[: self._num_search_results],
+                ),
+            )
+
+        return merged_results
+
+    @property
+    def _num_rerank_candidates(self) -> int:
+        if self._reranker is None:
+            return self._num_search_results
+        return self._num_search_results * self._rerank_parameters.candidates_multiplier
+
+    @property
+    def _num_fusion_candidates(self) -> int:
+        return self._num_rerank_candidates * self._fusion_parameters.candidates_multiplier
+
+    def _fuse(self, hybrid_results: HybridSearchResults) -> list[SearchResult]:
+        # Each list is cut by its own score scale before ranks are merged
+        dense_results = [
+            result
+            for result in hybrid_results.dense_results
+            if result.relevance_score >= self._relevance_threshold
+        ]
+        sparse_results = [
+            result
+            for result in hybrid_results.sparse_results
+            if result.relevance_score >= self._fusion_parameters.sparse_relevance_threshold
+        ]
+        self.filtered_results += (
+            len(hybrid_results.dense_results)
+            + len(hybrid_results.sparse_results)
+            - len(dense_results)
+            - len(sparse_results)
+        )
+        fused_results = reciprocal_rank_fusion(
+            ranked_lists=[
+                (dense_results, self._fusion_parameters.dense_weight),
+                (sparse_results, self._fusion_parameters.sparse_weight),
+            ],
+            rrf_k=self._fusion_parameters.rrf_k,
+        )
+        return fused_results[: self._num_rerank_candidates]
+
+    async def _rerank(self, query: str, search_results: list[SearchResult]) -> list[SearchResult]:
+        if self._reranker is None or not search_results:
+            return search_results[: self._num_search_results]
+
+        try:
+            reranked_results = await self._reranker.rerank(
+                query=query,
+                search_results=search_results,
+            )
+        except Exception as exception:
+            logger.warning("Reranking skipped, keeping the vector order", exception=repr(exception))
+            return search_results[: self._num_search_results]
+
+        relevance_threshold = self._rerank_parameters.relevance_threshold
+        if relevance_threshold is not None:
+            reranked_results = [
+                result
+                for result in reranked_results
+                if result.relevance_score >= relevance_threshold
+            ]
+        return reranked_results[: self._num_search_results]
 
     async def _filter_results(self, search_results: list[SearchResult]) -> list[SearchResult]:
-        return list(
+        filtered_results = list(
             filter(
                 lambda result: result.relevance_score >= self._relevance_threshold, search_results
             )
         )
+        self.filtered_results += len(search_results) - len(filtered_results)
+        return filtered_results
+
+    def _count_retrievals(self, search_results_batch: list[list[SearchResult]]) -> None:
+        self.retrievals += len(search_results_batch)
+        self.empty_retrievals += sum(not search_results for search_results in search_results_batch)
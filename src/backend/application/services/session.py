@@ -0,0 +1,49 @@
+import uuid
+from functools import partial
+
+from backend.application.services.cache import AtomicCacheP
+from backend.domain.entities.character import Character
+from backend.domain.entities.message import Message
+from backend.domain.entities.session import Session
+from backend.domain.entities.user import User
+
+
+class SessionNotFoundError(Exception):
+    """The session does not exist or has expired."""
+
+
+class SessionService:
+    """Keeps the participants and the recent history of a conversation on the server.
+
+    Messages are appended to the stored session atomically, so concurrent turns of one
+    conversation are all kept.
+    """
+
+    def __init__(self, store: AtomicCacheP[Session], max_messages: int = 50):
+        self._store = store
+        self._max_messages = max_messages
+
+    async def create(self, user: User, character: Character) -> Session:
+        session = Session(id=uuid.uuid4().hex, user=user, character=character)
+        await self._store.set(session.id, session)
+        return session
+
+    async def get(self, session_id: str) -> Session:
+        session = await self._store.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
+        return session
+
+    async def append(self, session_id: str, messages: list[Message]) -> Session:
+        session = await self._store.update(
+            session_id,
+            partial(self._with_messages, messages),
+        )
+        if session is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
+        return session
+
+    def _with_messages(self, messages: list[Message], session: Session) -> Session:
+        return session.model_copy(
+            update={"messages": [*session.messages, *messages][-self._max_messages :]},
+        )
@@ -0,0 +1,9 @@
+from typing import Protocol
+
+from backend.application.value_objects.sparse_vector import SparseVector
+
+
+class SparseEncoderP(Protocol):
+    def encode_document(self, text: str) -> SparseVector: ...
+
+    def encode_query(self, text: str) -> SparseVector: ...
@@ -0,0 +1,35 @@
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+
+from backend.application.services.tracing import TracerP
+
+
+class StageTimer:
+    """Collects wall-clock durations of named pipeline stages in milliseconds.
+
+    With a tracer every measured stage is also recorded as a span.
+    """
+
+    def __init__(self, tracer: TracerP | None = None) -> None:
+        self._started_at = time.perf_counter()
+        self._tracer = tracer
+        self.durations: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        with ExitStack() as stack:
+            if self._tracer is not None:
+                stack.enter_context(self._tracer.span(stage))
+
+            started_at = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.durations[stage] = (time.perf_counter() - started_at) * 1000
+
+    def mark(self, stage: str) -> None:
+        self.durations[stage] = (time.perf_counter() - self._started_at) * 1000
+
+    def total(self) -> float:
+        return (time.perf_counter() - self._started_at) * 1000
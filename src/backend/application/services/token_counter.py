@@ -0,0 +1,5 @@
+from typing import Protocol
+
+
+class TokenCounterP(Protocol):
+    def count(self, text: str) -> int: ...
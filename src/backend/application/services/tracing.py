@@ -0,0 +1,6 @@
+from contextlib import AbstractContextManager
+from typing import Protocol
+
+
+class TracerP(Protocol):
+    def span(self, name: str) -> AbstractContextManager[None]: ...
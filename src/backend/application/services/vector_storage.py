@@ -1,6 +1,9 @@
 from typing import Protocol
 
+from backend.application.value_objects.hybrid_search_results import HybridSearchResults
 from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.sparse_vector import SparseVector
+from backend.application.value_objects.tenant_scope import TenantScope
 
 
 class VectorStorageP(Protocol):
@@ -8,4 +11,28 @@ class VectorStorageP(Protocol):
         self,
         query_embedding: list[float],
         num_search_results: int,
+        tenant_scope: TenantScope | None = None,
     ) -> list[SearchResult]: ...
+
+    async def find_nearest_batch(
+        self,
+        query_embeddings: list[list[float]],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[list[SearchResult]]: ...
+
+    async def find_nearest_hybrid(
+        self,
+        query_embedding: list[float],
+        query_sparse_vector: SparseVector,
+        num_search_results: int,
+        tenant_scope: TenantScope | None = None,
+    ) -> HybridSearchResults: ...
+
+    async def find_nearest_hybrid_batch(
+        self,
+        query_embeddings: list[list[float]],
+        query_sparse_vectors: list[SparseVector],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[HybridSearchResults]: ...
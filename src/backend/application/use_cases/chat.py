@@ -1,14 +1,28 @@
-from structlog import get_logger
+import asyncio
+from typing import AsyncIterator
 
+from backend.application.services.chat_pipeline import ChatPipeline
 from backend.application.services.llm import LLMServiceP
+from backend.application.services.metrics import MetricsP
 from backend.application.services.prompt import PromptBuilderServiceP
+from backend.application.services.prompt_packer import PromptPacker
+from backend.application.services.query_builder import QueryBuilder
+from backend.application.services.resilience import deadline_scope
+from backend.application.services.response_cache import ResponseCacheService
 from backend.application.services.retrieval import RetrievalService
+from backend.application.services.stage_timer import StageTimer
+from backend.application.services.tracing import TracerP
+from backend.application.value_objects.prompt import Prompt
 from backend.application.value_objects.prompts_data.rag import RAGPromptData
-from backend.application.value_objects.search_result import SearchResult
-from backend.domain.entities.message import Message
-from backend.presentation.api.models.chat import ChatRequest, ChatResponse
-
-logger = get_logger()
+from backend.application.value_objects.retrieval_result import RetrievalResult
+from backend.presentation.api.models.chat import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamDelta,
+    ChatStreamDone,
+    ChatStreamEvent,
+    ChatStreamSearchResults,
+)
 
 
 class ChatUseCase:
@@ -17,39 +31,135 @@ class ChatUseCase:
         retrieval_service: RetrievalService,
         llm_prompt_builder_service: PromptBuilderServiceP[RAGPromptData],
         llm_service: LLMServiceP,
+        retrieval_timeout_seconds: float | None = None,
+        request_timeout_seconds: float | None = None,
+        response_cache: ResponseCacheService | None = None,
+        query_builder: QueryBuilder | None = None,
+        prompt_packer: PromptPacker | None = None,
+        metrics: MetricsP | None = None,
+        tracer: TracerP | None = None,
     ):
-        self._retrieval_service = retrieval_service
-        self._llm_prompt_builder_service = llm_prompt_builder_service
         self._llm_service = llm_service
+        self._request_timeout_seconds = request_timeout_seconds
+        self._tracer = tracer
+        self._pipeline = ChatPipeline(
+            retrieval_service=retrieval_service,
+            llm_prompt_builder_service=llm_prompt_builder_service,
+            llm_service=llm_service,
+            retrieval_timeout_seconds=retrieval_timeout_seconds,
+            response_cache=response_cache,
+            query_builder=query_builder,
+            prompt_packer=prompt_packer,
+            metrics=metrics,
+        )
 
     async def __call__(self, dto: ChatRequest) -> ChatResponse:
-        search_results = await self._retrieve_and_filter(messages=dto.messages)
-
-        prompt_data = RAGPromptData(
-            user=dto.user,
-            character=dto.character,
-            messages=dto.messages,
-            search_results=search_results,
-        )
+        timer = StageTimer(tracer=self._tracer)
 
-        llm_prompt = await self._llm_prompt_builder_service.make(prompt_data=prompt_data)
+        with deadline_scope(self._request_timeout_seconds):
+            retrieval_result, llm_prompt = await self._prepare(dto=dto, timer=timer)
+            character_generated_message_text = await self._pipeline.generate(
+                prompt=llm_prompt,
+                retrieval_result=retrieval_result,
+                timer=timer,
+            )
 
-        character_generated_message_text = await self._llm_service.generate(prompt=llm_prompt)
+        self._pipeline.log_timings(timer=timer, pipeline="chat")
 
         return ChatResponse(
             generated_text=character_generated_message_text,
-            search_results=search_results,
+            search_results=retrieval_result.search_results,
         )
 
-    async def _retrieve_and_filter(self, messages: list[Message]) -> list[SearchResult]:
-        search_results: list[SearchResult] = []
+    @property
+    def retrieval_failures(self) -> int:
+        return self._pipeline.retrieval_failures
+
+    async def stream(self, dto: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        timer = StageTimer(tracer=self._tracer)
+
+        # The deadline covers the stages before the first token; it can't span yields
+        with deadline_scope(self._request_timeout_seconds):
+            retrieval_result, llm_prompt = await self._prepare(dto=dto, timer=timer)
+            cached_text = await self._pipeline.lookup_response(
+                prompt=llm_prompt,
+                retrieval_result=retrieval_result,
+                timer=timer,
+            )
+
+        yield ChatStreamSearchResults(search_results=retrieval_result.search_results)
+
+        generated_parts: list[str] = []
+        async for delta in self._stream_text(prompt=llm_prompt, cached_text=cached_text):
+            if not generated_parts:
+                timer.mark("first_token")
+            generated_parts.append(delta)
+            yield ChatStreamDelta(text=delta)
+        timer.mark("last_token")
+
+        generated_text = "".join(generated_parts)
+        if cached_text is None:
+            await self._pipeline.store_response(
+                prompt=llm_prompt,
+                retrieval_result=retrieval_result,
+                response=generated_text,
+            )
+
+        self._pipeline.log_timings(timer=timer, pipeline="chat_stream")
+
+        yield ChatStreamDone(generated_text=generated_text)
 
-        if messages:
-            try:
-                search_results = await self._retrieval_service.retrieve(
-                    query=messages[-1].text,
+    async def _stream_text(self, prompt: Prompt, cached_text: str | None) -> AsyncIterator[str]:
+        if cached_text is not None:
+            yield cached_text
+            return
+
+        async for delta in self._llm_service.generate_stream(prompt=prompt):
+            yield delta
+
+    async def _prepare(
+        self,
+        dto: ChatRequest,
+        timer: StageTimer,
+    ) -> tuple[RetrievalResult, Prompt]:
+        retrieval_task = asyncio.create_task(self._timed_retrieve(dto=dto, timer=timer))
+        # Let retrieval send its request before the CPU-bound rendering starts
+        await asyncio.sleep(0)
+
+        try:
+            with timer.measure("render_prefix"):
+                prefix = await self._pipeline.make_prefix(
+                    prompt_data=self._make_prompt_data(dto=dto, retrieval_result=None),
                 )
-            except Exception as exception:
-                logger.exception("Retrieval service exception", exception=str(exception))
+        except BaseException:
+            retrieval_task.cancel()
+            raise
+
+        retrieval_result = await retrieval_task
+
+        llm_prompt = await self._pipeline.make_prompt(
+            prompt_data=self._make_prompt_data(dto=dto, retrieval_result=retrieval_result),
+            timer=timer,
+            prefix=prefix,
+        )
+        return retrieval_result, llm_prompt
+
+    def _make_prompt_data(
+        self,
+        dto: ChatRequest,
+        retrieval_result: RetrievalResult | None,
+    ) -> RAGPromptData:
+        return self._pipeline.make_prompt_data(
+            user=dto.user,
+            character=dto.character,
+            messages=dto.messages,
+            search_results=[] if retrieval_result is None else retrieval_result.search_results,
+        )
 
-        return search_results
+    async def _timed_retrieve(self, dto: ChatRequest, timer: StageTimer) -> RetrievalResult:
+        with timer.measure("retrieve"):
+            retrieval_results = await self._pipeline.retrieve(
+                conversations=[dto.messages],
+                tenant_scopes=[dto.tenant_scope],
+            )
+        return retrieval_results[0]
@@ -0,0 +1,150 @@
+import asyncio
+
+from structlog import get_logger
+
+from backend.application.services.chat_pipeline import ChatPipeline
+from backend.application.services.llm import LLMServiceP
+from backend.application.services.metrics import MetricsP
+from backend.application.services.prompt import PromptBuilderServiceP
+from backend.application.services.prompt_packer import PromptPacker
+from backend.application.services.query_builder import QueryBuilder
+from backend.application.services.resilience import deadline_scope
+from backend.application.services.response_cache import ResponseCacheService
+from backend.application.services.retrieval import RetrievalService
+from backend.application.services.stage_timer import StageTimer
+from backend.application.services.tracing import TracerP
+from backend.application.value_objects.prompt import Prompt
+from backend.application.value_objects.prompts_data.rag import RAGPromptData
+from backend.application.value_objects.retrieval_result import RetrievalResult
+from backend.presentation.api.models.chat import (
+    ChatBatchItem,
+    ChatBatchRequest,
+    ChatBatchResponse,
+    ChatRequest,
+    ChatResponse,
+)
+
+logger = get_logger()
+
+ITEM_FAILED_ERROR = "Generation failed"
+
+
+class ChatBatchUseCase:
+    """Answers many independent conversations with one embedding call and one vector search.
+
+    Generation runs concurrently under a limit shared by all batches, and a failed item
+    is reported in its slot instead of failing the whole batch.
+    """
+
+    def __init__(
+        self,
+        retrieval_service: RetrievalService,
+        llm_prompt_builder_service: PromptBuilderServiceP[RAGPromptData],
+        llm_service: LLMServiceP,
+        max_concurrency: int = 8,
+        retrieval_timeout_seconds: float | None = None,
+        request_timeout_seconds: float | None = None,
+        response_cache: ResponseCacheService | None = None,
+        query_builder: QueryBuilder | None = None,
+        prompt_packer: PromptPacker | None = None,
+        metrics: MetricsP | None = None,
+        tracer: TracerP | None = None,
+    ):
+        self._llm_service = llm_service
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._request_timeout_seconds = request_timeout_seconds
+        self._tracer = tracer
+        self._pipeline = ChatPipeline(
+            retrieval_service=retrieval_service,
+            llm_prompt_builder_service=llm_prompt_builder_service,
+            llm_service=llm_service,
+            retrieval_timeout_seconds=retrieval_timeout_seconds,
+            response_cache=response_cache,
+            query_builder=query_builder,
+            prompt_packer=prompt_packer,
+            metrics=metrics,
+        )
+        self.item_failures = 0
+
+    async def __call__(self, dto: ChatBatchRequest) -> ChatBatchResponse:
+        timer = StageTimer(tracer=self._tracer)
+
+        with timer.measure("retrieve"):
+            retrieval_results = await self._pipeline.retrieve(
+                conversations=[chat_request.messages for chat_request in dto.requests],
+                tenant_scopes=[chat_request.tenant_scope for chat_request in dto.requests],
+            )
+
+        with timer.measure("generate"):
+            batch_items = await asyncio.gather(
+                *[
+                    self._answer(chat_request=chat_request, retrieval_result=retrieval_result)
+                    for chat_request, retrieval_result in zip(
+                        dto.requests, retrieval_results, strict=True
+                    )
+                ],
+            )
+
+        self._pipeline.log_timings(
+            timer=timer,
+            pipeline="chat_batch",
+            batch_size=len(batch_items),
+            num_errors=sum(batch_item.error is not None for batch_item in batch_items),
+        )
+
+        return ChatBatchResponse(results=batch_items)
+
+    @property
+    def retrieval_failures(self) -> int:
+        return self._pipeline.retrieval_failures
+
+    async def _answer(
+        self,
+        chat_request: ChatRequest,
+        retrieval_result: RetrievalResult,
+    ) -> ChatBatchItem:
+        try:
+            generated_text = await self._generate(
+                chat_request=chat_request,
+                retrieval_result=retrieval_result,
+            )
+        except Exception as exception:
+            self.item_failures += 1
+            logger.warning("Chat batch item failed", exception=repr(exception))
+            return ChatBatchItem(error=ITEM_FAILED_ERROR)
+
+        return ChatBatchItem(
+            response=ChatResponse(
+                generated_text=generated_text,
+                search_results=retrieval_result.search_results,
+            ),
+        )
+
+    async def _generate(
+        self,
+        chat_request: ChatRequest,
+        retrieval_result: RetrievalResult,
+    ) -> str:
+        # Items run concurrently, so their stage durations are not reported one by one
+        item_timer = StageTimer()
+        llm_prompt = await self._pipeline.make_prompt(
+            prompt_data=self._pipeline.make_prompt_data(
+                user=chat_request.user,
+                character=chat_request.character,
+                messages=chat_request.messages,
+                search_results=retrieval_result.search_results,
+            ),
+            timer=item_timer,
+        )
+        return await self._pipeline.generate(
+            prompt=llm_prompt,
+            retrieval_result=retrieval_result,
+            timer=item_timer,
+            generate_text=self._generate_limited,
+        )
+
+    async def _generate_limited(self, prompt: Prompt) -> str:
+        async with self._semaphore:
+            # Each item gets its own deadline, counted from when it may call the LLM
+            with deadline_scope(self._request_timeout_seconds):
+                return await self._llm_service.generate(prompt=prompt)
@@ -0,0 +1,92 @@
+from typing import AsyncIterator
+
+from backend.application.services.session import SessionService
+from backend.application.use_cases.chat import ChatUseCase
+from backend.domain.entities.message import Message
+from backend.domain.entities.session import Session
+from backend.domain.value_objects.chat_actor import ChatActor
+from backend.presentation.api.models.chat import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamDone,
+    ChatStreamEvent,
+)
+from backend.presentation.api.models.session import (
+    CreateSessionRequest,
+    SessionMessageRequest,
+    SessionResponse,
+)
+
+
+class SessionChatUseCase:
+    """Chats within a server-side session, so clients send only the new message."""
+
+    def __init__(self, chat_use_case: ChatUseCase, session_service: SessionService):
+        self._chat_use_case = chat_use_case
+        self._session_service = session_service
+
+    async def __call__(self, session_id: str, dto: SessionMessageRequest) -> ChatResponse:
+        session = await self._session_service.get(session_id=session_id)
+        new_messages = self._make_new_messages(dto=dto)
+
+        chat_response = await self._chat_use_case(
+            dto=self._make_chat_request(session=session, new_messages=new_messages),
+        )
+
+        await self._session_service.append(
+            session_id=session.id,
+            messages=[
+                *new_messages,
+                Message(actor=ChatActor.CHARACTER, text=chat_response.generated_text),
+            ],
+        )
+        return chat_response
+
+    async def create(self, dto: CreateSessionRequest) -> SessionResponse:
+        session = await self._session_service.create(user=dto.user, character=dto.character)
+        return self._make_session_response(session=session)
+
+    async def get(self, session_id: str) -> SessionResponse:
+        session = await self._session_service.get(session_id=session_id)
+        return self._make_session_response(session=session)
+
+    async def stream(
+        self,
+        session_id: str,
+        dto: SessionMessageRequest,
+    ) -> AsyncIterator[ChatStreamEvent]:
+        session = await self._session_service.get(session_id=session_id)
+        new_messages = self._make_new_messages(dto=dto)
+
+        async for event in self._chat_use_case.stream(
+            dto=self._make_chat_request(session=session, new_messages=new_messages),
+        ):
+            if isinstance(event, ChatStreamDone):
+                await self._session_service.append(
+                    session_id=session.id,
+                    messages=[
+                        *new_messages,
+                        Message(actor=ChatActor.CHARACTER, text=event.generated_text),
+                    ],
+                )
+            yield event
+
+    def _make_new_messages(self, dto: SessionMessageRequest) -> list[Message]:
+        if dto.text is None:
+            return []
+        return [Message(actor=ChatActor.USER, text=dto.text)]
+
+    def _make_chat_request(self, session: Session, new_messages: list[Message]) -> ChatRequest:
+        return ChatRequest(
+            messages=[*session.messages, *new_messages],
+            user=session.user,
+            character=session.character,
+        )
+
+    def _make_session_response(self, session: Session) -> SessionResponse:
+        return SessionResponse(
+            session_id=session.id,
+            user=session.user,
+            character=session.character,
+            messages=session.messages,
+        )
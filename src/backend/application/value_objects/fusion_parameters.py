@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class FusionParameters(BaseModel):
+    dense_weight: float = 1.0
+    sparse_weight: float = 1.0
+    rrf_k: int = 60
+    sparse_relevance_threshold: float = 0
+    candidates_multiplier: int = 4
@@ -4,5 +4,6 @@ from pydantic import BaseModel
 class GenerationParameters(BaseModel):
     model_name: str
     max_tokens: int = 512
+    max_context_tokens: int | None = None
     top_p: float | None = None
     stop: str = "\n"
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from backend.application.value_objects.search_result import SearchResult
+
+
+class HybridSearchResults(BaseModel):
+    dense_results: list[SearchResult]
+    sparse_results: list[SearchResult]
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class Prompt(BaseModel):
+    prefix: str
+    body: str
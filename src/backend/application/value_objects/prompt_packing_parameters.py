@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class PromptPackingParameters(BaseModel):
+    facts_share: float = 0.3
+    template_overhead_tokens: int = 400
+    message_overhead_tokens: int = 8
+    fact_overhead_tokens: int = 16
+    summarize_dropped_history: bool = False
+    summary_max_tokens: int = 128
@@ -11,3 +11,4 @@ class RAGPromptData(BaseModel):
     character: Character
     messages: list[Message]
     search_results: list[SearchResult]
+    history_summary: str | None = None
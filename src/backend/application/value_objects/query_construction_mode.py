@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class QueryConstructionMode(StrEnum):
+    CONCATENATED = "concatenated"
+    MULTI_QUERY = "multi_query"
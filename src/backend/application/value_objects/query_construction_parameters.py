@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+from backend.application.value_objects.query_construction_mode import QueryConstructionMode
+
+
+class QueryConstructionParameters(BaseModel):
+    mode: QueryConstructionMode = QueryConstructionMode.CONCATENATED
+    window_size: int = 1
+    max_query_chars: int = 1000
+    empty_history_query: str | None = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class RerankParameters(BaseModel):
+    candidates_multiplier: int = 4
+    relevance_threshold: float | None = None
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from backend.application.value_objects.search_result import SearchResult
+
+
+class RetrievalResult(BaseModel):
+    query_embedding: list[float] | None = None
+    search_results: list[SearchResult] = []
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class SparseVector(BaseModel):
+    indices: list[int]
+    values: list[float]
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class TenantScope(BaseModel):
+    user_id: str | None = None
+    character_id: str | None = None
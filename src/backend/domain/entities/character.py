@@ -2,6 +2,7 @@ from pydantic import BaseModel
 
 
 class Character(BaseModel):
+    id: str | None = None
     name: str
     age: int
     description: str
@@ -6,3 +6,5 @@ from backend.domain.value_objects.chat_actor import ChatActor
 class Fact(BaseModel):
     owner: ChatActor
     text: str
+    user_id: str | None = None
+    character_id: str | None = None
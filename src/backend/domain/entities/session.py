@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from backend.domain.entities.character import Character
+from backend.domain.entities.message import Message
+from backend.domain.entities.user import User
+
+
+class Session(BaseModel):
+    id: str
+    user: User
+    character: Character
+    messages: list[Message] = []
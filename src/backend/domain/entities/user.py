@@ -2,5 +2,6 @@ from pydantic import BaseModel
 
 
 class User(BaseModel):
+    id: str | None = None
     name: str
     age: int
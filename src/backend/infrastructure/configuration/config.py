@@ -2,11 +2,14 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings
 
-from backend.infrastructure.configuration.enums import Environment
+from backend.infrastructure.configuration.enums import CacheBackend, Environment
 from backend.infrastructure.configuration.inner.api import ApiConfig
 from backend.infrastructure.configuration.inner.embedder import CohereEmbedderConfig
 from backend.infrastructure.configuration.inner.llm import OpenRouterChatLLMConfig
+from backend.infrastructure.configuration.inner.observability import ObservabilityConfig
 from backend.infrastructure.configuration.inner.rag import RAGConfig
+from backend.infrastructure.configuration.inner.redis import RedisConfig
+from backend.infrastructure.configuration.inner.session import SessionConfig
 from backend.infrastructure.configuration.inner.vector_storage import QdrantVectoreStorageConfig
 
 
@@ -14,17 +17,35 @@ class Config(BaseSettings):
     environment: Environment = Environment.DEVELOPMENT
 
     template_dir: str = "./static/templates/"
+    template_module_dir: str | None = None
 
     api: ApiConfig = ApiConfig()
     embedder: CohereEmbedderConfig = CohereEmbedderConfig()
     vector_storage: QdrantVectoreStorageConfig = QdrantVectoreStorageConfig()
     chat_llm: OpenRouterChatLLMConfig = OpenRouterChatLLMConfig()
     rag: RAGConfig = RAGConfig()
+    redis: RedisConfig = RedisConfig()
+    session: SessionConfig = SessionConfig()
+    observability: ObservabilityConfig = ObservabilityConfig()
 
     @property
     def is_debug(self) -> bool:
         return self.environment == Environment.DEVELOPMENT and self.api.workers is None
 
+    @property
+    def has_several_workers(self) -> bool:
+        # Launchers other than run.py must set APP__API__WORKERS as well for this to hold
+        return self.api.workers is not None and self.api.workers > 1
+
+    @property
+    def session_backend(self) -> CacheBackend:
+        if self.session.backend is not None:
+            return self.session.backend
+        # A session kept in one worker's memory is not found by the others
+        if self.has_several_workers:
+            return CacheBackend.REDIS
+        return CacheBackend.MEMORY
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
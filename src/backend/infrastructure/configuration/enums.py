@@ -5,3 +5,46 @@ class Environment(StrEnum):
     PRODUCTION = "production"
     STAGING = "staging"
     DEVELOPMENT = "development"
+
+
+class CacheBackend(StrEnum):
+    MEMORY = "memory"
+    REDIS = "redis"
+
+
+class EmbedderProvider(StrEnum):
+    COHERE = "cohere"
+    FASTEMBED = "fastembed"
+
+
+class VectorStorageBackend(StrEnum):
+    QDRANT = "qdrant"
+    IN_MEMORY = "in_memory"
+
+
+class VectorQuantization(StrEnum):
+    NONE = "none"
+    SCALAR = "scalar"
+    BINARY = "binary"
+
+
+class RerankerProvider(StrEnum):
+    FASTEMBED = "fastembed"
+    COHERE = "cohere"
+
+
+class EventLoop(StrEnum):
+    AUTO = "auto"
+    ASYNCIO = "asyncio"
+    UVLOOP = "uvloop"
+
+
+class HttpProtocol(StrEnum):
+    AUTO = "auto"
+    H11 = "h11"
+    HTTPTOOLS = "httptools"
+
+
+class TokenCounterProvider(StrEnum):
+    APPROXIMATE = "approximate"
+    TIKTOKEN = "tiktoken"
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from backend.infrastructure.configuration.enums import EventLoop, HttpProtocol
+
 
 class ApiConfig(BaseModel):
     title: str = "RAG Chat API"
@@ -7,3 +9,6 @@ class ApiConfig(BaseModel):
     host: str = "0.0.0.0"
     port: int = 8000
     workers: int | None = None
+    # auto picks uvloop and httptools when they are installed
+    loop: EventLoop = EventLoop.AUTO
+    http: HttpProtocol = HttpProtocol.AUTO
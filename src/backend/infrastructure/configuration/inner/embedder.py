@@ -1,8 +1,40 @@
 from pydantic import BaseModel, SecretStr
 
+from backend.infrastructure.configuration.enums import CacheBackend, EmbedderProvider
+from backend.infrastructure.configuration.inner.resilience import ResilienceConfig
+
+EMBEDDER_TIMEOUT_SECONDS = 2.0
+
+
+class EmbeddingCacheConfig(BaseModel):
+    enabled: bool = False
+    backend: CacheBackend = CacheBackend.MEMORY
+    max_size: int = 4096
+    ttl_seconds: float | None = None
+
+
+class EmbeddingBatchingConfig(BaseModel):
+    enabled: bool = False
+    max_batch_size: int = 96
+    max_wait_ms: float = 5.0
+
+
+class LocalEmbedderConfig(BaseModel):
+    model: str = "BAAI/bge-small-en-v1.5"
+    cache_dir: str | None = None
+    threads: int | None = None
+    batch_size: int = 32
+    max_workers: int = 1
+
 
 class CohereEmbedderConfig(BaseModel):
+    provider: EmbedderProvider = EmbedderProvider.COHERE
     api_key: SecretStr = SecretStr("cohere_api_key")
+    base_url: str | None = None
     model: str = "embed-english-v3.0"
     input_type: str = "search_query"
     embedding_type: str = "float"
+    local: LocalEmbedderConfig = LocalEmbedderConfig()
+    cache: EmbeddingCacheConfig = EmbeddingCacheConfig()
+    batching: EmbeddingBatchingConfig = EmbeddingBatchingConfig()
+    resilience: ResilienceConfig = ResilienceConfig(timeout_seconds=EMBEDDER_TIMEOUT_SECONDS)
@@ -1,9 +1,42 @@
 from pydantic import BaseModel, SecretStr
 
 from backend.application.value_objects.generation_parameters import GenerationParameters
+from backend.infrastructure.configuration.enums import CacheBackend
+from backend.infrastructure.configuration.inner.resilience import ResilienceConfig
+
+CHAT_LLM_TIMEOUT_SECONDS = 30.0
+
+
+class HedgingConfig(BaseModel):
+    enabled: bool = False
+    percentile: float = 0.95
+    initial_delay_seconds: float = 2.0
+    min_delay_seconds: float = 0.5
+    window_size: int = 200
+    min_samples: int = 20
+    api_key: SecretStr | None = None
+    base_url: str | None = None
+    model_name: str | None = None
+
+
+class ResponseCacheConfig(BaseModel):
+    enabled: bool = False
+    backend: CacheBackend = CacheBackend.MEMORY
+    max_size: int = 4096
+    ttl_seconds: float | None = 3600.0
+    semantic_enabled: bool = False
+    similarity_threshold: float = 0.97
+    semantic_max_entries_per_scope: int = 256
+    semantic_max_scopes: int = 1024
 
 
 class OpenRouterChatLLMConfig(BaseModel):
     api_key: SecretStr = SecretStr("openrouter_api_key")
     base_url: str = "https://openrouter.ai/api/v1"
     generation_parameters: GenerationParameters = GenerationParameters(model_name="openai/gpt-4o")
+    resilience: ResilienceConfig = ResilienceConfig(
+        timeout_seconds=CHAT_LLM_TIMEOUT_SECONDS,
+        max_attempts=2,
+    )
+    hedging: HedgingConfig = HedgingConfig()
+    response_cache: ResponseCacheConfig = ResponseCacheConfig()
@@ -0,0 +1,12 @@
+import tempfile
+from pathlib import Path
+
+from pydantic import BaseModel
+
+
+class ObservabilityConfig(BaseModel):
+    tracing_enabled: bool = False
+    tracer_name: str = "backend"
+    # Several workers share their metrics through files in this directory, emptied at startup
+    metrics_multiprocess_dir: Path = Path(tempfile.gettempdir()) / "backend-metrics"
+    stats_sync_interval_seconds: float = 1.0
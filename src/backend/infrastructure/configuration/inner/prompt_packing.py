@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from backend.application.value_objects.prompt_packing_parameters import PromptPackingParameters
+from backend.infrastructure.configuration.enums import TokenCounterProvider
+
+
+class PromptPackingConfig(BaseModel):
+    token_counter: TokenCounterProvider = TokenCounterProvider.APPROXIMATE
+    tiktoken_encoding: str = "cl100k_base"
+    chars_per_token: float = 4.0
+    token_cache_size: int = 8192
+    parameters: PromptPackingParameters = PromptPackingParameters()
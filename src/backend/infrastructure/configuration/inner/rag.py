@@ -1,7 +1,24 @@
 from pydantic import BaseModel
 
+from backend.application.value_objects.fusion_parameters import FusionParameters
+from backend.application.value_objects.query_construction_parameters import (
+    QueryConstructionParameters,
+)
+from backend.infrastructure.configuration.inner.prompt_packing import PromptPackingConfig
+from backend.infrastructure.configuration.inner.reranker import RerankerConfig
+
 
 class RAGConfig(BaseModel):
     template_name: str = "chat_rag.mako"
     num_search_results: int = 3
     relevance_threshold: float = 0.4
+    query_construction: QueryConstructionParameters = QueryConstructionParameters()
+    hybrid_enabled: bool = False
+    fusion_parameters: FusionParameters = FusionParameters()
+    reranker: RerankerConfig = RerankerConfig()
+    prefix_cache_size: int = 1024
+    prompt_packing: PromptPackingConfig = PromptPackingConfig()
+    retrieval_timeout_seconds: float | None = 2.0
+    request_timeout_seconds: float | None = 45.0
+    batch_max_concurrency: int = 8
+    batch_retrieval_timeout_seconds: float | None = 10.0
@@ -0,0 +1,5 @@
+from pydantic import BaseModel, SecretStr
+
+
+class RedisConfig(BaseModel):
+    url: SecretStr = SecretStr("redis://localhost:6379/0")
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, SecretStr
+
+from backend.application.value_objects.rerank_parameters import RerankParameters
+from backend.infrastructure.configuration.enums import RerankerProvider
+from backend.infrastructure.configuration.inner.resilience import ResilienceConfig
+
+RERANKER_TIMEOUT_SECONDS = 1.0
+
+
+class LocalRerankerConfig(BaseModel):
+    model: str = "Xenova/ms-marco-MiniLM-L-6-v2"
+    cache_dir: str | None = None
+    threads: int | None = None
+    batch_size: int = 32
+    max_workers: int = 1
+
+
+class CohereRerankerConfig(BaseModel):
+    model: str = "rerank-english-v3.0"
+    api_key: SecretStr | None = None
+    base_url: str | None = None
+    resilience: ResilienceConfig = ResilienceConfig(timeout_seconds=RERANKER_TIMEOUT_SECONDS)
+
+
+class RerankerConfig(BaseModel):
+    enabled: bool = False
+    provider: RerankerProvider = RerankerProvider.FASTEMBED
+    parameters: RerankParameters = RerankParameters()
+    timeout_seconds: float | None = RERANKER_TIMEOUT_SECONDS
+    latency_percentile: float = 0.9
+    local: LocalRerankerConfig = LocalRerankerConfig()
+    cohere: CohereRerankerConfig = CohereRerankerConfig()
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class ResilienceConfig(BaseModel):
+    timeout_seconds: float | None = 10.0
+    max_attempts: int = 3
+    backoff_initial_seconds: float = 0.05
+    backoff_max_seconds: float = 0.5
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_seconds: float = 10.0
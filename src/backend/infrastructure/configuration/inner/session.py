@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from backend.infrastructure.configuration.enums import CacheBackend
+
+
+class SessionConfig(BaseModel):
+    # None keeps sessions in memory for one worker and in redis for several
+    backend: CacheBackend | None = None
+    max_size: int = 10000
+    ttl_seconds: float | None = 86400.0
+    max_messages: int = 50
@@ -1,7 +1,53 @@
 from pydantic import BaseModel, SecretStr
 
+from backend.infrastructure.configuration.enums import VectorQuantization, VectorStorageBackend
+from backend.infrastructure.configuration.inner.resilience import ResilienceConfig
+
+
+class QdrantCollectionConfig(BaseModel):
+    on_disk: bool = False
+    hnsw_m: int | None = None
+    hnsw_ef_construct: int | None = None
+    hnsw_payload_m: int | None = None
+    tenant_indexes: bool = True
+    multitenancy: bool = False
+    quantization: VectorQuantization = VectorQuantization.NONE
+    quantization_always_ram: bool = True
+    scalar_quantile: float | None = 0.99
+
+
+class SparseVectorsConfig(BaseModel):
+    enabled: bool = False
+    k1: float = 1.2
+    length_normalization: float = 0.75
+    avg_doc_length: float = 8.0
+
+
+class QdrantSearchConfig(BaseModel):
+    hnsw_ef: int | None = None
+    rescore: bool | None = None
+    oversampling: float | None = None
+
+
+class InMemoryVectorStorageConfig(BaseModel):
+    snapshot_dir: str = "./data/vector_snapshots"
+    quantize: bool = False
+    hnsw_threshold: int | None = 50000
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_ef: int | None = 64
+    refresh_interval_seconds: float | None = None
+
 
 class QdrantVectoreStorageConfig(BaseModel):
+    backend: VectorStorageBackend = VectorStorageBackend.QDRANT
     host: SecretStr = SecretStr("localhost")
     port: int = 6333
+    # Embedded Qdrant kept in this directory, used instead of the server when set
+    path: str | None = None
     collection_name: str = "facts"
+    collection: QdrantCollectionConfig = QdrantCollectionConfig()
+    search: QdrantSearchConfig = QdrantSearchConfig()
+    sparse: SparseVectorsConfig = SparseVectorsConfig()
+    in_memory: InMemoryVectorStorageConfig = InMemoryVectorStorageConfig()
+    resilience: ResilienceConfig = ResilienceConfig(timeout_seconds=1.0)
@@ -1,19 +1,68 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable
+
 from cohere import AsyncClientV2 as CohereClient
-from dishka import Provider, Scope, make_async_container, provide
+from dishka import AsyncContainer, Provider, Scope, alias, make_async_container, provide
 from dishka.integrations.fastapi import FastapiProvider
 from openai import AsyncOpenAI
 from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models as qdrant_models
+from redis.asyncio import Redis
 
+from backend.application.services.cache import AtomicCacheP, CacheP
 from backend.application.services.embedder import EmbedderP
 from backend.application.services.llm import LLMServiceP
+from backend.application.services.metrics import MetricsP
+from backend.application.services.prompt_packer import PromptPacker
+from backend.application.services.query_builder import QueryBuilder
+from backend.application.services.reranker import RerankerP
+from backend.application.services.resilience import CircuitBreaker, ResiliencePolicy
+from backend.application.services.response_cache import ResponseCacheService
 from backend.application.services.retrieval import RetrievalService
+from backend.application.services.session import SessionService
+from backend.application.services.sparse_encoder import SparseEncoderP
+from backend.application.services.token_counter import TokenCounterP
+from backend.application.services.tracing import TracerP
 from backend.application.services.vector_storage import VectorStorageP
 from backend.application.use_cases.chat import ChatUseCase
+from backend.application.use_cases.chat_batch import ChatBatchUseCase
+from backend.application.use_cases.session_chat import SessionChatUseCase
+from backend.domain.entities.session import Session
 from backend.infrastructure.configuration.config import Config, get_config
-from backend.integrations.services.embedder.cohere import CohereEmbedder
-from backend.integrations.services.llm.openai import OpenAILikeLLM
+from backend.infrastructure.configuration.enums import (
+    CacheBackend,
+    EmbedderProvider,
+    RerankerProvider,
+    TokenCounterProvider,
+    VectorStorageBackend,
+)
+from backend.infrastructure.configuration.inner.resilience import ResilienceConfig
+from backend.integrations.services.cache.memory import InMemoryLRUCache
+from backend.integrations.services.cache.redis import RedisCache
+from backend.integrations.services.cache.semantic import InMemorySemanticCache
+from backend.integrations.services.embedder.batching import BatchingEmbedder
+from backend.integrations.services.embedder.cached import CachedEmbedder
+from backend.integrations.services.embedder.cohere import (
+    CohereEmbedder,
+    is_cohere_input_error,
+    is_retryable_cohere_error,
+)
+from backend.integrations.services.llm.hedged import HedgedLLM
+from backend.integrations.services.llm.openai import OpenAILikeLLM, is_retryable_openai_error
+from backend.integrations.services.metrics.prometheus import PrometheusMetrics, is_multiprocess
 from backend.integrations.services.prompts.rag import MakoRAGPromptBuilder
-from backend.integrations.services.vector_storage.qdrant import QdrantVectorStorage
+from backend.integrations.services.reranker.budgeted import BudgetedReranker
+from backend.integrations.services.reranker.cohere import CohereReranker
+from backend.integrations.services.sparse_encoder.bm25 import BM25SparseEncoder
+from backend.integrations.services.token_counter.approximate import ApproximateTokenCounter
+from backend.integrations.services.token_counter.cached import CachedTokenCounter
+from backend.integrations.services.token_counter.tiktoken import TiktokenCounter
+from backend.integrations.services.vector_storage.in_memory import InMemoryVectorStorage
+from backend.integrations.services.vector_storage.qdrant import (
+    QdrantVectorStorage,
+    is_retryable_qdrant_error,
+)
 
 
 class ConfigProvider(Provider):
@@ -25,49 +74,199 @@ class ConfigProvider(Provider):
 class ClientsProvider(Provider):
     @provide(scope=Scope.APP)
     def get_cohere_client(self, config: Config) -> CohereClient:
-        return CohereClient(api_key=config.embedder.api_key.get_secret_value())
+        return CohereClient(
+            api_key=config.embedder.api_key.get_secret_value(),
+            base_url=config.embedder.base_url,
+        )
 
     @provide(scope=Scope.APP)
     def get_openai_client(self, config: Config) -> AsyncOpenAI:
         return AsyncOpenAI(
             api_key=config.chat_llm.api_key.get_secret_value(),
             base_url=config.chat_llm.base_url,
+            max_retries=0,
         )
 
     @provide(scope=Scope.APP)
     def get_qdrant_client(self, config: Config) -> AsyncQdrantClient:
+        if config.vector_storage.path is not None:
+            return AsyncQdrantClient(path=config.vector_storage.path)
         return AsyncQdrantClient(
             host=config.vector_storage.host.get_secret_value(),
             port=config.vector_storage.port,
         )
 
+    @provide(scope=Scope.APP)
+    def get_redis_client(self, config: Config) -> Redis:
+        return Redis.from_url(config.redis.url.get_secret_value())
+
+
+class MetricsProvider(Provider):
+    metrics = alias(source=PrometheusMetrics, provides=MetricsP)
 
-class ServicesProvider(Provider):
     @provide(scope=Scope.APP)
-    def get_embedder(self, client: CohereClient, config: Config) -> EmbedderP:
-        return CohereEmbedder(
-            client=client,
-            model=config.embedder.model,
-            input_type=config.embedder.input_type,
-            embedding_type=config.embedder.embedding_type,
+    async def get_prometheus_metrics(self, config: Config) -> AsyncIterator[PrometheusMetrics]:
+        metrics = PrometheusMetrics(
+            multiprocess_mode=is_multiprocess(),
+            stats_sync_interval_seconds=config.observability.stats_sync_interval_seconds,
         )
+        yield metrics
+        await metrics.close()
 
+
+class ServicesProvider(Provider):
     @provide(scope=Scope.APP)
-    def get_llm(self, client: AsyncOpenAI, config: Config) -> LLMServiceP:
-        return OpenAILikeLLM(
+    def get_embedder(
+        self,
+        client: CohereClient,
+        redis_client: Redis,
+        metrics: PrometheusMetrics,
+        config: Config,
+    ) -> EmbedderP:
+        embedding_service: EmbedderP
+        is_input_error = None
+        if config.embedder.provider == EmbedderProvider.FASTEMBED:
+            embedding_service = _make_local_embedder(config=config)
+            model_name = config.embedder.local.model
+        else:
+            embedding_service = CohereEmbedder(
+                client=client,
+                model=config.embedder.model,
+                input_type=config.embedder.input_type,
+                embedding_type=config.embedder.embedding_type,
+                policy=_make_resilience_policy(
+                    name="cohere",
+                    resilience_config=config.embedder.resilience,
+                    is_retryable=is_retryable_cohere_error,
+                    metrics=metrics,
+                    config=config,
+                ),
+            )
+            model_name = config.embedder.model
+            is_input_error = is_cohere_input_error
+
+        if config.embedder.batching.enabled:
+            embedding_service = BatchingEmbedder(
+                embedder=embedding_service,
+                max_batch_size=config.embedder.batching.max_batch_size,
+                max_wait_ms=config.embedder.batching.max_wait_ms,
+                is_input_error=is_input_error,
+            )
+
+        if config.embedder.cache.enabled:
+            embedding_service = CachedEmbedder(
+                embedder=embedding_service,
+                cache=_make_embedding_cache(redis_client=redis_client, config=config),
+                namespace=f"embedding:{model_name}:{config.embedder.input_type}",
+            )
+            metrics.register_stats(
+                stats_object=embedding_service,
+                counters=[
+                    ("embedding_cache_hits", "Embeddings served from cache", "hits"),
+                    ("embedding_cache_misses", "Embeddings computed on a cache miss", "misses"),
+                ],
+            )
+
+        return embedding_service
+
+    @provide(scope=Scope.APP)
+    def get_llm(
+        self,
+        client: AsyncOpenAI,
+        metrics: PrometheusMetrics,
+        config: Config,
+    ) -> LLMServiceP:
+        llm_service = OpenAILikeLLM(
             client=client,
             generation_parameters=config.chat_llm.generation_parameters,
+            policy=_make_resilience_policy(
+                name="openai",
+                resilience_config=config.chat_llm.resilience,
+                is_retryable=is_retryable_openai_error,
+                metrics=metrics,
+                config=config,
+            ),
+        )
+
+        hedging_config = config.chat_llm.hedging
+        if not hedging_config.enabled:
+            return llm_service
+
+        hedged_llm = HedgedLLM(
+            primary=llm_service,
+            secondary=_make_hedge_llm(primary=llm_service, metrics=metrics, config=config),
+            percentile=hedging_config.percentile,
+            initial_delay_seconds=hedging_config.initial_delay_seconds,
+            min_delay_seconds=hedging_config.min_delay_seconds,
+            window_size=hedging_config.window_size,
+            min_samples=hedging_config.min_samples,
+        )
+        metrics.register_stats(
+            stats_object=hedged_llm,
+            counters=[
+                ("llm_requests", "LLM requests that could be hedged", "requests"),
+                ("llm_hedges_fired", "Hedge requests sent to the secondary LLM", "hedges_fired"),
+                ("llm_hedges_won", "Hedge requests that answered first", "hedges_won"),
+            ],
+        )
+        return hedged_llm
+
+    @provide(scope=Scope.APP)
+    def get_token_counter(self, metrics: PrometheusMetrics, config: Config) -> TokenCounterP:
+        cached_token_counter = CachedTokenCounter(
+            token_counter=_make_uncached_token_counter(config=config),
+            max_size=config.rag.prompt_packing.token_cache_size,
+        )
+        metrics.register_stats(
+            stats_object=cached_token_counter,
+            counters=[
+                ("token_count_cache_hits", "Token counts served from cache", "hits"),
+                ("token_count_cache_misses", "Texts tokenized on a cache miss", "misses"),
+            ],
         )
+        return cached_token_counter
 
     @provide(scope=Scope.APP)
     def get_vector_storage(
         self,
         client: AsyncQdrantClient,
+        metrics: PrometheusMetrics,
         config: Config,
     ) -> VectorStorageP:
+        if config.vector_storage.backend == VectorStorageBackend.IN_MEMORY:
+            in_memory_config = config.vector_storage.in_memory
+            return InMemoryVectorStorage(
+                client=client,
+                collection_name=config.vector_storage.collection_name,
+                snapshot_dir=in_memory_config.snapshot_dir,
+                quantize=in_memory_config.quantize,
+                hnsw_threshold=in_memory_config.hnsw_threshold,
+                hnsw_m=in_memory_config.hnsw_m,
+                hnsw_ef_construct=in_memory_config.hnsw_ef_construct,
+                hnsw_ef=in_memory_config.hnsw_ef,
+                refresh_interval_seconds=in_memory_config.refresh_interval_seconds,
+            )
+
         return QdrantVectorStorage(
             client=client,
             collection_name=config.vector_storage.collection_name,
+            policy=_make_resilience_policy(
+                name="qdrant",
+                resilience_config=config.vector_storage.resilience,
+                is_retryable=is_retryable_qdrant_error,
+                metrics=metrics,
+                config=config,
+            ),
+            search_params=_make_qdrant_search_params(config=config),
+        )
+
+    @provide(scope=Scope.APP)
+    def get_sparse_encoder(self, config: Config) -> SparseEncoderP:
+        sparse_config = config.vector_storage.sparse
+        return BM25SparseEncoder(
+            k1=sparse_config.k1,
+            length_normalization=sparse_config.length_normalization,
+            avg_doc_length=sparse_config.avg_doc_length,
         )
 
     @provide(scope=Scope.APP)
@@ -78,6 +277,9 @@ class ServicesProvider(Provider):
         return MakoRAGPromptBuilder(
             templates_dir=config.template_dir,
             template_name=config.rag.template_name,
+            module_directory=config.template_module_dir,
+            hot_reload=config.is_debug,
+            prefix_cache=InMemoryLRUCache(max_size=config.rag.prefix_cache_size),
         )
 
 
@@ -87,14 +289,64 @@ class ApplicationProvider(Provider):
         self,
         embedder: EmbedderP,
         vector_storage: VectorStorageP,
+        sparse_encoder: SparseEncoderP,
+        cohere_client: CohereClient,
+        metrics: PrometheusMetrics,
         config: Config,
     ) -> RetrievalService:
-        return RetrievalService(
+        reranker = None
+        if config.rag.reranker.enabled:
+            reranker = _make_reranker(cohere_client=cohere_client, metrics=metrics, config=config)
+
+        retrieval_service = RetrievalService(
             embedder=embedder,
             vector_storage=vector_storage,
             num_search_results=config.rag.num_search_results,
             relevance_threshold=config.rag.relevance_threshold,
+            sparse_encoder=sparse_encoder if config.rag.hybrid_enabled else None,
+            fusion_parameters=config.rag.fusion_parameters,
+            reranker=reranker,
+            rerank_parameters=config.rag.reranker.parameters,
+        )
+        metrics.register_stats(
+            stats_object=retrieval_service,
+            counters=[
+                ("retrievals", "Retrieval queries", "retrievals"),
+                ("empty_retrievals", "Retrieval queries that found no facts", "empty_retrievals"),
+                (
+                    "filtered_search_results",
+                    "Search results dropped by the relevance threshold",
+                    "filtered_results",
+                ),
+            ],
+        )
+        return retrieval_service
+
+    @provide(scope=Scope.APP)
+    def get_query_builder(self, config: Config) -> QueryBuilder:
+        return QueryBuilder(parameters=config.rag.query_construction)
+
+    @provide(scope=Scope.APP)
+    def get_response_cache(
+        self,
+        redis_client: Redis,
+        metrics: PrometheusMetrics,
+        config: Config,
+    ) -> ResponseCacheService:
+        response_cache_service = _make_response_cache(redis_client=redis_client, config=config)
+        metrics.register_stats(
+            stats_object=response_cache_service,
+            counters=[
+                ("response_cache_exact_hits", "Replies served from the exact cache", "exact_hits"),
+                (
+                    "response_cache_semantic_hits",
+                    "Replies served from the semantic cache",
+                    "semantic_hits",
+                ),
+                ("response_cache_misses", "Replies generated on a cache miss", "misses"),
+            ],
         )
+        return response_cache_service
 
     @provide(scope=Scope.APP)
     def get_chat_use_case(
@@ -102,18 +354,375 @@ class ApplicationProvider(Provider):
         retrieval_service: RetrievalService,
         prompt_builder: MakoRAGPromptBuilder,
         llm: LLMServiceP,
+        response_cache: ResponseCacheService,
+        query_builder: QueryBuilder,
+        token_counter: TokenCounterP,
+        metrics: PrometheusMetrics,
+        config: Config,
     ) -> ChatUseCase:
-        return ChatUseCase(
+        chat_use_case = ChatUseCase(
             retrieval_service=retrieval_service,
             llm_prompt_builder_service=prompt_builder,
             llm_service=llm,
+            retrieval_timeout_seconds=config.rag.retrieval_timeout_seconds,
+            request_timeout_seconds=config.rag.request_timeout_seconds,
+            response_cache=response_cache,
+            query_builder=query_builder,
+            prompt_packer=_make_prompt_packer(token_counter=token_counter, config=config),
+            metrics=metrics,
+            tracer=_make_tracer(config=config),
         )
+        metrics.register_stats(
+            stats_object=chat_use_case,
+            counters=[
+                (
+                    "chat_retrieval_failures",
+                    "Chat requests answered without retrieved facts",
+                    "retrieval_failures",
+                ),
+            ],
+        )
+        return chat_use_case
 
+    @provide(scope=Scope.APP)
+    def get_chat_batch_use_case(
+        self,
+        retrieval_service: RetrievalService,
+        prompt_builder: MakoRAGPromptBuilder,
+        llm: LLMServiceP,
+        response_cache: ResponseCacheService,
+        query_builder: QueryBuilder,
+        token_counter: TokenCounterP,
+        metrics: PrometheusMetrics,
+        config: Config,
+    ) -> ChatBatchUseCase:
+        chat_batch_use_case = ChatBatchUseCase(
+            retrieval_service=retrieval_service,
+            llm_prompt_builder_service=prompt_builder,
+            llm_service=llm,
+            max_concurrency=config.rag.batch_max_concurrency,
+            retrieval_timeout_seconds=config.rag.batch_retrieval_timeout_seconds,
+            request_timeout_seconds=config.rag.request_timeout_seconds,
+            response_cache=response_cache,
+            query_builder=query_builder,
+            prompt_packer=_make_prompt_packer(token_counter=token_counter, config=config),
+            metrics=metrics,
+            tracer=_make_tracer(config=config),
+        )
+        metrics.register_stats(
+            stats_object=chat_batch_use_case,
+            counters=[
+                (
+                    "chat_batch_retrieval_failures",
+                    "Batch chat items answered without retrieved facts",
+                    "retrieval_failures",
+                ),
+                ("chat_batch_item_failures", "Batch chat items that failed", "item_failures"),
+            ],
+        )
+        return chat_batch_use_case
 
-container = make_async_container(
-    ConfigProvider(),
-    ClientsProvider(),
-    ServicesProvider(),
-    ApplicationProvider(),
-    FastapiProvider(),
-)
+    @provide(scope=Scope.APP)
+    def get_session_service(self, redis_client: Redis, config: Config) -> SessionService:
+        store: AtomicCacheP[Session]
+        if config.session_backend == CacheBackend.REDIS:
+            store = RedisCache(
+                client=redis_client,
+                dumps=Session.model_dump_json,
+                loads=Session.model_validate_json,
+                prefix="session:",
+                ttl_seconds=config.session.ttl_seconds,
+            )
+        else:
+            store = InMemoryLRUCache(
+                max_size=config.session.max_size,
+                ttl_seconds=config.session.ttl_seconds,
+            )
+
+        return SessionService(store=store, max_messages=config.session.max_messages)
+
+    @provide(scope=Scope.APP)
+    def get_session_chat_use_case(
+        self,
+        chat_use_case: ChatUseCase,
+        session_service: SessionService,
+    ) -> SessionChatUseCase:
+        return SessionChatUseCase(chat_use_case=chat_use_case, session_service=session_service)
+
+
+def _make_resilience_policy(
+    name: str,
+    resilience_config: ResilienceConfig,
+    is_retryable: Callable[[BaseException], bool],
+    metrics: MetricsP,
+    config: Config,
+) -> ResiliencePolicy:
+    circuit_breaker = None
+    if resilience_config.circuit_breaker_enabled:
+        circuit_breaker = CircuitBreaker(
+            failure_threshold=resilience_config.circuit_breaker_failure_threshold,
+            reset_timeout_seconds=resilience_config.circuit_breaker_reset_seconds,
+        )
+
+    return ResiliencePolicy(
+        name=name,
+        is_retryable=is_retryable,
+        timeout_seconds=resilience_config.timeout_seconds,
+        max_attempts=resilience_config.max_attempts,
+        backoff_initial_seconds=resilience_config.backoff_initial_seconds,
+        backoff_max_seconds=resilience_config.backoff_max_seconds,
+        circuit_breaker=circuit_breaker,
+        metrics=metrics,
+        tracer=_make_tracer(config=config),
+    )
+
+
+def _make_tracer(config: Config) -> TracerP | None:
+    observability_config = config.observability
+    if not observability_config.tracing_enabled:
+        return None
+
+    # opentelemetry is an optional dependency, so it is imported only when enabled
+    from backend.integrations.services.tracing.opentelemetry import (  # noqa: WPS433
+        OpenTelemetryTracer,
+    )
+
+    return OpenTelemetryTracer(name=observability_config.tracer_name)
+
+
+def _make_response_cache(redis_client: Redis, config: Config) -> ResponseCacheService:
+    cache_config = config.chat_llm.response_cache
+    if not cache_config.enabled:
+        return ResponseCacheService()
+
+    exact_cache: CacheP[str]
+    if cache_config.backend == CacheBackend.REDIS:
+        exact_cache = RedisCache(
+            client=redis_client,
+            dumps=json.dumps,
+            loads=json.loads,
+            ttl_seconds=cache_config.ttl_seconds,
+        )
+    else:
+        exact_cache = InMemoryLRUCache(
+            max_size=cache_config.max_size,
+            ttl_seconds=cache_config.ttl_seconds,
+        )
+
+    semantic_cache = None
+    if cache_config.semantic_enabled:
+        semantic_cache = InMemorySemanticCache(
+            similarity_threshold=cache_config.similarity_threshold,
+            max_entries_per_scope=cache_config.semantic_max_entries_per_scope,
+            max_scopes=cache_config.semantic_max_scopes,
+            ttl_seconds=cache_config.ttl_seconds,
+        )
+
+    return ResponseCacheService(
+        exact_cache=exact_cache,
+        semantic_cache=semantic_cache,
+        namespace=f"response:{config.chat_llm.generation_parameters.model_name}",
+    )
+
+
+def _make_qdrant_search_params(config: Config) -> qdrant_models.SearchParams | None:
+    search_config = config.vector_storage.search
+    quantization_params = None
+    if search_config.rescore is not None or search_config.oversampling is not None:
+        quantization_params = qdrant_models.QuantizationSearchParams(
+            rescore=search_config.rescore,
+            oversampling=search_config.oversampling,
+        )
+
+    if search_config.hnsw_ef is None and quantization_params is None:
+        return None
+
+    return qdrant_models.SearchParams(
+        hnsw_ef=search_config.hnsw_ef,
+        quantization=quantization_params,
+    )
+
+
+def _make_hedge_llm(
+    primary: OpenAILikeLLM,
+    metrics: MetricsP,
+    config: Config,
+) -> OpenAILikeLLM:
+    hedging_config = config.chat_llm.hedging
+    if hedging_config.base_url is None and hedging_config.model_name is None:
+        return primary
+
+    api_key = hedging_config.api_key or config.chat_llm.api_key
+    generation_parameters = config.chat_llm.generation_parameters
+    if hedging_config.model_name is not None:
+        generation_parameters = generation_parameters.model_copy(
+            update={"model_name": hedging_config.model_name},
+        )
+
+    return OpenAILikeLLM(
+        client=AsyncOpenAI(
+            api_key=api_key.get_secret_value(),
+            base_url=hedging_config.base_url or config.chat_llm.base_url,
+            max_retries=0,
+        ),
+        generation_parameters=generation_parameters,
+        policy=_make_resilience_policy(
+            name="openai_hedge",
+            resilience_config=config.chat_llm.resilience,
+            is_retryable=is_retryable_openai_error,
+            metrics=metrics,
+            config=config,
+        ),
+    )
+
+
+def _make_local_embedder(config: Config) -> EmbedderP:
+    # fastembed is an optional dependency, so it is imported only when selected
+    from fastembed import TextEmbedding  # noqa: WPS433
+
+    from backend.integrations.services.embedder.fastembed import (  # noqa: WPS433
+        FastEmbedEmbedder,
+    )
+
+    local_config = config.embedder.local
+    return FastEmbedEmbedder(
+        model=TextEmbedding(
+            model_name=local_config.model,
+            cache_dir=local_config.cache_dir,
+            threads=local_config.threads,
+        ),
+        executor=ThreadPoolExecutor(
+            max_workers=local_config.max_workers,
+            thread_name_prefix="fastembed",
+        ),
+        input_type=config.embedder.input_type,
+        batch_size=local_config.batch_size,
+    )
+
+
+def _make_uncached_token_counter(config: Config) -> TokenCounterP:
+    packing_config = config.rag.prompt_packing
+    if packing_config.token_counter == TokenCounterProvider.TIKTOKEN:
+        return TiktokenCounter(encoding_name=packing_config.tiktoken_encoding)
+    return ApproximateTokenCounter(chars_per_token=packing_config.chars_per_token)
+
+
+def _make_prompt_packer(token_counter: TokenCounterP, config: Config) -> PromptPacker | None:
+    generation_parameters = config.chat_llm.generation_parameters
+    if generation_parameters.max_context_tokens is None:
+        return None
+
+    return PromptPacker(
+        token_counter=token_counter,
+        max_context_tokens=generation_parameters.max_context_tokens,
+        max_reply_tokens=generation_parameters.max_tokens,
+        parameters=config.rag.prompt_packing.parameters,
+    )
+
+
+def _make_reranker(
+    cohere_client: CohereClient,
+    metrics: PrometheusMetrics,
+    config: Config,
+) -> RerankerP:
+    reranker_config = config.rag.reranker
+
+    reranker: RerankerP
+    if reranker_config.provider == RerankerProvider.COHERE:
+        reranker = _make_cohere_reranker(
+            cohere_client=cohere_client,
+            metrics=metrics,
+            config=config,
+        )
+    else:
+        reranker = _make_local_reranker(config=config)
+
+    budgeted_reranker = BudgetedReranker(
+        reranker=reranker,
+        timeout_seconds=reranker_config.timeout_seconds,
+        latency_percentile=reranker_config.latency_percentile,
+    )
+    metrics.register_stats(
+        stats_object=budgeted_reranker,
+        counters=[
+            ("reranks", "Search results lists that were reranked", "reranked"),
+            ("reranks_skipped", "Reranks skipped for lack of latency budget", "skipped"),
+        ],
+    )
+    return budgeted_reranker
+
+
+def _make_cohere_reranker(
+    cohere_client: CohereClient,
+    metrics: MetricsP,
+    config: Config,
+) -> RerankerP:
+    cohere_config = config.rag.reranker.cohere
+    if cohere_config.api_key is not None or cohere_config.base_url is not None:
+        api_key = cohere_config.api_key or config.embedder.api_key
+        cohere_client = CohereClient(
+            api_key=api_key.get_secret_value(),
+            base_url=cohere_config.base_url or config.embedder.base_url,
+        )
+
+    return CohereReranker(
+        client=cohere_client,
+        model=cohere_config.model,
+        policy=_make_resilience_policy(
+            name="cohere_rerank",
+            resilience_config=cohere_config.resilience,
+            is_retryable=is_retryable_cohere_error,
+            metrics=metrics,
+            config=config,
+        ),
+    )
+
+
+def _make_local_reranker(config: Config) -> RerankerP:
+    # fastembed is an optional dependency, so it is imported only when selected
+    from fastembed.rerank.cross_encoder import TextCrossEncoder  # noqa: WPS433
+
+    from backend.integrations.services.reranker.cross_encoder import (  # noqa: WPS433
+        CrossEncoderReranker,
+    )
+
+    local_config = config.rag.reranker.local
+    return CrossEncoderReranker(
+        model=TextCrossEncoder(
+            model_name=local_config.model,
+            cache_dir=local_config.cache_dir,
+            threads=local_config.threads,
+        ),
+        executor=ThreadPoolExecutor(
+            max_workers=local_config.max_workers,
+            thread_name_prefix="cross_encoder",
+        ),
+        batch_size=local_config.batch_size,
+    )
+
+
+def _make_embedding_cache(redis_client: Redis, config: Config) -> CacheP[list[float]]:
+    cache_config = config.embedder.cache
+    if cache_config.backend == CacheBackend.REDIS:
+        return RedisCache(
+            client=redis_client,
+            dumps=json.dumps,
+            loads=json.loads,
+            ttl_seconds=cache_config.ttl_seconds,
+        )
+    return InMemoryLRUCache(
+        max_size=cache_config.max_size,
+        ttl_seconds=cache_config.ttl_seconds,
+    )
+
+
+def make_container() -> AsyncContainer:
+    """Every server worker builds its own container, so clients and pools are never shared."""
+    return make_async_container(
+        ConfigProvider(),
+        ClientsProvider(),
+        MetricsProvider(),
+        ServicesProvider(),
+        ApplicationProvider(),
+        FastapiProvider(),
+    )
@@ -0,0 +1,54 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+
+from backend.application.services.cache import AtomicCacheP
+
+ValueT = TypeVar("ValueT")
+
+
+class InMemoryLRUCache(AtomicCacheP[ValueT], Generic[ValueT]):
+    def __init__(self, max_size: int = 4096, ttl_seconds: float | None = None):
+        if max_size <= 0:
+            raise ValueError(f"Cache max size must be positive, got {max_size}")
+
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, ValueT]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> ValueT | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def update(self, key: str, updater: Callable[[ValueT], ValueT]) -> ValueT | None:
+        # Neither get nor set yields to the event loop, so no other task runs in between
+        value = await self.get(key)
+        if value is None:
+            return None
+
+        updated_value = updater(value)
+        await self.set(key, updated_value)
+        return updated_value
+
+    async def set(self, key: str, value: ValueT) -> None:
+        expires_at = float("inf")
+        if self._ttl_seconds is not None:
+            expires_at = time.monotonic() + self._ttl_seconds
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
@@ -0,0 +1,63 @@
+from functools import partial
+from typing import Callable, Generic, TypeVar
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from backend.application.services.cache import AtomicCacheP
+
+ValueT = TypeVar("ValueT")
+
+
+class RedisCache(AtomicCacheP[ValueT], Generic[ValueT]):
+    def __init__(
+        self,
+        client: Redis,
+        dumps: Callable[[ValueT], bytes | str],
+        loads: Callable[[bytes | str], ValueT],
+        prefix: str = "",
+        ttl_seconds: float | None = None,
+    ):
+        self._client = client
+        self._dumps = dumps
+        self._loads = loads
+        self._prefix = prefix
+        self._ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> ValueT | None:
+        raw_value = await self._client.get(self._prefix + key)
+        if raw_value is None:
+            return None
+        return self._loads(raw_value)
+
+    async def set(self, key: str, value: ValueT) -> None:
+        await self._client.set(self._prefix + key, self._dumps(value), px=self._ttl_milliseconds())
+
+    async def update(self, key: str, updater: Callable[[ValueT], ValueT]) -> ValueT | None:
+        prefixed_key = self._prefix + key
+        # Optimistic transaction: redis retries it when another client changed the key meanwhile
+        return await self._client.transaction(
+            partial(self._update_watched, prefixed_key, updater),
+            prefixed_key,
+            value_from_callable=True,
+        )
+
+    async def _update_watched(
+        self,
+        key: str,
+        updater: Callable[[ValueT], ValueT],
+        pipeline: Pipeline,
+    ) -> ValueT | None:
+        raw_value = await pipeline.get(key)
+        if raw_value is None:
+            return None
+
+        updated_value = updater(self._loads(raw_value))
+        pipeline.multi()
+        pipeline.set(key, self._dumps(updated_value), px=self._ttl_milliseconds())
+        return updated_value
+
+    def _ttl_milliseconds(self) -> int | None:
+        if self._ttl_seconds is None:
+            return None
+        return int(self._ttl_seconds * 1000)
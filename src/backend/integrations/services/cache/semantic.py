@@ -0,0 +1,119 @@
+import itertools
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from backend.application.services.cache import SemanticCacheP
+
+FloatVector = NDArray[np.float32]
+
+
+class SemanticEntry(NamedTuple):
+    embedding: FloatVector
+    value: str
+    expires_at: float
+
+
+class SemanticScope:
+    def __init__(self) -> None:
+        self.entries: OrderedDict[int, SemanticEntry] = OrderedDict()
+        self._matrix: FloatVector | None = None
+        self._entry_ids: list[int] = []
+
+    def invalidate(self) -> None:
+        self._matrix = None
+
+    def nearest(self, embedding: FloatVector) -> tuple[int, float] | None:
+        if not self.entries:
+            return None
+
+        if self._matrix is None:
+            self._entry_ids = list(self.entries)
+            self._matrix = np.stack([entry.embedding for entry in self.entries.values()])
+
+        similarities = self._matrix @ embedding
+        best_index = int(np.argmax(similarities))
+        return self._entry_ids[best_index], float(similarities[best_index])
+
+
+class InMemorySemanticCache(SemanticCacheP):
+    """Nearest-neighbour cache of values keyed by embeddings, partitioned by scope.
+
+    Embeddings are normalized on write, so similarity is the cosine. Both scopes and the
+    entries inside a scope are evicted least-recently-used, and entries expire after the TTL.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.97,
+        max_entries_per_scope: int = 256,
+        max_scopes: int = 1024,
+        ttl_seconds: float | None = None,
+    ):
+        self._similarity_threshold = similarity_threshold
+        self._max_entries_per_scope = max_entries_per_scope
+        self._max_scopes = max_scopes
+        self._ttl_seconds = ttl_seconds
+        self._scopes: OrderedDict[str, SemanticScope] = OrderedDict()
+        self._entry_ids = itertools.count()
+
+    async def find(self, scope: str, embedding: list[float]) -> str | None:
+        semantic_scope = self._scopes.get(scope)
+        if semantic_scope is None:
+            return None
+        self._scopes.move_to_end(scope)
+
+        self._drop_expired(semantic_scope=semantic_scope)
+
+        nearest = semantic_scope.nearest(embedding=self._normalize(embedding))
+        if nearest is None:
+            return None
+
+        entry_id, similarity = nearest
+        if similarity < self._similarity_threshold:
+            return None
+
+        semantic_scope.entries.move_to_end(entry_id)
+        return semantic_scope.entries[entry_id].value
+
+    async def add(self, scope: str, embedding: list[float], value: str) -> None:
+        semantic_scope = self._scopes.get(scope)
+        if semantic_scope is None:
+            semantic_scope = SemanticScope()
+            self._scopes[scope] = semantic_scope
+            while len(self._scopes) > self._max_scopes:
+                self._scopes.popitem(last=False)
+        self._scopes.move_to_end(scope)
+
+        expires_at = float("inf")
+        if self._ttl_seconds is not None:
+            expires_at = time.monotonic() + self._ttl_seconds
+
+        semantic_scope.entries[next(self._entry_ids)] = SemanticEntry(
+            embedding=self._normalize(embedding),
+            value=value,
+            expires_at=expires_at,
+        )
+        while len(semantic_scope.entries) > self._max_entries_per_scope:
+            semantic_scope.entries.popitem(last=False)
+        semantic_scope.invalidate()
+
+    def _drop_expired(self, semantic_scope: SemanticScope) -> None:
+        now = time.monotonic()
+        expired_ids = [
+            entry_id for entry_id, entry in semantic_scope.entries.items() if entry.expires_at < now
+        ]
+        for entry_id in expired_ids:
+            semantic_scope.entries.pop(entry_id)
+        if expired_ids:
+            semantic_scope.invalidate()
+
+    def _normalize(self, embedding: list[float]) -> FloatVector:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0:
+            return vector
+        return vector / norm
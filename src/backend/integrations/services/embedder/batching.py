@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+from typing import Callable
+
+from backend.application.services.embedder import EmbedderP
+
+PendingEmbedding = tuple[str, asyncio.Future[list[float]]]
+
+
+class BatchingEmbedder(EmbedderP):
+    """Coalesces concurrent `embed` calls into batched requests to the wrapped embedder.
+
+    A batch is sent when it reaches `max_batch_size` or when `max_wait_ms` has passed since
+    its first query arrived, whichever happens first. Batches run in an empty context, so the
+    deadline and span of whichever caller arrived first don't apply to the others.
+
+    When a batch is rejected because of its input (`is_input_error`, or a `ValueError`), its
+    queries are retried one by one and a bad query fails only its own caller. Any other error,
+    such as a timeout or an open circuit, fails the whole batch at once, so an outage does not
+    turn one batch into a request per query.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderP,
+        max_batch_size: int = 96,
+        max_wait_ms: float = 5.0,
+        is_input_error: Callable[[BaseException], bool] | None = None,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError(f"Max batch size must be positive, got {max_batch_size}")
+
+        self._embedder = embedder
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_ms / 1000
+        self._is_input_error = is_input_error
+        self._pending: list[PendingEmbedding] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+
+    async def embed(self, query: str) -> list[float]:
+        if not query.strip():
+            raise ValueError("Query for embedding is empty")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((query, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self._max_wait_seconds,
+                self._flush,
+                context=contextvars.Context(),
+            )
+
+        return await future
+
+    async def embed_batch(self, queries: list[str]) -> list[list[float]]:
+        return await self._embedder.embed_batch(queries=queries)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch = self._pending
+        self._pending = []
+        if not batch:
+            return
+
+        task = asyncio.create_task(
+            self._embed_pending(batch=batch),
+            context=contextvars.Context(),
+        )
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _embed_pending(self, batch: list[PendingEmbedding]) -> None:
+        try:
+            embeddings = await self._embed_checked(queries=[query for query, _ in batch])
+        except Exception as exception:
+            if len(batch) > 1 and self._is_rejected_input(exception):
+                await asyncio.gather(*(self._embed_pending(batch=[pending]) for pending in batch))
+                return
+
+            for _, failed_future in batch:
+                if not failed_future.done():
+                    failed_future.set_exception(exception)
+            return
+
+        for (_, pending_future), embedding in zip(batch, embeddings, strict=True):
+            if not pending_future.done():
+                pending_future.set_result(embedding)
+
+    def _is_rejected_input(self, exception: Exception) -> bool:
+        if isinstance(exception, ValueError):
+            return True
+        return self._is_input_error is not None and self._is_input_error(exception)
+
+    async def _embed_checked(self, queries: list[str]) -> list[list[float]]:
+        embeddings = await self._embedder.embed_batch(queries=queries)
+        if len(embeddings) != len(queries):
+            raise ValueError(
+                f"Embedder returned {len(embeddings)} embeddings for {len(queries)} queries",
+            )
+        return embeddings
@@ -0,0 +1,73 @@
+import asyncio
+import hashlib
+
+from structlog import get_logger
+
+from backend.application.services.cache import CacheP
+from backend.application.services.embedder import EmbedderP
+
+logger = get_logger()
+
+
+class CachedEmbedder(EmbedderP):
+    def __init__(
+        self,
+        embedder: EmbedderP,
+        cache: CacheP[list[float]],
+        namespace: str,
+    ):
+        self._embedder = embedder
+        self._cache = cache
+        self._namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    async def embed(self, query: str) -> list[float]:
+        key = self._make_key(text=query)
+
+        cached_embedding = await self._read(key=key)
+        if cached_embedding is not None:
+            self.hits += 1
+            return cached_embedding
+
+        self.misses += 1
+        embedding = await self._embedder.embed(query=query)
+        await self._write(key=key, embedding=embedding)
+
+        return embedding
+
+    async def embed_batch(self, queries: list[str]) -> list[list[float]]:
+        keys = [self._make_key(text=query) for query in queries]
+        embeddings = list(await asyncio.gather(*[self._read(key=key) for key in keys]))
+
+        missed_indices = [index for index, embedding in enumerate(embeddings) if embedding is None]
+        self.hits += len(queries) - len(missed_indices)
+        self.misses += len(missed_indices)
+
+        if missed_indices:
+            missed_embeddings = await self._embedder.embed_batch(
+                queries=[queries[index] for index in missed_indices],
+            )
+            for index, embedding in zip(missed_indices, missed_embeddings, strict=True):
+                embeddings[index] = embedding
+                await self._write(key=keys[index], embedding=embedding)
+
+        return [embedding for embedding in embeddings if embedding is not None]
+
+    async def _read(self, key: str) -> list[float] | None:
+        try:
+            return await self._cache.get(key)
+        except Exception as exception:
+            logger.warning("Embedding cache read failed", exception=str(exception))
+            return None
+
+    async def _write(self, key: str, embedding: list[float]) -> None:
+        try:
+            await self._cache.set(key, embedding)
+        except Exception as exception:
+            logger.warning("Embedding cache write failed", exception=str(exception))
+
+    def _make_key(self, text: str) -> str:
+        normalized_text = " ".join(text.split()).casefold()
+        digest = hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+        return f"{self._namespace}:{digest}"
@@ -1,7 +1,29 @@
+import asyncio
+from http import HTTPStatus
+
+import httpx
 from cohere import AsyncClientV2 as CohereClient
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from cohere.core.api_error import ApiError
 
 from backend.application.services.embedder import EmbedderP
+from backend.application.services.resilience import RETRYABLE_STATUS_CODES, ResiliencePolicy
+
+COHERE_MAX_BATCH_SIZE = 96
+
+
+def is_retryable_cohere_error(exception: BaseException) -> bool:
+    if isinstance(exception, ApiError):
+        return exception.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exception, httpx.TransportError)
+
+
+def is_cohere_input_error(exception: BaseException) -> bool:
+    """Cohere rejected the request itself, e.g. a too long or malformed text."""
+    if not isinstance(exception, ApiError) or exception.status_code is None:
+        return False
+    if exception.status_code in RETRYABLE_STATUS_CODES:
+        return False
+    return HTTPStatus.BAD_REQUEST <= exception.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
 
 
 class CohereEmbedder(EmbedderP):
@@ -11,27 +33,39 @@ class CohereEmbedder(EmbedderP):
         model: str = "embed-english-v3.0",
         input_type: str = "search_query",
         embedding_type: str = "float",
+        policy: ResiliencePolicy | None = None,
     ):
         self._client = client
         self._model = model
         self._input_type = input_type
         self._embedding_type = embedding_type
+        self._policy = policy or ResiliencePolicy(
+            name="cohere",
+            is_retryable=is_retryable_cohere_error,
+        )
 
     async def embed(self, query: str) -> list[float]:
-        return await self._make_embedding_request(text=query)
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(Exception),
-    )
-    async def _make_embedding_request(self, text: str) -> list[float]:
-        response = await self._client.embed(
-            texts=[text],
+        embeddings = await self._make_embedding_request(texts=[query])
+        return embeddings[0]
+
+    async def embed_batch(self, queries: list[str]) -> list[list[float]]:
+        chunks = [
+            queries[start : start + COHERE_MAX_BATCH_SIZE]
+            for start in range(0, len(queries), COHERE_MAX_BATCH_SIZE)
+        ]
+        chunk_embeddings = await asyncio.gather(
+            *[self._make_embedding_request(texts=chunk) for chunk in chunks],
+        )
+        return [embedding for embeddings in chunk_embeddings for embedding in embeddings]
+
+    async def _make_embedding_request(self, texts: list[str]) -> list[list[float]]:
+        response = await self._policy.call(
+            self._client.embed,
+            texts=texts,
             model=self._model,
             input_type=self._input_type,
             embedding_types=[self._embedding_type],
         )
         if response.embeddings.float_ is None:
             raise ValueError("Cohere vector embedding is None")
-        return response.embeddings.float_[0]
+        return response.embeddings.float_
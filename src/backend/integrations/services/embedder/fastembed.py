@@ -0,0 +1,43 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastembed import TextEmbedding
+
+from backend.application.services.embedder import EmbedderP
+
+
+class FastEmbedEmbedder(EmbedderP):
+    """Runs a local ONNX sentence-embedding model on CPU.
+
+    Inference is offloaded to a thread pool so it never blocks the event loop;
+    ONNX Runtime releases the GIL while the model is running.
+    """
+
+    def __init__(
+        self,
+        model: TextEmbedding,
+        executor: ThreadPoolExecutor,
+        input_type: str = "search_query",
+        batch_size: int = 32,
+    ):
+        self._model = model
+        self._executor = executor
+        self._input_type = input_type
+        self._batch_size = batch_size
+
+    async def embed(self, query: str) -> list[float]:
+        embeddings = await self.embed_batch(queries=[query])
+        return embeddings[0]
+
+    async def embed_batch(self, queries: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._embed_sync, queries)
+
+    def _embed_sync(self, texts: list[str]) -> list[list[float]]:
+        if self._input_type == "search_query":
+            embeddings = self._model.query_embed(texts, batch_size=self._batch_size)
+        elif self._input_type == "search_document":
+            embeddings = self._model.passage_embed(texts, batch_size=self._batch_size)
+        else:
+            embeddings = self._model.embed(texts, batch_size=self._batch_size)
+        return [embedding.tolist() for embedding in embeddings]
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from structlog import get_logger
+
+from backend.application.services.latency_tracker import LatencyTracker
+from backend.application.services.llm import LLMServiceP
+from backend.application.value_objects.prompt import Prompt
+
+logger = get_logger()
+
+ResultT = TypeVar("ResultT")
+
+
+class HedgedLLM(LLMServiceP):
+    """Sends a second request when the first one is slower than the observed percentile.
+
+    Whichever request answers first (for streams: produces the first token) wins and the
+    other one is cancelled. Fired and won hedges are counted to tune the cost/latency tradeoff.
+    """
+
+    def __init__(
+        self,
+        primary: LLMServiceP,
+        secondary: LLMServiceP,
+        percentile: float = 0.95,
+        initial_delay_seconds: float = 2.0,
+        min_delay_seconds: float = 0.5,
+        window_size: int = 200,
+        min_samples: int = 20,
+    ):
+        self._primary = primary
+        self._secondary = secondary
+        self._generation_parameters = primary._generation_parameters  # noqa: WPS437
+        self._generate_latencies = LatencyTracker(
+            percentile=percentile,
+            initial_delay_seconds=initial_delay_seconds,
+            min_delay_seconds=min_delay_seconds,
+            window_size=window_size,
+            min_samples=min_samples,
+        )
+        self._first_token_latencies = LatencyTracker(
+            percentile=percentile,
+            initial_delay_seconds=initial_delay_seconds,
+            min_delay_seconds=min_delay_seconds,
+            window_size=window_size,
+            min_samples=min_samples,
+        )
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    async def generate(self, prompt: Prompt) -> str:
+        started_at = time.perf_counter()
+
+        generated_text = await self._race(
+            primary=self._primary.generate(prompt=prompt),
+            secondary_factory=lambda: self._secondary.generate(prompt=prompt),
+            delay=self._generate_latencies.delay(),
+        )
+
+        self._generate_latencies.record(time.perf_counter() - started_at)
+        return generated_text
+
+    async def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]:
+        started_at = time.perf_counter()
+        primary_stream = self._primary.generate_stream(prompt=prompt)
+        secondary_stream = self._secondary.generate_stream(prompt=prompt)
+
+        try:
+            first_token, winner_stream = await self._race(
+                primary=self._read_first_token(stream=primary_stream),
+                secondary_factory=lambda: self._read_first_token(stream=secondary_stream),
+                delay=self._first_token_latencies.delay(),
+            )
+        except BaseException:
+            await self._close_streams(streams=[primary_stream, secondary_stream])
+            raise
+
+        loser_stream = secondary_stream if winner_stream is primary_stream else primary_stream
+        await self._close_streams(streams=[loser_stream])
+
+        self._first_token_latencies.record(time.perf_counter() - started_at)
+
+        if first_token is None:
+            return
+
+        yield first_token
+        async for delta in winner_stream:
+            yield delta
+
+    async def _race(
+        self,
+        primary: Awaitable[ResultT],
+        secondary_factory: Callable[[], Awaitable[ResultT]],
+        delay: float,
+    ) -> ResultT:
+        self.requests += 1
+        primary_task = asyncio.ensure_future(primary)
+
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        except BaseException:
+            # asyncio.wait leaves the awaited tasks running when the caller is cancelled
+            await self._cancel(tasks={primary_task})
+            raise
+
+        if done:
+            return primary_task.result()
+
+        self.hedges_fired += 1
+        hedge_task = asyncio.ensure_future(secondary_factory())
+
+        try:
+            winner_task = await self._wait_first_successful(tasks={primary_task, hedge_task})
+        except BaseException:
+            await self._cancel(tasks={primary_task, hedge_task})
+            raise
+
+        hedge_won = winner_task is hedge_task
+        if hedge_won:
+            self.hedges_won += 1
+        logger.info("LLM hedge fired", delay_seconds=round(delay, 3), hedge_won=hedge_won)
+
+        return winner_task.result()
+
+    async def _wait_first_successful(
+        self,
+        tasks: set[asyncio.Future[ResultT]],
+    ) -> asyncio.Future[ResultT]:
+        pending = tasks
+        winner_task = None
+        while winner_task is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner_task = next((task for task in done if task.exception() is None), None)
+            if winner_task is None and not pending:
+                # Every request failed, so the last error is the one to surface
+                winner_task = done.pop()
+
+        await self._cancel(tasks=pending)
+        return winner_task
+
+    async def _cancel(self, tasks: set[asyncio.Future[ResultT]]) -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _close_streams(self, streams: list[AsyncIterator[str]]) -> None:
+        for stream in streams:
+            await stream.aclose()  # type: ignore[attr-defined]
+
+    async def _read_first_token(
+        self,
+        stream: AsyncIterator[str],
+    ) -> tuple[str | None, AsyncIterator[str]]:
+        try:
+            return await anext(stream), stream
+        except StopAsyncIteration:
+            return None, stream
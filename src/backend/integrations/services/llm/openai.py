@@ -1,9 +1,28 @@
-from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletionUserMessageParam
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from typing import AsyncIterator
+
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    AsyncStream,
+    InternalServerError,
+    RateLimitError,
+)
+from openai.types.chat import (
+    ChatCompletionChunk,
+    ChatCompletionMessageParam,
+    ChatCompletionSystemMessageParam,
+    ChatCompletionUserMessageParam,
+)
 
 from backend.application.services.llm import LLMServiceP
+from backend.application.services.resilience import ResiliencePolicy
 from backend.application.value_objects.generation_parameters import GenerationParameters
+from backend.application.value_objects.prompt import Prompt
+from backend.integrations.services.llm.stop import StopSequenceFilter
+
+
+def is_retryable_openai_error(exception: BaseException) -> bool:
+    return isinstance(exception, (APIConnectionError, RateLimitError, InternalServerError))
 
 
 class OpenAILikeLLM(LLMServiceP):
@@ -11,27 +30,51 @@ class OpenAILikeLLM(LLMServiceP):
         self,
         client: AsyncOpenAI,
         generation_parameters: GenerationParameters,
+        policy: ResiliencePolicy | None = None,
     ):
         self._client = client
         self._generation_parameters = generation_parameters
-
-    async def generate(self, prompt: str) -> str:
-        message = ChatCompletionUserMessageParam(
-            content=prompt,
-            role="user",
+        self._policy = policy or ResiliencePolicy(
+            name="openai",
+            is_retryable=is_retryable_openai_error,
         )
-        return await self._make_completion_request(messages=[message])
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(Exception),
-    )
+    async def generate(self, prompt: Prompt) -> str:
+        return await self._make_completion_request(messages=self._make_messages(prompt=prompt))
+
+    async def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]:
+        stream = await self._make_stream_request(messages=self._make_messages(prompt=prompt))
+        stop_filter = StopSequenceFilter(stop=self._generation_parameters.stop)
+
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+
+                text = stop_filter.feed(chunk.choices[0].delta.content or "")
+                if text:
+                    yield text
+
+                if stop_filter.is_stopped:
+                    break
+
+        tail = stop_filter.flush()
+        if tail:
+            yield tail
+
+    def _make_messages(self, prompt: Prompt) -> list[ChatCompletionMessageParam]:
+        # The system prefix goes first and unchanged, so providers can serve it from cache
+        return [
+            ChatCompletionSystemMessageParam(content=prompt.prefix, role="system"),
+            ChatCompletionUserMessageParam(content=prompt.body, role="user"),
+        ]
+
     async def _make_completion_request(
         self,
-        messages: list[ChatCompletionUserMessageParam],
+        messages: list[ChatCompletionMessageParam],
     ) -> str:
-        response = await self._client.chat.completions.create(
+        response = await self._policy.call(
+            self._client.chat.completions.create,
             messages=messages,
             model=self._generation_parameters.model_name,
             max_tokens=self._generation_parameters.max_tokens,
@@ -43,3 +86,17 @@ class OpenAILikeLLM(LLMServiceP):
         if not generated_text:
             raise ValueError(f"Generated text is {generated_text}")
         return generated_text
+
+    async def _make_stream_request(
+        self,
+        messages: list[ChatCompletionMessageParam],
+    ) -> AsyncStream[ChatCompletionChunk]:
+        return await self._policy.call(
+            self._client.chat.completions.create,
+            messages=messages,
+            model=self._generation_parameters.model_name,
+            max_tokens=self._generation_parameters.max_tokens,
+            top_p=self._generation_parameters.top_p,
+            stop=[self._generation_parameters.stop],
+            stream=True,
+        )
@@ -0,0 +1,43 @@
+class StopSequenceFilter:
+    """Cuts a stream of text deltas at the first occurrence of a stop sequence.
+
+    Text that could be the beginning of the stop sequence is held back until the next
+    delta shows whether the sequence is actually completed.
+    """
+
+    def __init__(self, stop: str):
+        self._stop = stop
+        self._buffer = ""
+        self.is_stopped = False
+
+    def feed(self, delta: str) -> str:
+        if self.is_stopped:
+            return ""
+
+        if not self._stop:
+            return delta
+
+        self._buffer += delta
+
+        stop_index = self._buffer.find(self._stop)
+        if stop_index != -1:
+            self.is_stopped = True
+            text = self._buffer[:stop_index]
+            self._buffer = ""
+            return text
+
+        held_length = self._partial_stop_length()
+        text = self._buffer[: len(self._buffer) - held_length]
+        self._buffer = self._buffer[len(self._buffer) - held_length :]
+        return text
+
+    def flush(self) -> str:
+        text = self._buffer
+        self._buffer = ""
+        return text
+
+    def _partial_stop_length(self) -> int:
+        for length in range(min(len(self._stop) - 1, len(self._buffer)), 0, -1):
+            if self._buffer.endswith(self._stop[:length]):
+                return length
+        return 0
@@ -0,0 +1,213 @@
+import asyncio
+import contextlib
+import os
+from pathlib import Path
+from typing import Iterator
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily
+from prometheus_client.registry import Collector
+from structlog import get_logger
+
+from backend.application.services.metrics import MetricsP
+
+logger = get_logger()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (metric name, documentation, attribute of the counted object)
+StatsCounter = tuple[str, str, str]
+
+# prometheus_client writes samples to files in this directory when it is set before the import
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def prepare_multiprocess_dir(directory: Path) -> None:
+    """Point the workers started after this call at an emptied directory for their samples.
+
+    Files left by a previous run would be added to the new counters.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for samples_file in directory.glob("*.db"):
+        samples_file.unlink()
+    os.environ[MULTIPROCESS_DIR_ENV] = str(directory)
+
+
+def is_multiprocess() -> bool:
+    return bool(os.environ.get(MULTIPROCESS_DIR_ENV))
+
+
+class PrometheusMetrics(MetricsP):
+    """Prometheus histograms, counters and gauges kept in a registry of their own.
+
+    In multiprocess mode every worker writes its samples to `PROMETHEUS_MULTIPROC_DIR` and
+    `export` aggregates all of them, so any worker can answer a scrape. Service counters are
+    then copied into those files every `stats_sync_interval_seconds` instead of being read
+    at scrape time, because the scraped worker cannot read another worker's attributes.
+    """
+
+    def __init__(
+        self,
+        registry: CollectorRegistry | None = None,
+        multiprocess_mode: bool = False,
+        stats_sync_interval_seconds: float = 1.0,
+    ):
+        self.registry = registry or CollectorRegistry()
+        self._multiprocess_mode = multiprocess_mode
+        self._stats_sync_interval_seconds = stats_sync_interval_seconds
+        self._synced_stats: list[SyncedStats] = []
+        self._sync_task: asyncio.Task[None] | None = None
+        self._export_registry = self.registry
+        if multiprocess_mode:
+            self._export_registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(self._export_registry)
+
+        self._stage_duration = Histogram(
+            "chat_stage_duration_seconds",
+            "Duration of chat pipeline stages",
+            labelnames=("pipeline", "stage"),
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self._upstream_call_duration = Histogram(
+            "upstream_call_duration_seconds",
+            "Duration of upstream calls including retries",
+            labelnames=("upstream", "outcome"),
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self._upstream_retries = Counter(
+            "upstream_retries",
+            "Retried upstream call attempts",
+            labelnames=("upstream",),
+            registry=self.registry,
+        )
+        self._http_request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Duration of HTTP requests",
+            labelnames=("method", "path", "status_code"),
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self._http_requests_in_flight = Gauge(
+            "http_requests_in_flight",
+            "HTTP requests being processed",
+            registry=self.registry,
+            multiprocess_mode="livesum",
+        )
+
+    def observe_stage(self, pipeline: str, stage: str, duration_seconds: float) -> None:
+        self._stage_duration.labels(pipeline, stage).observe(duration_seconds)
+
+    def observe_upstream_call(
+        self,
+        upstream: str,
+        duration_seconds: float,
+        is_error: bool,
+    ) -> None:
+        outcome = "error" if is_error else "ok"
+        self._upstream_call_duration.labels(upstream, outcome).observe(duration_seconds)
+
+    def record_retry(self, upstream: str) -> None:
+        self._upstream_retries.labels(upstream).inc()
+
+    def observe_http_request(
+        self,
+        method: str,
+        path: str,
+        status_code: int,
+        duration_seconds: float,
+    ) -> None:
+        self._http_request_duration.labels(method, path, str(status_code)).observe(
+            duration_seconds,
+        )
+
+    def add_requests_in_flight(self, amount: int) -> None:
+        self._http_requests_in_flight.inc(amount)
+
+    def register_stats(self, stats_object: object, counters: list[StatsCounter]) -> None:
+        if not self._multiprocess_mode:
+            self.registry.register(StatsCollector(stats_object=stats_object, counters=counters))
+            return
+
+        for name, documentation, attribute in counters:
+            self._synced_stats.append(
+                SyncedStats(
+                    stats_object=stats_object,
+                    attribute=attribute,
+                    counter=Counter(name, documentation, registry=self.registry),
+                ),
+            )
+
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_stats_periodically())
+
+    def export(self) -> bytes:
+        return generate_latest(self._export_registry)
+
+    def sync_stats(self) -> None:
+        for synced_stats in self._synced_stats:
+            synced_stats.sync()
+
+    async def close(self) -> None:
+        if not self._multiprocess_mode:
+            return
+
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sync_task
+
+        self.sync_stats()
+        # Drops the in-flight gauge of this worker, its counters and histograms stay summed
+        multiprocess.mark_process_dead(os.getpid())
+
+    async def _sync_stats_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._stats_sync_interval_seconds)
+            try:
+                self.sync_stats()
+            except Exception as exception:
+                logger.exception("Service counters sync failed", exception=str(exception))
+
+
+class StatsCollector(Collector):
+    """Exposes the plain integer counters services already keep, read only at scrape time.
+
+    The hot path keeps doing `self.hits += 1` and pays nothing for the export.
+    """
+
+    def __init__(self, stats_object: object, counters: list[StatsCounter]):
+        self._stats_object = stats_object
+        self._counters = counters
+
+    def collect(self) -> Iterator[CounterMetricFamily]:
+        for name, documentation, attribute in self._counters:
+            yield CounterMetricFamily(
+                name,
+                documentation,
+                value=getattr(self._stats_object, attribute),
+            )
+
+
+class SyncedStats:
+    """Copies the growth of a plain integer counter into a Prometheus counter."""
+
+    def __init__(self, stats_object: object, attribute: str, counter: Counter):
+        self._stats_object = stats_object
+        self._attribute = attribute
+        self._counter = counter
+        self._synced_value = 0
+
+    def sync(self) -> None:
+        value = getattr(self._stats_object, self._attribute)
+        if value > self._synced_value:
+            self._counter.inc(value - self._synced_value)
+        self._synced_value = value
@@ -1,12 +1,20 @@
 from pathlib import Path
 
 from mako.lookup import TemplateLookup  # type: ignore
+from mako.template import Template  # type: ignore
 
 
 class BaseMakoPromptBuilder:
-    def __init__(self, templates_dir: str | Path, template_name: str):
+    def __init__(
+        self,
+        templates_dir: str | Path,
+        template_name: str,
+        module_directory: str | Path | None = None,
+        hot_reload: bool = False,
+    ):
         self.templates_dir = Path(templates_dir)
         self.template_name = template_name
+        self.hot_reload = hot_reload
 
         if not self.templates_dir.exists():
             raise FileNotFoundError(f"Templates directory not found: {templates_dir}")
@@ -15,4 +23,15 @@ class BaseMakoPromptBuilder:
         if not template_path.exists():
             raise FileNotFoundError(f"Template file not found: {template_path}")
 
-        self.lookup = TemplateLookup(directories=[str(self.templates_dir)], input_encoding="utf-8")
+        self.lookup = TemplateLookup(
+            directories=[str(self.templates_dir)],
+            input_encoding="utf-8",
+            module_directory=str(module_directory) if module_directory else None,
+            filesystem_checks=hot_reload,
+        )
+        self.template = self.lookup.get_template(self.template_name)
+
+    def load_template(self) -> Template:
+        if self.hot_reload:
+            return self.lookup.get_template(self.template_name)
+        return self.template
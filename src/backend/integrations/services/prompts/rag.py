@@ -1,17 +1,77 @@
+from pathlib import Path
+
+from backend.application.services.cache import CacheP
 from backend.application.services.prompt import PromptBuilderServiceP
+from backend.application.value_objects.prompt import Prompt
 from backend.application.value_objects.prompts_data.rag import RAGPromptData
 from backend.domain.value_objects.chat_actor import ChatActor
+from backend.integrations.services.cache.memory import InMemoryLRUCache
 from backend.integrations.services.prompts.mako import BaseMakoPromptBuilder
 
 
 class MakoRAGPromptBuilder(PromptBuilderServiceP[RAGPromptData], BaseMakoPromptBuilder):
-    async def make(self, prompt_data: RAGPromptData) -> str:
-        template = self.lookup.get_template(self.template_name)
+    """Renders the `prefix` and `body` defs of a RAG template.
+
+    The prefix depends only on the character and the user, so it is memoized per pair and
+    stays byte-identical between requests, which lets the LLM provider reuse its prompt cache.
+    """
+
+    def __init__(
+        self,
+        templates_dir: str | Path,
+        template_name: str,
+        module_directory: str | Path | None = None,
+        hot_reload: bool = False,
+        prefix_cache: CacheP[str] | None = None,
+    ):
+        BaseMakoPromptBuilder.__init__(  # noqa: WPS609
+            self,
+            templates_dir=templates_dir,
+            template_name=template_name,
+            module_directory=module_directory,
+            hot_reload=hot_reload,
+        )
+        self.prefix_cache: CacheP[str] = prefix_cache or InMemoryLRUCache()
+
+    async def make(self, prompt_data: RAGPromptData) -> Prompt:
+        return Prompt(
+            prefix=await self.make_prefix(prompt_data=prompt_data),
+            body=self._render_def(
+                def_name="body",
+                user=prompt_data.user,
+                character=prompt_data.character,
+                messages=prompt_data.messages,
+                search_results=prompt_data.search_results,
+                history_summary=prompt_data.history_summary,
+            ),
+        )
 
-        return template.render(
+    async def make_prefix(self, prompt_data: RAGPromptData) -> str:
+        if self.hot_reload:
+            return self._render_prefix(prompt_data=prompt_data)
+
+        key = self._make_prefix_key(prompt_data=prompt_data)
+        prefix = await self.prefix_cache.get(key)
+        if prefix is None:
+            prefix = self._render_prefix(prompt_data=prompt_data)
+            await self.prefix_cache.set(key, prefix)
+        return prefix
+
+    def _make_prefix_key(self, prompt_data: RAGPromptData) -> str:
+        character = prompt_data.character
+        user = prompt_data.user
+        return "\x1f".join(
+            (character.name, str(character.age), character.description, user.name, str(user.age)),
+        )
+
+    def _render_prefix(self, prompt_data: RAGPromptData) -> str:
+        return self._render_def(
+            def_name="prefix",
             user=prompt_data.user,
             character=prompt_data.character,
-            messages=prompt_data.messages,
-            search_results=prompt_data.search_results,
-            ChatActor=ChatActor,
         )
+
+    def _render_def(self, def_name: str, **kwargs: object) -> str:
+        template = self.load_template()
+        rendered_text: str = template.get_def(def_name).render(ChatActor=ChatActor, **kwargs)
+        return rendered_text.strip()
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from backend.application.services.latency_tracker import LatencyTracker
+from backend.application.services.reranker import RerankerP
+from backend.application.services.resilience import DeadlineExceededError, remaining_seconds
+from backend.application.value_objects.search_result import SearchResult
+
+
+class BudgetedReranker(RerankerP):
+    """Refuses to rerank when the observed latency would not fit into the remaining deadline.
+
+    The call itself is cut at the remaining deadline or the timeout, whichever comes first.
+    Skipped calls raise DeadlineExceededError, so the caller can keep the vector order.
+    """
+
+    def __init__(
+        self,
+        reranker: RerankerP,
+        timeout_seconds: float | None = None,
+        latency_percentile: float = 0.9,
+        window_size: int = 200,
+        min_samples: int = 20,
+    ):
+        self._reranker = reranker
+        self._timeout_seconds = timeout_seconds
+        self._latencies = LatencyTracker(
+            percentile=latency_percentile,
+            initial_delay_seconds=0,
+            min_delay_seconds=0,
+            window_size=window_size,
+            min_samples=min_samples,
+        )
+        self.reranked = 0
+        self.skipped = 0
+
+    async def rerank(
+        self,
+        query: str,
+        search_results: list[SearchResult],
+    ) -> list[SearchResult]:
+        timeout = self._timeout_seconds
+        remaining = remaining_seconds()
+        if remaining is not None:
+            if remaining <= self._latencies.delay():
+                self.skipped += 1
+                raise DeadlineExceededError("Reranking would not fit into the request deadline")
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        started_at = time.perf_counter()
+        try:
+            reranked_results = await asyncio.wait_for(
+                self._reranker.rerank(query=query, search_results=search_results),
+                timeout=timeout,
+            )
+        except TimeoutError:
+            # A timed out call still tells how long reranking takes at least
+            self._latencies.record(time.perf_counter() - started_at)
+            self.skipped += 1
+            raise
+
+        self._latencies.record(time.perf_counter() - started_at)
+        self.reranked += 1
+        return reranked_results
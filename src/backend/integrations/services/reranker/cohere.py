@@ -0,0 +1,48 @@
+from cohere import AsyncClientV2 as CohereClient
+
+from backend.application.services.reranker import RerankerP
+from backend.application.services.resilience import ResiliencePolicy
+from backend.application.value_objects.search_result import SearchResult
+from backend.integrations.services.embedder.cohere import is_retryable_cohere_error
+
+
+class CohereReranker(RerankerP):
+    """Reranks with the Cohere rerank API or any server compatible with it."""
+
+    def __init__(
+        self,
+        client: CohereClient,
+        model: str = "rerank-english-v3.0",
+        policy: ResiliencePolicy | None = None,
+    ):
+        self._client = client
+        self._model = model
+        self._policy = policy or ResiliencePolicy(
+            name="cohere_rerank",
+            is_retryable=is_retryable_cohere_error,
+        )
+
+    async def rerank(
+        self,
+        query: str,
+        search_results: list[SearchResult],
+    ) -> list[SearchResult]:
+        if not search_results:
+            return []
+
+        response = await self._policy.call(
+            self._client.rerank,
+            model=self._model,
+            query=query,
+            documents=[search_result.content.text for search_result in search_results],
+        )
+        return [
+            search_results[rerank_result.index].model_copy(
+                update={"relevance_score": rerank_result.relevance_score},
+            )
+            for rerank_result in sorted(
+                response.results,
+                key=lambda rerank_result: rerank_result.relevance_score,
+                reverse=True,
+            )
+        ]
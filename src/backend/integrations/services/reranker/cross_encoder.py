@@ -0,0 +1,54 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastembed.rerank.cross_encoder import TextCrossEncoder
+
+from backend.application.services.reranker import RerankerP
+from backend.application.value_objects.search_result import SearchResult
+
+
+class CrossEncoderReranker(RerankerP):
+    """Scores query-fact pairs with a local ONNX cross-encoder on CPU.
+
+    All candidates of a query are scored in batches in a thread pool, so the event loop
+    keeps serving other requests while the model runs.
+    """
+
+    def __init__(
+        self,
+        model: TextCrossEncoder,
+        executor: ThreadPoolExecutor,
+        batch_size: int = 32,
+    ):
+        self._model = model
+        self._executor = executor
+        self._batch_size = batch_size
+
+    async def rerank(
+        self,
+        query: str,
+        search_results: list[SearchResult],
+    ) -> list[SearchResult]:
+        if not search_results:
+            return []
+
+        loop = asyncio.get_running_loop()
+        scores = await loop.run_in_executor(
+            self._executor,
+            self._score_sync,
+            query,
+            [search_result.content.text for search_result in search_results],
+        )
+        reranked_results = [
+            search_result.model_copy(update={"relevance_score": score})
+            for search_result, score in zip(search_results, scores, strict=True)
+        ]
+        return sorted(reranked_results, key=lambda result: result.relevance_score, reverse=True)
+
+    def _score_sync(self, query: str, texts: list[str]) -> list[float]:
+        return [
+            float(score)
+            for score in self._model.rerank(
+                query=query, documents=texts, batch_size=self._batch_size
+            )
+        ]
@@ -0,0 +1,54 @@
+import re
+import zlib
+from collections import Counter
+
+from backend.application.services.sparse_encoder import SparseEncoderP
+from backend.application.value_objects.sparse_vector import SparseVector
+
+TOKEN_PATTERN = re.compile(r"\w+")
+INDEX_MASK = 0x7FFFFFFF
+
+
+class BM25SparseEncoder(SparseEncoderP):
+    """Hashed BM25 term weights without a vocabulary.
+
+    Documents get the saturated term frequency and queries a unit weight per term. The IDF
+    factor is left to the storage (Qdrant's IDF modifier), which sees the whole collection.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        length_normalization: float = 0.75,
+        avg_doc_length: float = 8.0,
+    ):
+        self._k1 = k1
+        self._length_normalization = length_normalization
+        self._avg_doc_length = avg_doc_length
+
+    def encode_document(self, text: str) -> SparseVector:
+        term_counts = Counter(self._hash_tokens(text=text))
+        doc_length = sum(term_counts.values())
+        relative_length = doc_length / self._avg_doc_length
+        length_norm = self._k1 * (
+            1 - self._length_normalization + self._length_normalization * relative_length
+        )
+
+        indices = sorted(term_counts)
+        return SparseVector(
+            indices=indices,
+            values=[
+                term_counts[index] * (self._k1 + 1) / (term_counts[index] + length_norm)
+                for index in indices
+            ],
+        )
+
+    def encode_query(self, text: str) -> SparseVector:
+        indices = sorted(set(self._hash_tokens(text=text)))
+        return SparseVector(indices=indices, values=[1.0 for _ in indices])
+
+    def _hash_tokens(self, text: str) -> list[int]:
+        return [
+            zlib.crc32(token.encode("utf-8")) & INDEX_MASK
+            for token in TOKEN_PATTERN.findall(text.casefold())
+        ]
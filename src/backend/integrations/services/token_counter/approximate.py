@@ -0,0 +1,13 @@
+from backend.application.services.token_counter import TokenCounterP
+
+
+class ApproximateTokenCounter(TokenCounterP):
+    """Estimates tokens from the text length, for models without a local tokenizer."""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self._chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return int(len(text) / self._chars_per_token) + 1
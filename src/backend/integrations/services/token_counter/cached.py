@@ -0,0 +1,31 @@
+from collections import OrderedDict
+
+from backend.application.services.token_counter import TokenCounterP
+
+
+class CachedTokenCounter(TokenCounterP):
+    """Remembers token counts of recent texts, so the history of a dialogue is tokenized once."""
+
+    def __init__(self, token_counter: TokenCounterP, max_size: int = 8192):
+        if max_size <= 0:
+            raise ValueError(f"Cache max size must be positive, got {max_size}")
+
+        self._token_counter = token_counter
+        self._max_size = max_size
+        self._counts: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, text: str) -> int:
+        num_tokens = self._counts.get(text)
+        if num_tokens is not None:
+            self.hits += 1
+            self._counts.move_to_end(text)
+            return num_tokens
+
+        self.misses += 1
+        num_tokens = self._token_counter.count(text)
+        self._counts[text] = num_tokens
+        while len(self._counts) > self._max_size:
+            self._counts.popitem(last=False)
+        return num_tokens
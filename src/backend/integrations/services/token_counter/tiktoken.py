@@ -0,0 +1,18 @@
+from typing import Any
+
+from backend.application.services.token_counter import TokenCounterP
+
+
+class TiktokenCounter(TokenCounterP):
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        self._encoding = _load_encoding(encoding_name=encoding_name)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def _load_encoding(encoding_name: str) -> Any:
+    # tiktoken is an optional dependency, so it is imported only when selected
+    import tiktoken  # noqa: WPS433
+
+    return tiktoken.get_encoding(encoding_name)
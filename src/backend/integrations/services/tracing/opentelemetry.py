@@ -0,0 +1,22 @@
+from contextlib import AbstractContextManager
+from typing import Any
+
+from backend.application.services.tracing import TracerP
+
+
+class OpenTelemetryTracer(TracerP):
+    """Opens OpenTelemetry spans; without a configured SDK they are no-ops."""
+
+    def __init__(self, name: str = "backend"):
+        self._tracer = _get_tracer(name=name)
+
+    def span(self, name: str) -> AbstractContextManager[None]:
+        span_context: AbstractContextManager[None] = self._tracer.start_as_current_span(name)
+        return span_context
+
+
+def _get_tracer(name: str) -> Any:
+    # opentelemetry is an optional dependency, so it is imported only when enabled
+    from opentelemetry import trace  # noqa: WPS433
+
+    return trace.get_tracer(name)
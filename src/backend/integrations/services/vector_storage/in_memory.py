@@ -0,0 +1,217 @@
+import asyncio
+import fcntl
+import time
+from pathlib import Path
+
+from qdrant_client import AsyncQdrantClient
+from structlog import get_logger
+
+from backend.application.services.vector_storage import VectorStorageP
+from backend.application.value_objects.hybrid_search_results import HybridSearchResults
+from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.sparse_vector import SparseVector
+from backend.application.value_objects.tenant_scope import TenantScope
+from backend.integrations.services.vector_storage.snapshot import (
+    CURRENT_LINK,
+    VectorSnapshot,
+    export_qdrant_snapshot,
+)
+
+logger = get_logger()
+
+EXPORT_LOCK_FILE = ".export.lock"
+NANOSECONDS_IN_SECOND = 1_000_000_000
+
+
+class InMemoryVectorStorage(VectorStorageP):
+    """Searches a local snapshot of a Qdrant collection without a network round trip.
+
+    The snapshot is exported on first use when missing and, with a refresh interval, re-exported
+    in the background. Only one process exports at a time: on a cold start the others wait for
+    its snapshot, and a refresh is skipped when another process published one within the interval.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        client: AsyncQdrantClient,
+        collection_name: str,
+        snapshot_dir: str,
+        quantize: bool = False,
+        hnsw_threshold: int | None = 50000,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 100,
+        hnsw_ef: int | None = 64,
+        refresh_interval_seconds: float | None = None,
+    ):
+        self._client = client
+        self._collection_name = collection_name
+        self._snapshot_root = Path(snapshot_dir) / collection_name
+        self._quantize = quantize
+        self._hnsw_threshold = hnsw_threshold
+        self._hnsw_m = hnsw_m
+        self._hnsw_ef_construct = hnsw_ef_construct
+        self._hnsw_ef = hnsw_ef
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._snapshot: VectorSnapshot | None = None
+        self._snapshot_path: Path | None = None
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    async def find_nearest(
+        self,
+        query_embedding: list[float],
+        num_search_results: int,
+        tenant_scope: TenantScope | None = None,
+    ) -> list[SearchResult]:
+        snapshot = await self._get_snapshot()
+        return snapshot.search(
+            query_embedding=query_embedding,
+            limit=num_search_results,
+            tenant_scope=tenant_scope,
+        )
+
+    async def find_nearest_batch(
+        self,
+        query_embeddings: list[list[float]],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[list[SearchResult]]:
+        if tenant_scopes is None:
+            tenant_scopes = [None for _ in query_embeddings]
+
+        snapshot = await self._get_snapshot()
+        return [
+            snapshot.search(
+                query_embedding=query_embedding,
+                limit=num_search_results,
+                tenant_scope=tenant_scope,
+            )
+            for query_embedding, tenant_scope in zip(query_embeddings, tenant_scopes, strict=True)
+        ]
+
+    async def find_nearest_hybrid(
+        self,
+        query_embedding: list[float],
+        query_sparse_vector: SparseVector,
+        num_search_results: int,
+        tenant_scope: TenantScope | None = None,
+    ) -> HybridSearchResults:
+        # The snapshot holds dense vectors only, so the sparse side never contributes
+        return HybridSearchResults(
+            dense_results=await self.find_nearest(
+                query_embedding=query_embedding,
+                num_search_results=num_search_results,
+                tenant_scope=tenant_scope,
+            ),
+            sparse_results=[],
+        )
+
+    async def find_nearest_hybrid_batch(
+        self,
+        query_embeddings: list[list[float]],
+        query_sparse_vectors: list[SparseVector],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[HybridSearchResults]:
+        dense_results_batch = await self.find_nearest_batch(
+            query_embeddings=query_embeddings,
+            num_search_results=num_search_results,
+            tenant_scopes=tenant_scopes,
+        )
+        return [
+            HybridSearchResults(dense_results=dense_results, sparse_results=[])
+            for dense_results in dense_results_batch
+        ]
+
+    async def refresh(self) -> None:
+        await self._export(max_age_seconds=0)
+        await self._reload()
+
+    async def _get_snapshot(self) -> VectorSnapshot:
+        if self._snapshot is None:
+            async with self._load_lock:
+                if self._snapshot is None:
+                    await self._load_initial()
+
+        if self._refresh_interval_seconds is not None and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+        if self._snapshot is None:
+            raise RuntimeError(f"No vector snapshot in {self._snapshot_root}")
+        return self._snapshot
+
+    async def _load_initial(self) -> None:
+        if not (self._snapshot_root / CURRENT_LINK).exists():
+            await self._export(wait=True)
+        await self._reload()
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval_seconds or 0)
+            try:
+                await self._export(max_age_seconds=self._refresh_interval_seconds)
+                await self._reload()
+            except Exception as exception:
+                logger.exception("Vector snapshot refresh failed", exception=str(exception))
+
+    async def _export(self, max_age_seconds: float | None = None, wait: bool = False) -> None:
+        """Export unless a snapshot younger than `max_age_seconds` exists, any age when None.
+
+        With `wait` the export lock is awaited, otherwise a running export elsewhere is enough.
+        """
+        self._snapshot_root.mkdir(parents=True, exist_ok=True)
+        with open(self._snapshot_root / EXPORT_LOCK_FILE, "w") as lock_file:
+            if wait:
+                await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+            else:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    logger.info("Vector snapshot is being exported by another process")
+                    return
+
+            # Checked under the lock, so a snapshot published while waiting is picked up
+            snapshot_age = self._snapshot_age_seconds()
+            if snapshot_age is not None and (
+                max_age_seconds is None or snapshot_age < max_age_seconds
+            ):
+                logger.info("Vector snapshot is fresh", age_seconds=round(snapshot_age, 1))
+                return
+
+            await export_qdrant_snapshot(
+                client=self._client,
+                collection_name=self._collection_name,
+                snapshot_root=self._snapshot_root,
+                quantize=self._quantize,
+                hnsw_threshold=self._hnsw_threshold,
+                hnsw_m=self._hnsw_m,
+                hnsw_ef_construct=self._hnsw_ef_construct,
+            )
+
+    def _snapshot_age_seconds(self) -> float | None:
+        current_link = self._snapshot_root / CURRENT_LINK
+        if not current_link.exists():
+            return None
+        # Versions are named after their export time in nanoseconds
+        return (time.time_ns() - int(current_link.resolve().name)) / NANOSECONDS_IN_SECOND
+
+    async def _reload(self) -> None:
+        current_link = self._snapshot_root / CURRENT_LINK
+        if not current_link.exists():
+            return
+
+        snapshot_path = current_link.resolve()
+        if snapshot_path == self._snapshot_path:
+            return
+
+        self._snapshot = await asyncio.to_thread(
+            VectorSnapshot.load,
+            path=snapshot_path,
+            hnsw_ef=self._hnsw_ef,
+        )
+        self._snapshot_path = snapshot_path
+        logger.info(
+            "Loaded vector snapshot",
+            path=str(snapshot_path),
+            num_facts=len(self._snapshot),
+        )
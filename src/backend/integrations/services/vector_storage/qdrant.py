@@ -1,32 +1,192 @@
 from qdrant_client import AsyncQdrantClient
-from qdrant_client.models import ScoredPoint
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from qdrant_client.http import models
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
 
+from backend.application.services.resilience import RETRYABLE_STATUS_CODES, ResiliencePolicy
 from backend.application.services.vector_storage import VectorStorageP
+from backend.application.value_objects.hybrid_search_results import HybridSearchResults
 from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.sparse_vector import SparseVector
+from backend.application.value_objects.tenant_scope import TenantScope
 from backend.domain.entities.fact import Fact
 from backend.domain.value_objects.chat_actor import ChatActor
 
+USER_ID_FIELD = "user_id"
+CHARACTER_ID_FIELD = "character_id"
+SPARSE_VECTOR_NAME = "bm25"
+
+
+def is_retryable_qdrant_error(exception: BaseException) -> bool:
+    if isinstance(exception, UnexpectedResponse):
+        return exception.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exception, ResponseHandlingException)
+
+
+def make_tenant_filter(tenant_scope: TenantScope | None) -> models.Filter | None:
+    """Restrict a search to the facts the scope may read, None searches the whole collection.
+
+    A missing id matches only facts without that id, so an anonymous user never sees another
+    user's facts.
+    """
+    if tenant_scope is None:
+        return None
+
+    user_condition: models.Condition = _is_empty(USER_ID_FIELD)
+    if tenant_scope.user_id is not None:
+        user_condition = models.FieldCondition(
+            key=USER_ID_FIELD,
+            match=models.MatchValue(value=tenant_scope.user_id),
+        )
+
+    # Facts without a character are shared by all characters of the user
+    character_condition: models.Condition = _is_empty(CHARACTER_ID_FIELD)
+    if tenant_scope.character_id is not None:
+        character_condition = models.Filter(
+            should=[
+                models.FieldCondition(
+                    key=CHARACTER_ID_FIELD,
+                    match=models.MatchValue(value=tenant_scope.character_id),
+                ),
+                character_condition,
+            ],
+        )
+
+    return models.Filter(must=[user_condition, character_condition])
+
+
+def _is_empty(field: str) -> models.IsEmptyCondition:
+    return models.IsEmptyCondition(is_empty=models.PayloadField(key=field))
+
 
 class QdrantVectorStorage(VectorStorageP):
     def __init__(
         self,
         client: AsyncQdrantClient,
         collection_name: str,
+        policy: ResiliencePolicy | None = None,
+        search_params: models.SearchParams | None = None,
     ):
         self._client = client
         self._collection_name = collection_name
+        self._search_params = search_params
+        self._policy = policy or ResiliencePolicy(
+            name="qdrant",
+            is_retryable=is_retryable_qdrant_error,
+        )
 
     async def find_nearest(
         self,
         query_embedding: list[float],
         num_search_results: int,
+        tenant_scope: TenantScope | None = None,
     ) -> list[SearchResult]:
         points = await self._query_nearest_points(
             query_embedding=query_embedding,
             limit=num_search_results,
+            query_filter=make_tenant_filter(tenant_scope=tenant_scope),
         )
+        return self._to_search_results(points=points)
+
+    async def find_nearest_batch(
+        self,
+        query_embeddings: list[list[float]],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[list[SearchResult]]:
+        if not query_embeddings:
+            return []
+
+        if tenant_scopes is None:
+            tenant_scopes = [None for _ in query_embeddings]
+
+        responses = await self._policy.call(
+            self._client.query_batch_points,
+            collection_name=self._collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=query_embedding,
+                    filter=make_tenant_filter(tenant_scope=tenant_scope),
+                    limit=num_search_results,
+                    params=self._search_params,
+                    with_payload=True,
+                )
+                for query_embedding, tenant_scope in zip(
+                    query_embeddings, tenant_scopes, strict=True
+                )
+            ],
+        )
+        return [self._to_search_results(points=response.points) for response in responses]
+
+    async def find_nearest_hybrid(
+        self,
+        query_embedding: list[float],
+        query_sparse_vector: SparseVector,
+        num_search_results: int,
+        tenant_scope: TenantScope | None = None,
+    ) -> HybridSearchResults:
+        hybrid_results = await self.find_nearest_hybrid_batch(
+            query_embeddings=[query_embedding],
+            query_sparse_vectors=[query_sparse_vector],
+            num_search_results=num_search_results,
+            tenant_scopes=[tenant_scope],
+        )
+        return hybrid_results[0]
+
+    async def find_nearest_hybrid_batch(
+        self,
+        query_embeddings: list[list[float]],
+        query_sparse_vectors: list[SparseVector],
+        num_search_results: int,
+        tenant_scopes: list[TenantScope | None] | None = None,
+    ) -> list[HybridSearchResults]:
+        if not query_embeddings:
+            return []
+
+        if tenant_scopes is None:
+            tenant_scopes = [None for _ in query_embeddings]
+
+        # Dense and sparse requests for every query share one round trip
+        requests = []
+        for query_embedding, query_sparse_vector, tenant_scope in zip(
+            query_embeddings, query_sparse_vectors, tenant_scopes, strict=True
+        ):
+            query_filter = make_tenant_filter(tenant_scope=tenant_scope)
+            requests.append(
+                models.QueryRequest(
+                    query=query_embedding,
+                    filter=query_filter,
+                    limit=num_search_results,
+                    params=self._search_params,
+                    with_payload=True,
+                ),
+            )
+            requests.append(
+                models.QueryRequest(
+                    query=models.SparseVector(
+                        indices=query_sparse_vector.indices,
+                        values=query_sparse_vector.values,
+                    ),
+                    using=SPARSE_VECTOR_NAME,
+                    filter=query_filter,
+                    limit=num_search_results,
+                    with_payload=True,
+                ),
+            )
+
+        responses = await self._policy.call(
+            self._client.query_batch_points,
+            collection_name=self._collection_name,
+            requests=requests,
+        )
+        return [
+            HybridSearchResults(
+                dense_results=self._to_search_results(points=dense_response.points),
+                sparse_results=self._to_search_results(points=sparse_response.points),
+            )
+            for dense_response, sparse_response in zip(responses[::2], responses[1::2], strict=True)
+        ]
 
+    def _to_search_results(self, points: list[models.ScoredPoint]) -> list[SearchResult]:
         results = []
         for hit in points:
             payload = hit.payload or {}
@@ -38,6 +198,8 @@ class QdrantVectorStorage(VectorStorageP):
                 fact = Fact(
                     owner=ChatActor(payload.get("owner", ChatActor.USER.value)),
                     text=text,
+                    user_id=payload.get(USER_ID_FIELD),
+                    character_id=payload.get(CHARACTER_ID_FIELD),
                 )
             except (ValueError, TypeError):
                 continue
@@ -48,20 +210,19 @@ class QdrantVectorStorage(VectorStorageP):
 
         return results
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(Exception),
-    )
     async def _query_nearest_points(
         self,
         query_embedding: list[float],
         limit: int,
-    ) -> list[ScoredPoint]:
-        response = await self._client.query_points(
+        query_filter: models.Filter | None = None,
+    ) -> list[models.ScoredPoint]:
+        response = await self._policy.call(
+            self._client.query_points,
             collection_name=self._collection_name,
             query=query_embedding,
+            query_filter=query_filter,
             limit=limit,
+            search_params=self._search_params,
             with_payload=True,
         )
         return response.points
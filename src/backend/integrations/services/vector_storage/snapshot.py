@@ -0,0 +1,310 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from qdrant_client import AsyncQdrantClient
+from structlog import get_logger
+
+from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.tenant_scope import TenantScope
+from backend.domain.entities.fact import Fact
+from backend.domain.value_objects.chat_actor import ChatActor
+from backend.integrations.services.vector_storage.qdrant import (
+    CHARACTER_ID_FIELD,
+    USER_ID_FIELD,
+)
+
+logger = get_logger()
+
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+FACTS_FILE = "facts.json"
+HNSW_FILE = "hnsw.bin"
+CURRENT_LINK = "current"
+INT8_MAX = 127
+SCROLL_PAGE_SIZE = 1024
+KEPT_VERSIONS = 2
+
+
+class VectorSnapshot:
+    """Normalized fact embeddings memory-mapped from disk, so worker processes share pages.
+
+    Vectors are float32 or per-row scaled int8. Unfiltered queries above the size threshold
+    go to an HNSW index saved next to the vectors; everything else is an exact scan.
+    """
+
+    def __init__(
+        self,
+        vectors: NDArray[np.float32] | NDArray[np.int8],
+        scales: NDArray[np.float32] | None,
+        facts: list[Fact],
+        hnsw_index: Any | None = None,
+        hnsw_ef: int | None = None,
+    ):
+        self._vectors = vectors
+        self._scales = scales
+        self._facts = facts
+        self._hnsw_index = hnsw_index
+        self._user_ids = np.array([fact.user_id or "" for fact in facts], dtype=str)
+        self._character_ids = np.array([fact.character_id or "" for fact in facts], dtype=str)
+        if hnsw_index is not None and hnsw_ef is not None:
+            hnsw_index.set_ef(hnsw_ef)
+
+    def __len__(self) -> int:
+        return len(self._facts)
+
+    @classmethod
+    def load(cls, path: Path, hnsw_ef: int | None = None) -> "VectorSnapshot":
+        vectors = np.load(path / VECTORS_FILE, mmap_mode="r")
+        scales = None
+        if (path / SCALES_FILE).exists():
+            scales = np.load(path / SCALES_FILE)
+
+        facts = [Fact.model_validate(fact) for fact in json.loads((path / FACTS_FILE).read_text())]
+
+        hnsw_index = None
+        if (path / HNSW_FILE).exists():
+            hnsw_index = _load_hnsw_index(path=path / HNSW_FILE, dimension=vectors.shape[1])
+
+        return cls(
+            vectors=vectors,
+            scales=scales,
+            facts=facts,
+            hnsw_index=hnsw_index,
+            hnsw_ef=hnsw_ef,
+        )
+
+    def search(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        tenant_scope: TenantScope | None = None,
+    ) -> list[SearchResult]:
+        if not self._facts:
+            return []
+
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+        candidate_indices = self._filter(tenant_scope=tenant_scope)
+
+        if candidate_indices is None and self._hnsw_index is not None:
+            labels, distances = self._hnsw_index.knn_query(query, k=min(limit, len(self._facts)))
+            # Inner-product space reports 1 - similarity as the distance
+            return self._to_search_results(indices=labels[0], scores=1 - distances[0])
+
+        if candidate_indices is None:
+            candidate_indices = np.arange(len(self._facts))
+        if not candidate_indices.size:
+            return []
+
+        scores = self._score(indices=candidate_indices, query=query)
+        top_positions = _top_k(scores=scores, limit=limit)
+        return self._to_search_results(
+            indices=candidate_indices[top_positions],
+            scores=scores[top_positions],
+        )
+
+    def _filter(self, tenant_scope: TenantScope | None) -> NDArray[np.intp] | None:
+        if tenant_scope is None:
+            return None
+
+        # Same rules as make_tenant_filter, a missing id matches only facts without one
+        mask = self._user_ids == (tenant_scope.user_id or "")
+        character_mask = self._character_ids == ""
+        if tenant_scope.character_id is not None:
+            character_mask |= self._character_ids == tenant_scope.character_id
+        return np.flatnonzero(mask & character_mask)
+
+    def _score(self, indices: NDArray[np.intp], query: NDArray[np.float32]) -> NDArray[np.float32]:
+        if len(indices) == len(self._facts):
+            vectors = self._vectors
+        else:
+            vectors = self._vectors[indices]
+
+        scores = np.asarray(vectors @ query, dtype=np.float32)
+        if self._scales is not None:
+            scores *= self._scales[indices] / INT8_MAX
+        return scores
+
+    def _to_search_results(
+        self,
+        indices: NDArray[Any],
+        scores: NDArray[Any],
+    ) -> list[SearchResult]:
+        return [
+            SearchResult(content=self._facts[int(index)], relevance_score=float(score))
+            for index, score in zip(indices, scores, strict=True)
+        ]
+
+
+async def export_qdrant_snapshot(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    snapshot_root: Path,
+    quantize: bool = False,
+    hnsw_threshold: int | None = None,
+    hnsw_m: int = 16,
+    hnsw_ef_construct: int = 100,
+) -> Path:
+    vectors, facts = await _scroll_collection(client=client, collection_name=collection_name)
+
+    version_path = snapshot_root / "versions" / str(time.time_ns())
+    version_path.mkdir(parents=True)
+
+    _save_vectors(vectors=vectors, version_path=version_path, quantize=quantize)
+    (version_path / FACTS_FILE).write_text(
+        json.dumps([fact.model_dump(mode="json") for fact in facts]),
+    )
+
+    if hnsw_threshold is not None and len(facts) >= hnsw_threshold:
+        await asyncio.to_thread(
+            _build_hnsw_index,
+            vectors=vectors,
+            path=version_path / HNSW_FILE,
+            hnsw_m=hnsw_m,
+            hnsw_ef_construct=hnsw_ef_construct,
+        )
+
+    _publish(snapshot_root=snapshot_root, version_path=version_path)
+
+    logger.info(
+        "Exported vector snapshot",
+        collection_name=collection_name,
+        num_facts=len(facts),
+        path=str(version_path),
+    )
+    return version_path
+
+
+async def _scroll_collection(
+    client: AsyncQdrantClient,
+    collection_name: str,
+) -> tuple[NDArray[np.float32], list[Fact]]:
+    rows: list[list[float]] = []
+    facts: list[Fact] = []
+    offset = None
+
+    while True:
+        points, offset = await client.scroll(
+            collection_name=collection_name,
+            limit=SCROLL_PAGE_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        for point in points:
+            payload = point.payload or {}
+            # Collections with sparse vectors return the dense one under the default name
+            vector = point.vector.get("") if isinstance(point.vector, dict) else point.vector
+            if not payload.get("text") or not isinstance(vector, list):
+                continue
+            rows.append(vector)  # type: ignore[arg-type]
+            facts.append(
+                Fact(
+                    owner=ChatActor(payload.get("owner", ChatActor.USER.value)),
+                    text=payload["text"],
+                    user_id=payload.get(USER_ID_FIELD),
+                    character_id=payload.get(CHARACTER_ID_FIELD),
+                ),
+            )
+        if offset is None:
+            break
+
+    if not rows:
+        # An empty collection still gets a snapshot, so workers don't export on every request
+        dimension = await _collection_dimension(client=client, collection_name=collection_name)
+        return np.zeros((0, dimension), dtype=np.float32), facts
+
+    vectors = np.asarray(rows, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms, facts
+
+
+async def _collection_dimension(client: AsyncQdrantClient, collection_name: str) -> int:
+    collection_info = await client.get_collection(collection_name=collection_name)
+    vector_params = collection_info.config.params.vectors
+    if isinstance(vector_params, dict):
+        vector_params = vector_params.get("")
+    if vector_params is None:
+        return 0
+    return vector_params.size
+
+
+def _save_vectors(vectors: NDArray[np.float32], version_path: Path, quantize: bool) -> None:
+    if not quantize:
+        np.save(version_path / VECTORS_FILE, vectors)
+        return
+
+    scales = np.abs(vectors).max(axis=1, initial=0).astype(np.float32)
+    scales[scales == 0] = 1
+    np.save(
+        version_path / VECTORS_FILE, np.rint(vectors / scales[:, None] * INT8_MAX).astype(np.int8)
+    )
+    np.save(version_path / SCALES_FILE, scales)
+
+
+def _publish(snapshot_root: Path, version_path: Path) -> None:
+    # Readers follow the link, so switching it is the atomic publish step
+    temporary_link = snapshot_root / f"{CURRENT_LINK}.tmp"
+    temporary_link.unlink(missing_ok=True)
+    temporary_link.symlink_to(version_path.relative_to(snapshot_root))
+    os.replace(temporary_link, snapshot_root / CURRENT_LINK)
+    _prune_versions(versions_path=version_path.parent, keep=KEPT_VERSIONS)
+
+
+def _prune_versions(versions_path: Path, keep: int) -> None:
+    # Processes still reading an older version keep their mapping after the files are removed
+    versions = sorted(versions_path.iterdir(), key=lambda version: int(version.name))
+    for version in versions[:-keep]:
+        shutil.rmtree(version, ignore_errors=True)
+
+
+def _normalize(vector: NDArray[np.float32]) -> NDArray[np.float32]:
+    norm = float(np.linalg.norm(vector))
+    if norm == 0:
+        return vector
+    return vector / norm
+
+
+def _top_k(scores: NDArray[np.float32], limit: int) -> NDArray[np.intp]:
+    if limit < len(scores):
+        top_positions = np.argpartition(-scores, limit)[:limit]
+    else:
+        top_positions = np.arange(len(scores))
+    return top_positions[np.argsort(-scores[top_positions])]
+
+
+def _build_hnsw_index(
+    vectors: NDArray[np.float32],
+    path: Path,
+    hnsw_m: int,
+    hnsw_ef_construct: int,
+) -> None:
+    try:
+        import hnswlib  # noqa: WPS433
+    except ImportError:
+        logger.warning("hnswlib is not installed, the snapshot is searched exactly")
+        return
+
+    index = hnswlib.Index(space="ip", dim=vectors.shape[1])
+    index.init_index(max_elements=len(vectors), M=hnsw_m, ef_construction=hnsw_ef_construct)
+    index.add_items(vectors, np.arange(len(vectors)))
+    index.save_index(str(path))
+
+
+def _load_hnsw_index(path: Path, dimension: int) -> Any | None:
+    try:
+        import hnswlib  # noqa: WPS433
+    except ImportError:
+        logger.warning("hnswlib is not installed, the snapshot is searched exactly")
+        return None
+
+    index = hnswlib.Index(space="ip", dim=dimension)
+    index.load_index(str(path))
+    return index
@@ -0,0 +1,43 @@
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+from structlog import get_logger
+
+from backend.infrastructure.configuration.config import get_config
+from backend.infrastructure.di import make_container
+from backend.integrations.services.metrics.prometheus import MULTIPROCESS_DIR_ENV, is_multiprocess
+from backend.presentation.api.exception_handlers import setup_exception_handlers
+from backend.presentation.api.lifespan import lifespan
+from backend.presentation.api.middleware import MetricsMiddleware
+from backend.presentation.api.routes.registry import main_router
+
+logger = get_logger()
+
+APP_FACTORY = "backend.presentation.api.app:create_app"
+
+
+def create_app() -> FastAPI:
+    """Build the API with a container of its own; uvicorn calls this once per worker process."""
+    config = get_config()
+
+    # Launched by uvicorn or gunicorn directly, the workers never went through run.py
+    if config.has_several_workers and not is_multiprocess():
+        logger.warning(
+            "Metrics are reported per worker, set the multiprocess directory before starting",
+            workers=config.api.workers,
+            environment_variable=MULTIPROCESS_DIR_ENV,
+        )
+
+    app = FastAPI(
+        title=config.api.title,
+        version=config.api.version,
+        debug=config.is_debug,
+        lifespan=lifespan,
+    )
+
+    setup_dishka(make_container(), app)
+    setup_exception_handlers(app)
+    app.add_middleware(MetricsMiddleware)
+
+    app.include_router(main_router)
+
+    return app
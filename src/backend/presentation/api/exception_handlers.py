@@ -0,0 +1,32 @@
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from backend.application.services.resilience import CircuitOpenError, DeadlineExceededError
+from backend.application.services.session import SessionNotFoundError
+
+
+async def deadline_exceeded_handler(request: Request, exception: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "Request deadline exceeded"},
+    )
+
+
+async def circuit_open_handler(request: Request, exception: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Upstream service is unavailable"},
+    )
+
+
+async def session_not_found_handler(request: Request, exception: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"detail": str(exception)},
+    )
+
+
+def setup_exception_handlers(app: FastAPI) -> None:
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
+    app.add_exception_handler(CircuitOpenError, circuit_open_handler)
+    app.add_exception_handler(SessionNotFoundError, session_not_found_handler)
@@ -3,8 +3,12 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 
+from backend.application.services.metrics import MetricsP
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    # The metrics middleware runs outside dependency injection, so it reads them from the state
+    app.state.metrics = await app.state.dishka_container.get(MetricsP)
     yield
     await app.state.dishka_container.close()
@@ -0,0 +1,70 @@
+import time
+
+from fastapi import status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.application.services.metrics import MetricsP
+
+UNMATCHED_PATH = "unmatched"
+METRICS_PATH = "/metrics"
+
+
+class MetricsMiddleware:
+    """Counts in-flight HTTP requests and observes their duration by route template.
+
+    Plain ASGI instead of BaseHTTPMiddleware, so streaming responses are not buffered and
+    the per-request overhead stays at a few label lookups.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        metrics: MetricsP | None = getattr(scope["app"].state, "metrics", None)
+        if scope["type"] != "http" or metrics is None or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        response_status = ResponseStatus(send=send)
+        metrics.add_requests_in_flight(amount=1)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, response_status.send)
+        except BaseException:
+            self._observe(
+                metrics=metrics,
+                scope=scope,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                started_at=started_at,
+            )
+            raise
+
+        self._observe(
+            metrics=metrics,
+            scope=scope,
+            status_code=response_status.status_code,
+            started_at=started_at,
+        )
+
+    def _observe(
+        self, metrics: MetricsP, scope: Scope, status_code: int, started_at: float
+    ) -> None:
+        metrics.add_requests_in_flight(amount=-1)
+        metrics.observe_http_request(
+            method=scope["method"],
+            # Templates like /api/v1/sessions/{session_id} keep the label set bounded
+            path=getattr(scope.get("route"), "path", UNMATCHED_PATH),
+            status_code=status_code,
+            duration_seconds=time.perf_counter() - started_at,
+        )
+
+
+class ResponseStatus:
+    def __init__(self, send: Send):
+        self._send = send
+        self.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.status_code = message["status"]
+        await self._send(message)
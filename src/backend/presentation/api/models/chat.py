@@ -1,17 +1,63 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 from backend.application.value_objects.search_result import SearchResult
+from backend.application.value_objects.tenant_scope import TenantScope
 from backend.domain.entities.character import Character
 from backend.domain.entities.message import Message
 from backend.domain.entities.user import User
 
+CHAT_BATCH_MAX_SIZE = 256
+
 
 class ChatRequest(BaseModel):
     messages: list[Message]
     user: User
     character: Character
 
+    @property
+    def tenant_scope(self) -> TenantScope:
+        # Always scoped: a request without ids reads only the facts without an owner
+        return TenantScope(user_id=self.user.id, character_id=self.character.id)
+
 
 class ChatResponse(BaseModel):
     generated_text: str
     search_results: list[SearchResult]
+
+
+class ChatBatchRequest(BaseModel):
+    requests: list[ChatRequest] = Field(min_length=1, max_length=CHAT_BATCH_MAX_SIZE)
+
+
+class ChatBatchItem(BaseModel):
+    response: ChatResponse | None = None
+    error: str | None = None
+
+
+class ChatBatchResponse(BaseModel):
+    results: list[ChatBatchItem]
+
+
+class ChatStreamSearchResults(BaseModel):
+    event: Literal["search_results"] = "search_results"
+    search_results: list[SearchResult]
+
+
+class ChatStreamDelta(BaseModel):
+    event: Literal["delta"] = "delta"
+    text: str
+
+
+class ChatStreamDone(BaseModel):
+    event: Literal["done"] = "done"
+    generated_text: str
+
+
+class ChatStreamError(BaseModel):
+    event: Literal["error"] = "error"
+    detail: str
+
+
+ChatStreamEvent = ChatStreamSearchResults | ChatStreamDelta | ChatStreamDone | ChatStreamError
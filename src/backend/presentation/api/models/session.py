@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+from backend.domain.entities.character import Character
+from backend.domain.entities.message import Message
+from backend.domain.entities.user import User
+
+
+class CreateSessionRequest(BaseModel):
+    user: User
+    character: Character
+
+
+class SessionResponse(BaseModel):
+    session_id: str
+    user: User
+    character: Character
+    messages: list[Message]
+
+
+class SessionMessageRequest(BaseModel):
+    # Without a text the character speaks first, e.g. to greet the user
+    text: str | None = None
@@ -0,0 +1,13 @@
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from backend.integrations.services.metrics.prometheus import PrometheusMetrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=Response)
+@inject
+async def metrics_endpoint(metrics: FromDishka[PrometheusMetrics]) -> Response:
+    return Response(content=metrics.export(), media_type=CONTENT_TYPE_LATEST)
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
 from backend.presentation.api.routes.general.health import router as health_router
+from backend.presentation.api.routes.general.metrics import router as metrics_router
 
 general_router = APIRouter(tags=["general"])
 
-for router in [health_router]:
+for router in [health_router, metrics_router]:
     general_router.include_router(router, tags=["general"])
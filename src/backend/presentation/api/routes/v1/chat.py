@@ -1,16 +1,47 @@
 from dishka.integrations.fastapi import FromDishka, inject
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from backend.application.use_cases.chat import ChatUseCase
-from backend.presentation.api.models.chat import ChatRequest, ChatResponse
+from backend.application.use_cases.chat_batch import ChatBatchUseCase
+from backend.presentation.api.models.chat import (
+    ChatBatchRequest,
+    ChatBatchResponse,
+    ChatRequest,
+    ChatResponse,
+)
+from backend.presentation.api.responses import ModelJSONResponse
+from backend.presentation.api.sse import encode_sse_events
 
 router = APIRouter()
 
 
-@router.post("/chat", response_model=ChatResponse)
+@router.post("/chat", response_model=ChatResponse, response_class=ModelJSONResponse)
 @inject
 async def chat_endpoint(
     chat_request: ChatRequest,
     chat_use_case: FromDishka[ChatUseCase],
-) -> ChatResponse:
-    return await chat_use_case(dto=chat_request)
+) -> ModelJSONResponse:
+    return ModelJSONResponse(await chat_use_case(dto=chat_request))
+
+
+@router.post("/chat/stream", response_class=StreamingResponse)
+@inject
+async def chat_stream_endpoint(
+    chat_request: ChatRequest,
+    chat_use_case: FromDishka[ChatUseCase],
+) -> StreamingResponse:
+    return StreamingResponse(
+        encode_sse_events(chat_use_case.stream(dto=chat_request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/chat/batch", response_model=ChatBatchResponse, response_class=ModelJSONResponse)
+@inject
+async def chat_batch_endpoint(
+    chat_batch_request: ChatBatchRequest,
+    chat_batch_use_case: FromDishka[ChatBatchUseCase],
+) -> ModelJSONResponse:
+    return ModelJSONResponse(await chat_batch_use_case(dto=chat_batch_request))
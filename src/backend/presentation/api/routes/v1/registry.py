@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
 from backend.presentation.api.routes.v1.chat import router as chat_router
+from backend.presentation.api.routes.v1.session import router as session_router
 
 v1_router = APIRouter(prefix="/api/v1")
 
-for router in [chat_router]:
+for router in [chat_router, session_router]:
     v1_router.include_router(router, tags=["v1"])
@@ -0,0 +1,67 @@
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from backend.application.use_cases.session_chat import SessionChatUseCase
+from backend.presentation.api.models.chat import ChatResponse
+from backend.presentation.api.models.session import (
+    CreateSessionRequest,
+    SessionMessageRequest,
+    SessionResponse,
+)
+from backend.presentation.api.responses import ModelJSONResponse
+from backend.presentation.api.sse import encode_sse_events
+
+router = APIRouter()
+
+
+@router.post("/sessions", response_model=SessionResponse, response_class=ModelJSONResponse)
+@inject
+async def create_session_endpoint(
+    create_session_request: CreateSessionRequest,
+    session_chat_use_case: FromDishka[SessionChatUseCase],
+) -> ModelJSONResponse:
+    return ModelJSONResponse(await session_chat_use_case.create(dto=create_session_request))
+
+
+@router.get(
+    "/sessions/{session_id}", response_model=SessionResponse, response_class=ModelJSONResponse
+)
+@inject
+async def get_session_endpoint(
+    session_id: str,
+    session_chat_use_case: FromDishka[SessionChatUseCase],
+) -> ModelJSONResponse:
+    return ModelJSONResponse(await session_chat_use_case.get(session_id=session_id))
+
+
+@router.post(
+    "/sessions/{session_id}/messages", response_model=ChatResponse, response_class=ModelJSONResponse
+)
+@inject
+async def session_message_endpoint(
+    session_id: str,
+    session_message_request: SessionMessageRequest,
+    session_chat_use_case: FromDishka[SessionChatUseCase],
+) -> ModelJSONResponse:
+    return ModelJSONResponse(
+        await session_chat_use_case(session_id=session_id, dto=session_message_request)
+    )
+
+
+@router.post("/sessions/{session_id}/messages/stream", response_class=StreamingResponse)
+@inject
+async def session_message_stream_endpoint(
+    session_id: str,
+    session_message_request: SessionMessageRequest,
+    session_chat_use_case: FromDishka[SessionChatUseCase],
+) -> StreamingResponse:
+    # Resolve the session before the response starts, so a missing one is a 404
+    await session_chat_use_case.get(session_id=session_id)
+    return StreamingResponse(
+        encode_sse_events(
+            session_chat_use_case.stream(session_id=session_id, dto=session_message_request),
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,20 @@
+from typing import AsyncIterator
+
+from structlog import get_logger
+
+from backend.presentation.api.models.chat import ChatStreamError, ChatStreamEvent
+
+logger = get_logger()
+
+
+def format_sse_event(event: ChatStreamEvent) -> str:
+    return f"event: {event.event}\ndata: {event.model_dump_json()}\n\n"
+
+
+async def encode_sse_events(events: AsyncIterator[ChatStreamEvent]) -> AsyncIterator[str]:
+    try:
+        async for event in events:
+            yield format_sse_event(event)
+    except Exception as exception:
+        logger.exception("Chat stream exception", exception=str(exception))
+        yield format_sse_event(ChatStreamError(detail="Generation failed"))
@@ -1,30 +1,33 @@
 import uvicorn
-from dishka.integrations.fastapi import setup_dishka
-from fastapi import FastAPI
+from structlog import get_logger
 
 from backend.infrastructure.configuration.config import get_config
-from backend.infrastructure.di import container
-from backend.presentation.api.lifespan import lifespan
-from backend.presentation.api.routes.registry import main_router
+from backend.infrastructure.configuration.enums import CacheBackend
+from backend.integrations.services.metrics.prometheus import prepare_multiprocess_dir
+from backend.presentation.api.app import APP_FACTORY
 
 if __name__ == "__main__":
     config = get_config()
 
-    app = FastAPI(
-        title=config.api.title,
-        version=config.api.version,
-        debug=config.is_debug,
-        lifespan=lifespan,
-    )
-
-    setup_dishka(container, app)
+    if config.has_several_workers:
+        # Any worker can answer a scrape with the samples of all of them
+        prepare_multiprocess_dir(config.observability.metrics_multiprocess_dir)
 
-    app.include_router(main_router)
+    if config.has_several_workers and config.session_backend == CacheBackend.MEMORY:
+        # Each worker would only see the sessions it created itself
+        get_logger().warning(
+            "In-memory sessions are not shared between workers, use the redis backend",
+            workers=config.api.workers,
+        )
 
+    # An import string lets uvicorn start the app in every worker and in the reloader
     uvicorn.run(
-        app,
+        APP_FACTORY,
+        factory=True,
         host=config.api.host,
         port=config.api.port,
         workers=config.api.workers,
         reload=config.is_debug,
+        loop=config.api.loop,
+        http=config.api.http,
     )
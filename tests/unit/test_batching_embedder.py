@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from backend.application.services.embedder import EmbedderP
+from backend.application.services.resilience import deadline_scope, remaining_seconds
+from backend.integrations.services.embedder.batching import BatchingEmbedder
+
+
+class RecordingEmbedder(EmbedderP):
+    def __init__(self, bad_query: str | None = None, error: Exception | None = None):
+        self.batches: list[list[str]] = []
+        self.deadlines: list[float | None] = []
+        self._bad_query = bad_query
+        self._error = error
+
+    async def embed(self, query: str) -> list[float]:
+        embeddings = await self.embed_batch(queries=[query])
+        return embeddings[0]
+
+    async def embed_batch(self, queries: list[str]) -> list[list[float]]:
+        self.batches.append(queries)
+        self.deadlines.append(remaining_seconds())
+        if self._error is not None:
+            raise self._error
+        if self._bad_query in queries:
+            raise ValueError(f"Can't embed {self._bad_query}")
+        return [[float(len(query))] for query in queries]
+
+
+async def test_flushes_when_batch_is_full() -> None:
+    embedder = RecordingEmbedder()
+    batching_embedder = BatchingEmbedder(embedder=embedder, max_batch_size=2, max_wait_ms=10_000)
+
+    embeddings = await asyncio.wait_for(
+        asyncio.gather(batching_embedder.embed("a"), batching_embedder.embed("bb")),
+        timeout=1,
+    )
+
+    assert embeddings == [[1.0], [2.0]]
+    assert embedder.batches == [["a", "bb"]]
+
+
+async def test_flushes_after_max_wait() -> None:
+    embedder = RecordingEmbedder()
+    batching_embedder = BatchingEmbedder(embedder=embedder, max_batch_size=10, max_wait_ms=1)
+
+    embeddings = await asyncio.wait_for(
+        asyncio.gather(batching_embedder.embed("a"), batching_embedder.embed("bb")),
+        timeout=1,
+    )
+
+    assert embeddings == [[1.0], [2.0]]
+    assert embedder.batches == [["a", "bb"]]
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 10])
+async def test_batch_ignores_caller_deadline(max_batch_size: int) -> None:
+    embedder = RecordingEmbedder()
+    batching_embedder = BatchingEmbedder(
+        embedder=embedder,
+        max_batch_size=max_batch_size,
+        max_wait_ms=1,
+    )
+
+    with deadline_scope(5):
+        await batching_embedder.embed("a")
+
+    assert embedder.deadlines == [None]
+
+
+async def test_bad_query_fails_only_its_caller() -> None:
+    embedder = RecordingEmbedder(bad_query="bad")
+    batching_embedder = BatchingEmbedder(embedder=embedder, max_batch_size=3, max_wait_ms=10_000)
+
+    embedding_results = await asyncio.gather(
+        batching_embedder.embed("good"),
+        batching_embedder.embed("bad"),
+        batching_embedder.embed("other"),
+        return_exceptions=True,
+    )
+
+    assert embedding_results[0] == [4.0]
+    assert isinstance(embedding_results[1], ValueError)
+    assert embedding_results[2] == [5.0]
+    assert embedder.batches[0] == ["good", "bad", "other"]
+
+
+async def test_upstream_error_fails_the_whole_batch_once() -> None:
+    upstream_error = ConnectionError("Upstream is down")
+    embedder = RecordingEmbedder(error=upstream_error)
+    batching_embedder = BatchingEmbedder(embedder=embedder, max_batch_size=3, max_wait_ms=10_000)
+
+    embedding_results = await asyncio.gather(
+        batching_embedder.embed("a"),
+        batching_embedder.embed("b"),
+        batching_embedder.embed("c"),
+        return_exceptions=True,
+    )
+
+    assert embedding_results == [upstream_error, upstream_error, upstream_error]
+    assert embedder.batches == [["a", "b", "c"]]
+
+
+async def test_input_error_is_retried_per_query() -> None:
+    embedder = RecordingEmbedder(error=PermissionError("Rejected"))
+    batching_embedder = BatchingEmbedder(
+        embedder=embedder,
+        max_batch_size=2,
+        max_wait_ms=10_000,
+        is_input_error=lambda exception: isinstance(exception, PermissionError),
+    )
+
+    embedding_results = await asyncio.gather(
+        batching_embedder.embed("a"),
+        batching_embedder.embed("b"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, PermissionError) for result in embedding_results)
+    assert embedder.batches == [["a", "b"], ["a"], ["b"]]
@@ -0,0 +1,86 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable
+
+import pytest
+
+from backend.application.services.llm import LLMServiceP
+from backend.application.value_objects.generation_parameters import GenerationParameters
+from backend.application.value_objects.prompt import Prompt
+from backend.integrations.services.llm.hedged import HedgedLLM
+
+PROMPT = Prompt(prefix="", body="Hi")
+
+LLMCall = Callable[[HedgedLLM], Awaitable[object]]
+
+
+class HangingLLM(LLMServiceP):
+    """Never answers and counts the requests still in flight."""
+
+    def __init__(self) -> None:
+        self._generation_parameters = GenerationParameters(model_name="hanging")
+        self.started = 0
+        self.active = 0
+
+    async def generate(self, prompt: Prompt) -> str:
+        self.started += 1
+        self.active += 1
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.active -= 1
+            raise
+        return ""
+
+    async def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]:
+        self.started += 1
+        self.active += 1
+        try:
+            await asyncio.Event().wait()
+            yield ""
+        except asyncio.CancelledError:
+            self.active -= 1
+            raise
+
+
+async def consume_stream(llm: HedgedLLM) -> list[str]:
+    return [delta async for delta in llm.generate_stream(prompt=PROMPT)]
+
+
+async def generate(llm: HedgedLLM) -> str:
+    return await llm.generate(prompt=PROMPT)
+
+
+async def cancel_after_start(call: Awaitable[object], upstream: HangingLLM, started: int) -> None:
+    task = asyncio.ensure_future(call)
+    while upstream.started < started:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.parametrize("call", [generate, consume_stream])
+async def test_cancel_before_hedge_stops_primary(call: LLMCall) -> None:
+    upstream = HangingLLM()
+    llm = HedgedLLM(primary=upstream, secondary=upstream, initial_delay_seconds=60)
+
+    await cancel_after_start(call(llm), upstream=upstream, started=1)
+
+    assert upstream.started == 1
+    assert upstream.active == 0
+
+
+@pytest.mark.parametrize("call", [generate, consume_stream])
+async def test_cancel_after_hedge_stops_both_requests(call: LLMCall) -> None:
+    upstream = HangingLLM()
+    llm = HedgedLLM(
+        primary=upstream,
+        secondary=upstream,
+        initial_delay_seconds=0.01,
+        min_delay_seconds=0.01,
+    )
+
+    await cancel_after_start(call(llm), upstream=upstream, started=2)
+
+    assert llm.hedges_fired == 1
+    assert upstream.active == 0
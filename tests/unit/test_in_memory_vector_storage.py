@@ -0,0 +1,88 @@
+import asyncio
+from pathlib import Path
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from backend.integrations.services.vector_storage.in_memory import InMemoryVectorStorage
+from backend.integrations.services.vector_storage.snapshot import CURRENT_LINK
+
+COLLECTION_NAME = "facts"
+DIMENSION = 4
+
+
+class CountingClient(AsyncQdrantClient):
+    def __init__(self) -> None:
+        super().__init__(location=":memory:")
+        self.scrolls = 0
+
+    async def scroll(self, *args: object, **kwargs: object):  # type: ignore[no-untyped-def]
+        self.scrolls += 1
+        await asyncio.sleep(0.01)
+        return await super().scroll(*args, **kwargs)  # type: ignore[arg-type]
+
+
+async def make_client(num_points: int) -> CountingClient:
+    client = CountingClient()
+    await client.create_collection(
+        collection_name=COLLECTION_NAME,
+        vectors_config=models.VectorParams(size=DIMENSION, distance=models.Distance.COSINE),
+    )
+    if num_points:
+        await client.upsert(
+            collection_name=COLLECTION_NAME,
+            points=[
+                models.PointStruct(
+                    id=index,
+                    vector=[1.0, float(index), 0, 0],
+                    payload={"owner": "user", "text": f"Fact {index}"},
+                )
+                for index in range(num_points)
+            ],
+        )
+    return client
+
+
+def make_storage(client: CountingClient, snapshot_dir: Path) -> InMemoryVectorStorage:
+    return InMemoryVectorStorage(
+        client=client,
+        collection_name=COLLECTION_NAME,
+        snapshot_dir=str(snapshot_dir),
+    )
+
+
+async def test_empty_collection_gets_an_empty_snapshot(tmp_path: Path) -> None:
+    client = await make_client(num_points=0)
+    storage = make_storage(client=client, snapshot_dir=tmp_path)
+
+    assert await storage.find_nearest(query_embedding=[1.0, 0, 0, 0], num_search_results=3) == []
+    assert await storage.find_nearest(query_embedding=[1.0, 0, 0, 0], num_search_results=3) == []
+    assert client.scrolls == 1
+
+
+async def test_cold_start_waits_for_the_exporting_process(tmp_path: Path) -> None:
+    client = await make_client(num_points=3)
+    storages = [make_storage(client=client, snapshot_dir=tmp_path) for _ in range(3)]
+
+    search_results = await asyncio.gather(
+        *[
+            storage.find_nearest(query_embedding=[1.0, 0, 0, 0], num_search_results=1)
+            for storage in storages
+        ],
+    )
+
+    assert [len(results) for results in search_results] == [1, 1, 1]
+    assert client.scrolls == 1
+    assert (tmp_path / COLLECTION_NAME / CURRENT_LINK).exists()
+
+
+async def test_refresh_skips_a_fresh_snapshot(tmp_path: Path) -> None:
+    client = await make_client(num_points=3)
+    storage = make_storage(client=client, snapshot_dir=tmp_path)
+    await storage.find_nearest(query_embedding=[1.0, 0, 0, 0], num_search_results=1)
+
+    await storage._export(max_age_seconds=60)
+    assert client.scrolls == 1
+
+    await storage.refresh()
+    assert client.scrolls == 2
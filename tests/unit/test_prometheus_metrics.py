@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from backend.integrations.services.metrics.prometheus import (
+    MULTIPROCESS_DIR_ENV,
+    prepare_multiprocess_dir,
+)
+
+# prometheus_client picks the multiprocess storage on import, so every worker is a fresh process
+WORKER_CODE = textwrap.dedent(
+    """
+    import asyncio
+
+    from backend.integrations.services.metrics.prometheus import PrometheusMetrics
+
+
+    class CachedService:
+        hits = 3
+
+
+    async def main() -> None:
+        metrics = PrometheusMetrics(multiprocess_mode=True)
+        metrics.register_stats(
+            stats_object=CachedService(),
+            counters=[("service_cache_hits", "Hits", "hits")],
+        )
+        metrics.observe_stage(pipeline="chat", stage="generate", duration_seconds=0.1)
+        metrics.add_requests_in_flight(amount=1)
+        await metrics.close()
+
+
+    asyncio.run(main())
+    """,
+)
+
+EXPORT_CODE = textwrap.dedent(
+    """
+    import sys
+
+    from backend.integrations.services.metrics.prometheus import PrometheusMetrics
+
+    sys.stdout.write(PrometheusMetrics(multiprocess_mode=True).export().decode())
+    """,
+)
+
+
+def run_python(code: str) -> str:
+    completed_process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        text=True,
+    )
+    return completed_process.stdout
+
+
+@pytest.fixture
+def multiprocess_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # Registered so that the variable set by prepare_multiprocess_dir is restored afterwards
+    monkeypatch.setenv(MULTIPROCESS_DIR_ENV, "")
+    stale_samples_file = tmp_path / "counter_1.db"
+    stale_samples_file.write_bytes(b"stale")
+
+    prepare_multiprocess_dir(tmp_path)
+
+    assert not stale_samples_file.exists()
+    return tmp_path
+
+
+def test_export_sums_every_worker(multiprocess_dir: Path) -> None:
+    run_python(WORKER_CODE)
+    run_python(WORKER_CODE)
+
+    exported = run_python(EXPORT_CODE)
+
+    assert "service_cache_hits_total 6.0" in exported
+    assert 'chat_stage_duration_seconds_count{pipeline="chat",stage="generate"} 2.0' in exported
+    assert "http_requests_in_flight 0.0" in exported
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from backend.application.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    ResiliencePolicy,
+    deadline_scope,
+)
+
+
+def is_connection_error(exception: BaseException) -> bool:
+    return isinstance(exception, ConnectionError)
+
+
+def make_policy(circuit_breaker: CircuitBreaker) -> ResiliencePolicy:
+    return ResiliencePolicy(
+        name="upstream",
+        is_retryable=is_connection_error,
+        max_attempts=1,
+        circuit_breaker=circuit_breaker,
+    )
+
+
+async def fail() -> None:
+    raise ConnectionError("Upstream is down")
+
+
+async def succeed() -> str:
+    return "ok"
+
+
+async def hang() -> None:
+    await asyncio.Event().wait()
+
+
+def test_breaker_opens_after_consecutive_failures() -> None:
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.allow_request()
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open
+    assert not circuit_breaker.allow_request()
+
+
+def test_breaker_success_resets_failure_count() -> None:
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+
+    circuit_breaker.record_failure()
+    circuit_breaker.record_success()
+    circuit_breaker.record_failure()
+
+    assert not circuit_breaker.is_open
+
+
+def test_breaker_lets_one_probe_through_and_closes_on_success() -> None:
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.allow_request()
+    assert not circuit_breaker.allow_request()
+
+    circuit_breaker.record_success()
+    assert not circuit_breaker.is_open
+    assert circuit_breaker.allow_request()
+
+
+def test_breaker_reopens_when_probe_fails() -> None:
+    circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=60)
+    for _ in range(3):
+        circuit_breaker.record_failure()
+    circuit_breaker._opened_at = 0
+
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.is_open
+    assert not circuit_breaker.allow_request()
+
+
+async def test_policy_fails_fast_when_circuit_is_open() -> None:
+    policy = make_policy(CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60))
+
+    with pytest.raises(ConnectionError):
+        await policy.call(fail)
+
+    with pytest.raises(CircuitOpenError):
+        await policy.call(succeed)
+
+
+async def test_cancelled_probe_frees_the_probe_slot() -> None:
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+    policy = make_policy(circuit_breaker)
+    with pytest.raises(ConnectionError):
+        await policy.call(fail)
+
+    probe = asyncio.create_task(policy.call(hang))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert await policy.call(succeed) == "ok"
+    assert not circuit_breaker.is_open
+
+
+async def test_cancelled_call_is_not_a_failure() -> None:
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+    policy = make_policy(circuit_breaker)
+
+    call = asyncio.create_task(policy.call(hang))
+    await asyncio.sleep(0)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    assert not circuit_breaker.is_open
+
+
+async def test_caller_deadline_does_not_trip_the_breaker() -> None:
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+    policy = make_policy(circuit_breaker)
+
+    with deadline_scope(0.01), pytest.raises(DeadlineExceededError):
+        await policy.call(hang)
+
+    assert not circuit_breaker.is_open
+    assert await policy.call(succeed) == "ok"
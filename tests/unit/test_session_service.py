@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from backend.application.services.session import SessionNotFoundError, SessionService
+from backend.domain.entities.character import Character
+from backend.domain.entities.message import Message
+from backend.domain.entities.user import User
+from backend.domain.value_objects.chat_actor import ChatActor
+from backend.infrastructure.configuration.config import Config
+from backend.infrastructure.configuration.enums import CacheBackend
+from backend.infrastructure.configuration.inner.api import ApiConfig
+from backend.infrastructure.configuration.inner.session import SessionConfig
+from backend.integrations.services.cache.memory import InMemoryLRUCache
+
+
+def make_session_service(max_messages: int = 50) -> SessionService:
+    return SessionService(store=InMemoryLRUCache(), max_messages=max_messages)
+
+
+async def create_session(session_service: SessionService) -> str:
+    session = await session_service.create(
+        user=User(name="Alice", age=30),
+        character=Character(name="Bob", age=40, description="A friend"),
+    )
+    return session.id
+
+
+def make_message(text: str) -> Message:
+    return Message(actor=ChatActor.USER, text=text)
+
+
+async def test_concurrent_appends_keep_every_turn() -> None:
+    session_service = make_session_service()
+    session_id = await create_session(session_service)
+    texts = [str(index) for index in range(10)]
+
+    await asyncio.gather(
+        *[
+            session_service.append(session_id=session_id, messages=[make_message(text)])
+            for text in texts
+        ]
+    )
+
+    session = await session_service.get(session_id)
+    assert [message.text for message in session.messages] == texts
+
+
+async def test_append_keeps_the_last_messages() -> None:
+    session_service = make_session_service(max_messages=2)
+    session_id = await create_session(session_service)
+
+    session = await session_service.append(
+        session_id=session_id,
+        messages=[make_message("first"), make_message("second"), make_message("third")],
+    )
+
+    assert [message.text for message in session.messages] == ["second", "third"]
+
+
+async def test_append_to_missing_session_raises() -> None:
+    session_service = make_session_service()
+
+    with pytest.raises(SessionNotFoundError):
+        await session_service.append(session_id="missing", messages=[make_message("hi")])
+
+
+@pytest.mark.parametrize(
+    ("workers", "backend", "expected_backend"),
+    [
+        (None, None, CacheBackend.MEMORY),
+        (1, None, CacheBackend.MEMORY),
+        (4, None, CacheBackend.REDIS),
+        (4, CacheBackend.MEMORY, CacheBackend.MEMORY),
+        (None, CacheBackend.REDIS, CacheBackend.REDIS),
+    ],
+)
+def test_session_backend_follows_workers(
+    workers: int | None,
+    backend: CacheBackend | None,
+    expected_backend: CacheBackend,
+) -> None:
+    config = Config(api=ApiConfig(workers=workers), session=SessionConfig(backend=backend))
+
+    assert config.session_backend == expected_backend
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from backend.application.value_objects.tenant_scope import TenantScope
+from backend.domain.entities.fact import Fact
+from backend.domain.value_objects.chat_actor import ChatActor
+from backend.integrations.services.vector_storage.qdrant import QdrantVectorStorage
+from backend.integrations.services.vector_storage.snapshot import VectorSnapshot
+
+COLLECTION_NAME = "facts"
+QUERY_EMBEDDING = (1.0, 0)
+
+FACTS = (
+    Fact(owner=ChatActor.USER, text="shared"),
+    Fact(owner=ChatActor.USER, text="character", character_id="bob"),
+    Fact(owner=ChatActor.USER, text="alice", user_id="alice"),
+    Fact(owner=ChatActor.USER, text="alice and bob", user_id="alice", character_id="bob"),
+    Fact(owner=ChatActor.USER, text="carol and bob", user_id="carol", character_id="bob"),
+)
+
+SCOPE_CASES = (
+    (TenantScope(), {"shared"}),
+    (TenantScope(character_id="bob"), {"shared", "character"}),
+    (TenantScope(user_id="alice"), {"alice"}),
+    (TenantScope(user_id="alice", character_id="bob"), {"alice", "alice and bob"}),
+)
+
+
+async def make_qdrant_storage() -> QdrantVectorStorage:
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(
+        collection_name=COLLECTION_NAME,
+        vectors_config=models.VectorParams(size=len(QUERY_EMBEDDING), distance=models.Distance.DOT),
+    )
+    await client.upsert(
+        collection_name=COLLECTION_NAME,
+        points=[
+            models.PointStruct(
+                id=index,
+                vector=list(QUERY_EMBEDDING),
+                payload=fact.model_dump(mode="json", exclude_none=True),
+            )
+            for index, fact in enumerate(FACTS)
+        ],
+    )
+    return QdrantVectorStorage(client=client, collection_name=COLLECTION_NAME)
+
+
+@pytest.mark.parametrize(("tenant_scope", "expected_texts"), SCOPE_CASES)
+async def test_qdrant_search_stays_in_scope(
+    tenant_scope: TenantScope,
+    expected_texts: set[str],
+) -> None:
+    storage = await make_qdrant_storage()
+
+    search_results = await storage.find_nearest(
+        query_embedding=list(QUERY_EMBEDDING),
+        num_search_results=len(FACTS),
+        tenant_scope=tenant_scope,
+    )
+
+    assert {search_result.content.text for search_result in search_results} == expected_texts
+
+
+@pytest.mark.parametrize(("tenant_scope", "expected_texts"), SCOPE_CASES)
+def test_snapshot_search_stays_in_scope(
+    tenant_scope: TenantScope,
+    expected_texts: set[str],
+) -> None:
+    snapshot = VectorSnapshot(
+        vectors=np.ones((len(FACTS), len(QUERY_EMBEDDING)), dtype=np.float32),
+        scales=None,
+        facts=list(FACTS),
+    )
+
+    search_results = snapshot.search(
+        query_embedding=list(QUERY_EMBEDDING),
+        limit=len(FACTS),
+        tenant_scope=tenant_scope,
+    )
+
+    assert {search_result.content.text for search_result in search_results} == expected_texts